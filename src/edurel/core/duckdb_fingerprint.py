@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+
+from edurel.syntax.sql_type import parse_duckdb_type
+
+
+NUMERIC_TYPES = frozenset(
+    {
+        "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+        "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT", "UHUGEINT",
+        "DECIMAL", "FLOAT", "DOUBLE",
+    }
+)
+
+
+@dataclass(frozen=True)
+class ResultFingerprint:
+    """Order-insensitive digest of a query result.
+
+    digest is the sum of one hash per row, so two results with the same
+    fingerprint contain the same rows with the same multiplicities, up to
+    hash collisions. Column names are ignored; column order is not.
+    """
+
+    rows: int
+    columns: int
+    digest: int
+
+
+def fingerprint_sql(sql: str, types: list[str], float_digits: int = 6) -> str:
+    """SQL that computes (row count, digest) of a query inside DuckDB.
+
+    Numeric columns are hashed as DOUBLE rounded to float_digits decimals,
+    so that e.g. an INTEGER 2 and a DECIMAL 2.00 compare equal.
+
+    Args:
+        sql: Single query without a trailing semicolon
+        types: DuckDB type names of the query's result columns
+        float_digits: Decimals kept for numeric columns
+    """
+    names = [f"c{position}" for position in range(1, len(types) + 1)]
+    hashed = [
+        f"round(CAST({name} AS DOUBLE), {int(float_digits)})"
+        if parse_duckdb_type(type_name).base in NUMERIC_TYPES
+        else name
+        for name, type_name in zip(names, types)
+    ]
+    return (
+        f"SELECT count(*), coalesce(sum(CAST(hash({', '.join(hashed)}) AS HUGEINT)), 0) "
+        f"FROM (\n{sql}\n) AS q({', '.join(names)})"
+    )
@@ -1,15 +1,32 @@
+from contextlib import contextmanager
 from datetime import date, datetime, time
 from decimal import Decimal
 import math
+from queue import Queue
 import re
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Dict, Iterator, List, Any, Optional
 from uuid import UUID
 import duckdb
 import pandas as pd
 from pathlib import Path
 import yaml
+from sqlglot import exp
 
+from edurel.core.duckdb_fingerprint import ResultFingerprint, fingerprint_sql
+from edurel.core.duckdb_plan import PlanNode, QueryCostPolicy, parse_plan
+from edurel.core.duckdb_profile import QueryProfile, parse_profile
+from edurel.syntax.sql_type import parse_duckdb_type
+from edurel.utils.instrument import span
 from edurel.utils.misc import save_from_url
+from edurel.utils.sql import parse_sql
+
+
+def _sql_identifier(identifier: str) -> str:
+    if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", identifier):
+        return identifier
+    return '"' + identifier.replace('"', '""') + '"'
+
 
 class DuckDbMan:
     def __init__(self, con: duckdb.DuckDBPyConnection, db_file_path: Optional[str] = None, db_name: Optional[str] = None):
@@ -23,6 +40,13 @@ class DuckDbMan:
         else:
             raise ValueError("Either db_file_path or db_name must be provided")
 
+        self.timeout: Optional[float] = None
+        self.max_rows: Optional[int] = None
+        self.max_bytes: Optional[int] = None
+        self.memory_limit: Optional[str] = None
+        self.cost_policy: Optional[QueryCostPolicy] = None
+        self.read_only = False
+
     @classmethod
     def fromMem(cls, db_name: Optional[str] = None) -> 'DuckDbMan':
         """Create Db instance with in-memory DuckDB connection.
@@ -79,18 +103,355 @@ class DuckDbMan:
         self.con.close()
 
     def execute(self, sql: str) -> None:
-        self.con.execute(sql)
+        with span("duckdb.execute"), self._read_only_guard(sql):
+            self.con.execute(sql)
 
     def execute_file(self, sql_file_path: str) -> None:
-        sql = Path(sql_file_path).read_text(encoding="utf-8")
-        self.con.execute(sql)
+        self.execute(Path(sql_file_path).read_text(encoding="utf-8"))
+
+    @contextmanager
+    def transaction(self) -> Iterator["DuckDbMan"]:
+        """Run the enclosed statements in one transaction.
+
+        Commits when the block finishes and rolls back if it raises.
+        Not available on read-only cursors.
+        """
+        if self.read_only:
+            raise ValueError("Read-only cursors cannot open a transaction.")
+        self.con.begin()
+        try:
+            yield self
+        except BaseException:
+            self.con.rollback()
+            raise
+        self.con.commit()
+
+    @staticmethod
+    def quote_identifier(identifier: str) -> str:
+        """Identifier for use in SQL text, double-quoted unless it is a plain name."""
+        return _sql_identifier(identifier)
+
+    @contextmanager
+    def registered(self, frames: Dict[str, pd.DataFrame]) -> Iterator["DuckDbMan"]:
+        """Make DataFrames queryable as views, by name, inside the enclosed block."""
+        for view_name, df in frames.items():
+            self.con.register(view_name, df)
+        try:
+            yield self
+        finally:
+            for view_name in frames:
+                self.con.unregister(view_name)
+
+    def fetch_rows(self, sql: str) -> List[tuple]:
+        """Rows of a query as tuples of Python values.
+
+        Meant for bookkeeping queries of the library itself, so the limits
+        of set_limits do not apply; use sql_df for user queries.
+        """
+        with self._read_only_guard(sql):
+            return self.con.execute(sql).fetchall()
+
+    def insert_df(self, tablename: str, df: pd.DataFrame) -> None:
+        """Bulk insert a DataFrame into an existing table, matching columns by name.
+
+        Args:
+            tablename: Name of the target table
+            df: Rows to insert; columns missing from df are filled with defaults
+        """
+        if self.read_only:
+            raise ValueError(f"Read-only cursors cannot insert into '{tablename}'.")
+        view_name = "_edurel_insert_df"
+        with self.registered({view_name: df}):
+            self.con.execute(
+                f"INSERT INTO {_sql_identifier(tablename)} BY NAME SELECT * FROM {view_name}"
+            )
+
+    def set_limits(
+        self,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        memory_limit: Optional[str] = None,
+        threads: Optional[int] = None,
+        cost_policy: Optional[QueryCostPolicy] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        """Set default limits for the query methods sql, sql_nx, sql_df and preview.
+
+        timeout, max_rows, max_bytes and cost_policy apply to this DuckDbMan (and cursors
+        opened from it afterwards). memory_limit and threads are DuckDB settings
+        of the whole database: they also apply to every other connection and
+        cursor of it.
+
+        Args:
+            timeout: Wall-clock limit in seconds; the query is interrupted when it is reached
+            max_rows: Maximum number of result rows; larger results raise ValueError
+            max_bytes: Maximum size of the result as pandas data in bytes; the result is
+                then fetched chunk by chunk and the query stops with ValueError once the
+                limit is passed
+            memory_limit: DuckDB memory limit of the database, e.g. '2GB'
+            threads: Number of DuckDB worker threads of the database
+            cost_policy: Policy checked against the EXPLAIN plan before a single query
+                (SELECT, SHOW, ...) runs; other and multiple statements are not checked
+        """
+        self.timeout = timeout
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.cost_policy = cost_policy
+        if memory_limit is not None:
+            self.con.execute("SET memory_limit = ?", [memory_limit])
+            self.memory_limit = memory_limit
+        if threads is not None:
+            self.con.execute(f"SET threads = {int(threads)}")
+
+    def cursor(self, read_only: bool = False) -> "DuckDbMan":
+        """Open another connection to the same database with the same limits.
+
+        DuckDB connections must not be shared between threads; give each
+        worker thread its own cursor (see DuckDbCursorPool).
+
+        Args:
+            read_only: Refuse every statement that is not a query (including
+                transaction control such as COMMIT) with ValueError, and run
+                the queries in a transaction that is rolled back. Cursors of a
+                database opened with read_only=True are read-only anyway.
+        """
+        cursor = DuckDbMan(self.con.cursor(), db_file_path=self.db_file_path, db_name=self.name)
+        cursor.timeout = self.timeout
+        cursor.max_rows = self.max_rows
+        cursor.max_bytes = self.max_bytes
+        cursor.memory_limit = self.memory_limit
+        cursor.cost_policy = self.cost_policy
+        cursor.read_only = read_only
+        return cursor
+
+    @contextmanager
+    def _read_only_guard(self, sql: str) -> Iterator[None]:
+        """On read-only cursors, refuse sql unless it only holds queries and roll back whatever ran."""
+        if not self.read_only:
+            yield
+            return
+        for statement in self.con.extract_statements(sql):
+            if statement.type != duckdb.StatementType.SELECT:
+                raise ValueError(
+                    f"Read-only cursor: only queries can run, not {statement.type.name} statements."
+                )
+        self.con.begin()
+        try:
+            yield
+        finally:
+            self.con.rollback()
+
+    def fingerprint(self, sql: str, timeout: Optional[float] = None, float_digits: int = 6) -> ResultFingerprint:
+        """Run a single query and return an order-insensitive digest of its result.
 
-    def sql(self, sql: str) -> str:
-        return str(self.con.sql(sql))
+        The rows are hashed and summed inside DuckDB, so no rows are fetched.
+        The SQL is parsed first and refused with ValueError unless it is
+        exactly one query (SELECT, set operation, ...), so no other
+        statement is ever executed.
 
-    def sql_nx(self, sql: str) -> str:
+        Args:
+            sql: Query to fingerprint
+            timeout: Wall-clock limit in seconds; defaults to the limit from set_limits
+            float_digits: Decimals kept for numeric columns, see fingerprint_sql
+        """
+        statements = [statement for statement in parse_sql(sql, "duckdb") if statement is not None]
+        if len(statements) != 1 or not isinstance(statements[0], exp.Query):
+            raise ValueError("Only a single read-only query can be fingerprinted.")
+        timeout = self.timeout if timeout is None else timeout
+        query = sql.strip().rstrip(";").strip()
+        with span("duckdb.fingerprint"), self._watchdog(timeout), self._read_only_guard(query):
+            self._check_cost(query)
+            types = [str(column_type) for column_type in self.con.sql(f"SELECT * FROM (\n{query}\n)").types]
+            row_count, digest = self.con.execute(fingerprint_sql(query, types, float_digits)).fetchone()
+        return ResultFingerprint(rows=row_count, columns=len(types), digest=int(digest))
+
+    def _single_query(self, sql: str) -> Optional[str]:
+        """Text of the query if sql is exactly one SELECT-type statement (SELECT, SHOW, ...), else None.
+
+        The text is DuckDB's expansion, e.g. the SELECT behind SHOW TABLES or a PRAGMA.
+        Raises duckdb.ParserException if sql does not parse.
+        """
+        statements = self.con.extract_statements(sql)
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            return None
+        return statements[0].query
+
+    def estimate(self, sql: str) -> PlanNode:
+        """Plan a single query without running it and return DuckDB's operator tree.
+
+        Each node carries DuckDB's estimated cardinality; see QueryCostPolicy
+        for refusing expensive plans. Anything but exactly one query (SELECT,
+        SHOW, ...) is refused with ValueError before it reaches DuckDB.
+        """
+        query = self._single_query(sql)
+        if query is None:
+            raise ValueError("estimate() expects a single query (SELECT, SHOW, ...).")
+        plans = self.con.execute(f"EXPLAIN (FORMAT JSON) {query}").fetchall()
+        if not plans or len(plans[0]) < 2:
+            raise ValueError("EXPLAIN returned no plan. estimate() expects a single SQL statement.")
+        return parse_plan(plans[0][1])
+
+    def profile(self, sql: str, timeout: Optional[float] = None) -> QueryProfile:
+        """Run a single query with DuckDB's profiler and return its operator tree.
+
+        The result is materialized inside DuckDB and discarded without being
+        converted to Python objects, so the profile shows the query's own
+        plan and its time is not dominated by fetching. Profiling is switched
+        off again afterwards, also when the query fails.
+
+        Args:
+            sql: Query to profile
+            timeout: Wall-clock limit in seconds; defaults to the limit from set_limits
+        """
+        timeout = self.timeout if timeout is None else timeout
+        self.con.execute("PRAGMA enable_profiling = 'no_output'")
+        try:
+            with self._watchdog(timeout), self._read_only_guard(sql):
+                self._check_cost(sql)
+                relation = self.con.sql(sql)
+                if relation is not None:
+                    relation.execute()
+                # Read before a read-only cursor's ROLLBACK becomes the last profiled statement.
+                profile_json = self.con.get_profiling_information(format="json")
+        finally:
+            self.con.execute("PRAGMA disable_profiling")
+        return parse_profile(profile_json, sql=sql)
+
+    def _check_cost(self, sql: str) -> None:
+        """Enforce the cost policy on a single query; other statements are not planned."""
+        if self.cost_policy is None:
+            return
+        try:
+            query = self._single_query(sql)
+        except duckdb.Error:
+            # The statement itself reports the syntax error.
+            return
+        if query is not None:
+            self.cost_policy.enforce(self.estimate(query))
+
+    @contextmanager
+    def _watchdog(self, timeout: Optional[float]) -> Iterator[None]:
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, self.con.interrupt)
+            timer.daemon = True
+            timer.start()
+        try:
+            yield
+        except duckdb.InterruptException:
+            if timer is None:
+                raise
+            raise TimeoutError(
+                f"Query exceeded the time limit of {timeout} seconds and was interrupted."
+            ) from None
+        except duckdb.OutOfMemoryException as e:
+            limit = f" of {self.memory_limit}" if self.memory_limit else ""
+            raise MemoryError(f"Query exceeded the memory limit{limit}: {e}") from None
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def _fetch_bounded(self, relation: duckdb.DuckDBPyRelation, max_bytes: int) -> duckdb.DuckDBPyRelation:
+        """Fetch a result chunk by chunk, stopping as soon as its pandas size exceeds max_bytes."""
+        chunks: List[pd.DataFrame] = []
+        size = 0
+        while True:
+            chunk = relation.fetch_df_chunk()
+            chunks.append(chunk)
+            if chunk.empty:
+                break
+            size += int(chunk.memory_usage(deep=True, index=False).sum())
+            if size > max_bytes:
+                raise ValueError(
+                    f"Query result exceeds the limit of {max_bytes} bytes. "
+                    "Select fewer rows or columns, or raise max_bytes."
+                )
+        return self.con.from_df(pd.concat(chunks, ignore_index=True))
+
+    def _query(
+        self,
+        sql: str,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Optional[duckdb.DuckDBPyRelation]:
+        """Run a query under the given or default limits and return its materialized result."""
+        timeout = self.timeout if timeout is None else timeout
+        max_rows = self.max_rows if max_rows is None else max_rows
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        with span("duckdb.query"), self._watchdog(timeout), self._read_only_guard(sql):
+            self._check_cost(sql)
+            relation = self.con.sql(sql)
+            if relation is None:
+                return None
+            if max_rows is not None:
+                relation = relation.limit(max_rows + 1)
+            if max_bytes is None:
+                result = relation.execute()
+            else:
+                result = self._fetch_bounded(relation, max_bytes)
+        if max_rows is not None and result.shape[0] > max_rows:
+            raise ValueError(
+                f"Query result exceeds the limit of {max_rows} rows. "
+                "Add a LIMIT clause or raise max_rows."
+            )
+        return result
+
+    def preview(
+        self, sql: str, rows: int = 20, timeout: Optional[float] = None, exact_count: bool = False
+    ) -> str:
+        """Render the first rows of a query result.
+
+        Only rows + 1 rows are computed; the extra row tells whether the result
+        was truncated, which a footer reports. The total row count needs a
+        second, full run of the query and is only computed with exact_count.
+
+        Args:
+            sql: Query to preview
+            rows: Number of rows to render
+            timeout: Wall-clock limit in seconds; defaults to the limit from set_limits
+            exact_count: Report the total number of rows in the footer
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with span("duckdb.preview"), self._watchdog(timeout), self._read_only_guard(sql):
+            self._check_cost(sql)
+            relation = self.con.sql(sql)
+            if relation is None:
+                return str(None)
+            head = relation.limit(rows + 1).execute()
+            truncated = head.shape[0] > rows
+            total = relation.aggregate("count(*)").fetchone()[0] if truncated and exact_count else None
+        if not truncated:
+            return str(head)
+        rendered = str(head.limit(rows)).rstrip()
+        if total is None:
+            return f"{rendered}\n(first {rows} rows shown, more rows exist)\n"
+        return f"{rendered}\n({rows} of {total} rows shown)\n"
+
+    def sql(
+        self,
+        sql: str,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        preview_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> str:
+        if preview_rows is not None:
+            return self.preview(sql, rows=preview_rows, timeout=timeout)
+        return str(self._query(sql, timeout=timeout, max_rows=max_rows, max_bytes=max_bytes))
+
+    def sql_nx(
+        self,
+        sql: str,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        preview_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> str:
         try: 
-            return str(self.con.sql(sql))
+            return self.sql(
+                sql, timeout=timeout, max_rows=max_rows, preview_rows=preview_rows, max_bytes=max_bytes
+            )
         except Exception as e:
             return f"err: {str(e)}"
 
@@ -98,8 +459,17 @@ class DuckDbMan:
         sql = Path(sql_file_path).read_text(encoding="utf-8")
         return self.sql(sql)
 
-    def sql_df(self, sql: str) -> pd.DataFrame:
-        return self.con.sql(sql).df()
+    def sql_df(
+        self,
+        sql: str,
+        timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> pd.DataFrame:
+        result = self._query(sql, timeout=timeout, max_rows=max_rows, max_bytes=max_bytes)
+        if result is None:
+            raise ValueError("Statement returned no result set.")
+        return result.df()
  
     def sql_file_df(self, sql_file_path: str) -> pd.DataFrame:
         sql = Path(sql_file_path).read_text(encoding="utf-8")
@@ -125,14 +495,15 @@ class DuckDbMan:
 
         Returns:
             List of column dicts for the specified table.
-            Each column dict contains: 'columnname', 'type', and 'nullable' (bool)
+            Each column dict contains: 'columnname', 'type', and 'nullable' (bool).
+            Multi-word DuckDB type names are reported by their single-word alias.
         """
         col_info = self.con.execute(f"DESCRIBE {tablename}").fetchall()
         columns_list = []
         for col_name, col_type, null_flag, _, _, _ in col_info:
             column_dict = {
                 "columnname": col_name,
-                "type": col_type,
+                "type": parse_duckdb_type(col_type).text,
                 "nullable": null_flag != "NO"
             }
             columns_list.append(column_dict)
@@ -238,11 +609,6 @@ class DuckDbMan:
 
     def export_data_as_insert_statements(self, for_tables: List[str]) -> str:
         """Export data from specified tables as SQL insert statements."""
-        def sql_identifier(identifier: str) -> str:
-            if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", identifier):
-                return identifier
-            return '"' + identifier.replace('"', '""') + '"'
-
         def sql_literal(value: Any) -> str:
             if value is None:
                 return "NULL"
@@ -279,10 +645,10 @@ class DuckDbMan:
         statements: list[str] = []
 
         for index, table_name in enumerate(for_tables):
-            table_sql = sql_identifier(table_name)
+            table_sql = _sql_identifier(table_name)
             result = self.con.execute(f"SELECT * FROM {table_sql}")
             rows = result.fetchall()
-            columns = [sql_identifier(column[0]) for column in result.description]
+            columns = [_sql_identifier(column[0]) for column in result.description]
             columns_sql = ", ".join(columns)
 
             if index > 0:
@@ -295,3 +661,40 @@ class DuckDbMan:
                 )
 
         return "\n".join(statements)
+
+
+class DuckDbCursorPool:
+    """Fixed set of cursors on one database, shared by worker threads.
+
+    Args:
+        db: Database to open the cursors on; they inherit its limits
+        size: Number of cursors
+        read_only: Open read-only cursors (see DuckDbMan.cursor)
+    """
+
+    def __init__(self, db: DuckDbMan, size: int = 4, read_only: bool = True):
+        if size < 1:
+            raise ValueError("Cursor pool size must be at least 1.")
+        self.cursors = [db.cursor(read_only=read_only) for _ in range(size)]
+        self._available: Queue[DuckDbMan] = Queue()
+        for cursor in self.cursors:
+            self._available.put(cursor)
+
+    @contextmanager
+    def acquire(self) -> Iterator[DuckDbMan]:
+        """Borrow a cursor, waiting until one is free."""
+        cursor = self._available.get()
+        try:
+            yield cursor
+        finally:
+            self._available.put(cursor)
+
+    def close(self) -> None:
+        for cursor in self.cursors:
+            cursor.close()
+
+    def __enter__(self) -> "DuckDbCursorPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
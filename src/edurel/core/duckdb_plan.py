@@ -0,0 +1,131 @@
+from dataclasses import dataclass, field
+import json
+import math
+from typing import Any, Iterator, Optional
+
+
+CROSS_PRODUCT_OPERATORS = frozenset({"CROSS_PRODUCT"})
+SINGLE_ROW_OPERATORS = frozenset({"UNGROUPED_AGGREGATE"})
+
+
+@dataclass
+class PlanNode:
+    """Operator of a DuckDB physical plan as reported by EXPLAIN (FORMAT JSON)."""
+
+    name: str
+    estimated_cardinality: Optional[int] = None
+    extra_info: dict[str, Any] = field(default_factory=dict)
+    children: list["PlanNode"] = field(default_factory=list)
+
+    def walk(self) -> Iterator["PlanNode"]:
+        """Yield this node and all descendants in pre-order."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    @property
+    def estimated_rows(self) -> int:
+        """Estimated output rows, derived from the inputs where DuckDB gives no estimate."""
+        if self.estimated_cardinality is not None:
+            return self.estimated_cardinality
+        if self.name in SINGLE_ROW_OPERATORS:
+            return 1
+        if self.name in CROSS_PRODUCT_OPERATORS:
+            return math.prod(child.estimated_rows for child in self.children)
+        return max((child.estimated_rows for child in self.children), default=0)
+
+    @property
+    def cost(self) -> int:
+        """Sum of the estimated output rows of all operators (C_out cost)."""
+        return sum(node.estimated_rows for node in self.walk())
+
+    @property
+    def max_cardinality(self) -> int:
+        return max(node.estimated_rows for node in self.walk())
+
+    def unbounded_cross_products(self) -> list["PlanNode"]:
+        """Cross products whose inputs are all estimated to have more than one row."""
+        return [
+            node
+            for node in self.walk()
+            if node.name in CROSS_PRODUCT_OPERATORS
+            and all(child.estimated_rows > 1 for child in node.children)
+        ]
+
+    def to_text(self, indent: int = 0) -> str:
+        cardinality = (
+            f" ~{self.estimated_cardinality} rows" if self.estimated_cardinality is not None else ""
+        )
+        lines = [f"{'  ' * indent}{self.name}{cardinality}"]
+        lines.extend(child.to_text(indent + 1) for child in self.children)
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.to_text()
+
+
+def _plan_node(node_dict: dict[str, Any]) -> PlanNode:
+    extra_info = dict(node_dict.get("extra_info") or {})
+    cardinality = extra_info.pop("Estimated Cardinality", None)
+    return PlanNode(
+        name=node_dict["name"],
+        estimated_cardinality=int(cardinality) if cardinality is not None else None,
+        extra_info=extra_info,
+        children=[_plan_node(child) for child in node_dict.get("children", [])],
+    )
+
+
+def parse_plan(plan_json: str) -> PlanNode:
+    """Parse the JSON plan text of DuckDB's EXPLAIN (FORMAT JSON) into a PlanNode tree."""
+    roots = json.loads(plan_json)
+    if not roots:
+        raise ValueError("EXPLAIN returned an empty plan.")
+    if len(roots) == 1:
+        return _plan_node(roots[0])
+    return PlanNode(name="PLAN", children=[_plan_node(root) for root in roots])
+
+
+@dataclass
+class QueryCostPolicy:
+    """Thresholds a query plan must stay below before the query is executed.
+
+    Subclass and override check() for other rules.
+
+    Attributes:
+        max_cost: Maximum plan cost (sum of estimated operator cardinalities)
+        max_cardinality: Maximum estimated cardinality of any single operator
+        allow_cross_products: If False, cross products of multi-row inputs are refused
+    """
+
+    max_cost: Optional[int] = None
+    max_cardinality: Optional[int] = None
+    allow_cross_products: bool = False
+
+    def check(self, plan: PlanNode) -> list[str]:
+        """Return the reasons for refusing the plan; an empty list accepts it."""
+        violations = []
+        if self.max_cost is not None and plan.cost > self.max_cost:
+            violations.append(
+                f"Estimated cost {plan.cost} exceeds the limit of {self.max_cost}."
+            )
+        if self.max_cardinality is not None and plan.max_cardinality > self.max_cardinality:
+            violations.append(
+                f"Estimated intermediate result of {plan.max_cardinality} rows exceeds "
+                f"the limit of {self.max_cardinality} rows."
+            )
+        if not self.allow_cross_products:
+            for node in plan.unbounded_cross_products():
+                violations.append(
+                    f"Cross product of {' x '.join(str(c.estimated_rows) for c in node.children)} "
+                    "rows; add a join condition."
+                )
+        return violations
+
+    def enforce(self, plan: PlanNode) -> None:
+        """Raise ValueError listing all violations if the plan is refused."""
+        violations = self.check(plan)
+        if violations:
+            raise ValueError(
+                "Query refused by cost policy:\n"
+                + "\n".join(f"- {violation}" for violation in violations)
+            )
@@ -0,0 +1,167 @@
+from dataclasses import dataclass, field
+import json
+from typing import Any, Iterable, Iterator
+
+import pandas as pd
+
+
+@dataclass
+class ProfileNode:
+    """Operator of an executed DuckDB query with its measured timing and output.
+
+    Attributes:
+        name: Operator name, e.g. HASH_JOIN or SEQ_SCAN
+        timing: Seconds spent in this operator, excluding its children
+        cardinality: Rows produced by this operator
+        result_bytes: Size in bytes of the rows produced by this operator
+        rows_scanned: Rows read from storage by this operator
+        peak_memory: Peak buffer memory of this operator in bytes
+    """
+
+    name: str
+    timing: float = 0.0
+    cardinality: int = 0
+    result_bytes: int = 0
+    rows_scanned: int = 0
+    peak_memory: int = 0
+    extra_info: dict[str, Any] = field(default_factory=dict)
+    children: list["ProfileNode"] = field(default_factory=list)
+
+    def walk(self, depth: int = 0) -> Iterator[tuple[int, "ProfileNode"]]:
+        """Yield (depth, node) for this node and all descendants in pre-order."""
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+    @property
+    def cumulative_timing(self) -> float:
+        return self.timing + sum(child.cumulative_timing for child in self.children)
+
+
+@dataclass
+class QueryProfile:
+    """Profile of one query run, as reported by DuckDB's JSON profiler.
+
+    Attributes:
+        sql: Profiled query
+        latency: Wall-clock seconds for the whole query
+        rows_returned: Rows in the query result
+        peak_memory: Peak buffer memory of the query in bytes
+        operators: Root operators of the executed plan
+    """
+
+    sql: str
+    latency: float
+    rows_returned: int
+    peak_memory: int
+    operators: list[ProfileNode] = field(default_factory=list)
+
+    def walk(self) -> Iterator[tuple[int, ProfileNode]]:
+        for operator in self.operators:
+            yield from operator.walk()
+
+    @property
+    def operator_timing(self) -> float:
+        return sum(operator.cumulative_timing for operator in self.operators)
+
+    def hot_path(self) -> list[ProfileNode]:
+        """Operators from the root down, always following the most expensive child."""
+        path: list[ProfileNode] = []
+        candidates = self.operators
+        while candidates:
+            node = max(candidates, key=lambda candidate: candidate.cumulative_timing)
+            path.append(node)
+            candidates = node.children
+        return path
+
+    def to_df(self) -> pd.DataFrame:
+        """One row per operator in plan order, with its share of the operator time."""
+        total = self.operator_timing or 1.0
+        return pd.DataFrame(
+            [
+                {
+                    "depth": depth,
+                    "operator": node.name,
+                    "timing": node.timing,
+                    "timing_pct": 100.0 * node.timing / total,
+                    "cardinality": node.cardinality,
+                    "result_bytes": node.result_bytes,
+                    "rows_scanned": node.rows_scanned,
+                    "peak_memory": node.peak_memory,
+                }
+                for depth, node in self.walk()
+            ],
+            columns=[
+                "depth", "operator", "timing", "timing_pct",
+                "cardinality", "result_bytes", "rows_scanned", "peak_memory",
+            ],
+        )
+
+    def to_text(self) -> str:
+        """Render the operator tree; operators on the hot path are marked with '*'."""
+        total = self.operator_timing or 1.0
+        hot = {id(node) for node in self.hot_path()}
+        lines = [
+            f"latency {self.latency * 1000:.2f} ms, {self.rows_returned} rows, "
+            f"peak memory {self.peak_memory} bytes"
+        ]
+        for depth, node in self.walk():
+            marker = "*" if id(node) in hot else " "
+            lines.append(
+                f"{marker} {'  ' * depth}{node.name} "
+                f"{node.timing * 1000:.2f} ms ({100.0 * node.timing / total:.1f}%) "
+                f"{node.cardinality} rows"
+            )
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.to_text()
+
+
+def _profile_node(node_dict: dict[str, Any]) -> ProfileNode:
+    return ProfileNode(
+        name=node_dict.get("operator_name") or node_dict.get("operator_type", ""),
+        timing=float(node_dict.get("operator_timing", 0.0)),
+        cardinality=int(node_dict.get("operator_cardinality", 0)),
+        result_bytes=int(node_dict.get("result_set_size", 0)),
+        rows_scanned=int(node_dict.get("operator_rows_scanned", 0)),
+        peak_memory=int(node_dict.get("system_peak_buffer_memory", 0)),
+        extra_info=dict(node_dict.get("extra_info") or {}),
+        children=[_profile_node(child) for child in node_dict.get("children", [])],
+    )
+
+
+def parse_profile(profile_json: str, sql: str = "") -> QueryProfile:
+    """Parse DuckDB's JSON profiling output for one query."""
+    profile = json.loads(profile_json)
+    return QueryProfile(
+        sql=sql or profile.get("query_name", ""),
+        latency=float(profile.get("latency", 0.0)),
+        rows_returned=int(profile.get("rows_returned", 0)),
+        peak_memory=int(profile.get("system_peak_buffer_memory", 0)),
+        operators=[_profile_node(child) for child in profile.get("children", [])],
+    )
+
+
+def aggregate_profiles(profiles: Iterable[QueryProfile]) -> pd.DataFrame:
+    """Summarize operator timings over many profiled runs, most expensive operator first.
+
+    Returns:
+        DataFrame with one row per operator name: number of occurrences, total,
+        mean and max timing in seconds, share of all operator time, and mean cardinality
+    """
+    frames = [profile.to_df() for profile in profiles]
+    columns = ["operator", "count", "total_timing", "mean_timing", "max_timing", "timing_pct", "mean_cardinality"]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    operators = pd.concat(frames, ignore_index=True)
+    summary = operators.groupby("operator").agg(
+        count=("timing", "size"),
+        total_timing=("timing", "sum"),
+        mean_timing=("timing", "mean"),
+        max_timing=("timing", "max"),
+        mean_cardinality=("cardinality", "mean"),
+    )
+    total = summary["total_timing"].sum() or 1.0
+    summary["timing_pct"] = 100.0 * summary["total_timing"] / total
+    return summary.reset_index()[columns].sort_values("total_timing", ascending=False, ignore_index=True)
@@ -3,6 +3,8 @@ from pathlib import Path
 from typing import Optional
 from urllib.request import urlopen
 
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.core.rel_schema_man import RelSchemaMan
 from edurel.syntax.er_ast import ERAstFactory, ERSchema, validate_ast
 from edurel.syntax.er_yaml_schema import schema
 from edurel.translation.er_trans import (
@@ -12,6 +14,7 @@ from edurel.translation.er_trans import (
     RelAstTranslationBuilder,
     MermaidTranslationBuilder,
 )
+from edurel.utils.instrument import span
 from edurel.utils.mermaid import display_mermaid_diagram as display_mermaid_diagram_util, save_mermaid_png
 from edurel.utils.md import display_md, md_plain, md_yaml, md_sql
 from edurel.utils.misc import save_text_to_file
@@ -57,9 +60,10 @@ class ERSchemaMan:
         builder: ERSchemaTranslationBuilder,
         visitor_class: type[ERSchemaTranslationVisitor] = ERSchemaTranslationVisitor,
     ) -> str:
-        visitor = visitor_class(builder)
-        visitor.visit(self.ast)
-        return builder.build()
+        with span("er.translate", builder=type(builder).__name__):
+            visitor = visitor_class(builder)
+            visitor.visit(self.ast)
+            return builder.build()
 
     # AST
     def get_ast(self) -> ERSchema:
@@ -83,6 +87,9 @@ class ERSchemaMan:
     def save_rel(self, output_path: str, overwrite: bool = False) -> None:
         save_text_to_file(str(self.get_rel()), output_path, overwrite=overwrite)
 
+    def materialize(self, db: DuckDbMan) -> None:
+        RelSchemaMan.fromAST(self.get_rel()).materialize(db)
+
     # MERMAID
     def get_mermaid_code(self, direction: str = "TB") -> str:
         return self._translate(
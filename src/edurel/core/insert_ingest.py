@@ -0,0 +1,475 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+import re
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+import duckdb
+import pandas as pd
+from sqlglot import exp
+from sqlglot.dialects.dialect import Dialect
+from sqlglot.tokens import TokenType
+
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.syntax.rel_ast import Column, RelSchema, Table, enrich_ast
+from edurel.utils.instrument import span
+from edurel.utils.sql import parse_sql
+
+
+INTEGER_BOUNDS: dict[str, tuple[int, int]] = {
+    "SMALLINT": (-(2**15), 2**15 - 1),
+    "INT": (-(2**31), 2**31 - 1),
+    "INTEGER": (-(2**31), 2**31 - 1),
+    "BIGINT": (-(2**63), 2**63 - 1),
+}
+FLOAT_TYPES = frozenset({"FLOAT", "DOUBLE", "REAL"})
+DECIMAL_TYPES = frozenset({"DECIMAL", "NUMERIC"})
+TEXT_TYPES = frozenset({"CHAR", "VARCHAR", "TEXT"})
+BOOLEAN_TEXTS = {"true": True, "t": True, "1": True, "false": False, "f": False, "0": False}
+
+ROW_COLUMN = "_edurel_row"
+STAGING_VIEW = "_edurel_ingest"
+
+
+@dataclass
+class RejectedRow:
+    """A row of an INSERT script that was not loaded.
+
+    Attributes:
+        statement: 1-based number of the statement in the script
+        row: 1-based number of the row in its VALUES list; None if the whole statement was rejected
+        tablename: Target table; None if the statement could not be parsed
+        values: Values of the row as written in the script
+        reason: Why the row was rejected
+    """
+
+    statement: int
+    row: Optional[int]
+    tablename: Optional[str]
+    values: tuple[str, ...]
+    reason: str
+
+
+@dataclass
+class IngestReport:
+    """Loaded row counts per table and the rejected rows of an INSERT script."""
+
+    inserted: dict[str, int] = field(default_factory=dict)
+    rejected: list[RejectedRow] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.rejected
+
+    def rejected_df(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [
+                {
+                    "statement": rejected.statement,
+                    "row": rejected.row,
+                    "table": rejected.tablename,
+                    "values": ", ".join(rejected.values),
+                    "reason": rejected.reason,
+                }
+                for rejected in self.rejected
+            ],
+            columns=["statement", "row", "table", "values", "reason"],
+        )
+
+    def __str__(self) -> str:
+        lines = [f"Inserted {sum(self.inserted.values())} rows, rejected {len(self.rejected)}."]
+        for rejected in self.rejected:
+            location = f"statement {rejected.statement}"
+            if rejected.row is not None:
+                location += f", row {rejected.row}"
+            lines.append(f"- {location}: {rejected.reason}")
+        return "\n".join(lines)
+
+
+def split_statements(sql: str, dialect: str = "postgres") -> list[str]:
+    """Split a script at semicolons outside of literals and comments."""
+    statements = []
+    start = 0
+    for token in Dialect.get_or_raise(dialect).tokenize(sql):
+        if token.token_type == TokenType.SEMICOLON:
+            statements.append(sql[start:token.start])
+            start = token.end + 1
+    statements.append(sql[start:])
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def literal_value(expression: exp.Expression, dialect: str = "postgres") -> Any:
+    """Python value of a literal value expression; raises ValueError for anything else."""
+    if isinstance(expression, exp.Null):
+        return None
+    if isinstance(expression, exp.Boolean):
+        return expression.this
+    if isinstance(expression, (exp.Paren, exp.Cast, exp.TryCast)):
+        return literal_value(expression.this, dialect)
+    if isinstance(expression, exp.Neg) and isinstance(expression.this, exp.Literal):
+        return -literal_value(expression.this, dialect)
+    if isinstance(expression, exp.Literal):
+        if expression.is_string:
+            return expression.this
+        text = expression.this
+        return int(text) if re.fullmatch(r"[0-9]+", text) else Decimal(text)
+    raise ValueError(f"Unsupported value '{expression.sql(dialect=dialect)}'; only literals can be ingested.")
+
+
+def _convert(base: str, value: Any) -> Any:
+    if isinstance(value, bool) and (base in INTEGER_BOUNDS or base in DECIMAL_TYPES or base in FLOAT_TYPES):
+        raise TypeError(value)
+    if base in INTEGER_BOUNDS:
+        number = Decimal(value)
+        if number != number.to_integral_value():
+            raise ValueError(value)
+        return int(number)
+    if base in DECIMAL_TYPES:
+        return Decimal(str(value))
+    if base in FLOAT_TYPES:
+        return float(value)
+    if base == "BOOLEAN":
+        return value if isinstance(value, bool) else BOOLEAN_TEXTS[str(value).strip().lower()]
+    if base == "DATE":
+        return date.fromisoformat(value).isoformat()
+    if base == "TIMESTAMP":
+        return datetime.fromisoformat(value).isoformat(sep=" ")
+    if base == "TIME":
+        return time.fromisoformat(value).isoformat()
+    if base == "UUID":
+        return str(UUID(value))
+    if base in TEXT_TYPES:
+        return value if isinstance(value, str) else str(value)
+    return value
+
+
+def check_value(column: Column, value: Any) -> Any:
+    """Check a literal against the column's type and return it in a form DuckDB casts losslessly.
+
+    Raises ValueError with the reason if the value does not fit.
+    """
+    if value is None:
+        if not column.nullable:
+            raise ValueError(f"Column '{column.columnname}' must not be NULL.")
+        return None
+    sql_type = column.sql_type
+    base = sql_type.base
+    try:
+        converted = _convert(base, value)
+    except (ValueError, KeyError, TypeError, InvalidOperation):
+        raise ValueError(
+            f"Value {value!r} is not a valid {sql_type.text} for column '{column.columnname}'."
+        ) from None
+    if base in INTEGER_BOUNDS:
+        lower, upper = INTEGER_BOUNDS[base]
+        if not lower <= converted <= upper:
+            raise ValueError(f"Value {value} is out of range for {sql_type.text} column '{column.columnname}'.")
+    elif base in DECIMAL_TYPES:
+        if sql_type.precision is not None and abs(converted) >= Decimal(10) ** (
+            sql_type.precision - (sql_type.scale or 0)
+        ):
+            raise ValueError(f"Value {value} has too many digits for {sql_type.text} column '{column.columnname}'.")
+        return str(converted)
+    elif base in TEXT_TYPES and sql_type.precision is not None and len(converted) > sql_type.precision:
+        raise ValueError(
+            f"Value of length {len(converted)} exceeds {sql_type.text} for column '{column.columnname}'."
+        )
+    return converted
+
+
+class InsertScriptIngestor:
+    """Load INSERT ... VALUES scripts, e.g. LLM output, row by row checked and in bulk.
+
+    The script is parsed with sqlglot and its rows are grouped per table.
+    Every value is checked against the column type of the schema; primary
+    keys are checked for duplicates within the script and in the database,
+    and foreign keys for existing targets (for cycle foreign keys, rows of
+    the script count as targets too).
+    Tables are appended in dependency level order with one bulk insert per
+    table, all in one transaction. Rows that fail a check are reported in
+    the IngestReport instead of aborting the script.
+
+    Args:
+        rel_schema: Schema of the target tables
+        dialect: SQL dialect of the scripts
+    """
+
+    def __init__(self, rel_schema: RelSchema, dialect: str = "postgres"):
+        self.rel_schema = rel_schema
+        self.dialect = dialect
+        enrich_ast(rel_schema)
+        self.tables: dict[str, Table] = {table.tablename.lower(): table for table in rel_schema.tables}
+
+    def table_order(self) -> list[Table]:
+        """Tables in dependency level order (enrich_ast)."""
+        return sorted(self.rel_schema.tables, key=lambda table: table.level)
+
+    def _values_text(self, expressions: list[exp.Expression]) -> tuple[str, ...]:
+        # Rendered only for rejected rows; rendering every value would double the parse time.
+        return tuple(expression.sql(dialect=self.dialect) for expression in expressions)
+
+    def _statements(self, sql: str, report: IngestReport) -> list[tuple[int, exp.Expression]]:
+        try:
+            return [
+                (number, expression)
+                for number, expression in enumerate(parse_sql(sql, self.dialect), start=1)
+                if expression is not None
+            ]
+        except ValueError:
+            pass
+        # Parse statement by statement so that one broken statement only rejects itself.
+        statements = []
+        for number, text in enumerate(split_statements(sql, self.dialect), start=1):
+            try:
+                statements.extend((number, expression) for expression in parse_sql(text, self.dialect) if expression)
+            except ValueError as e:
+                report.rejected.append(RejectedRow(number, None, None, (), " ".join(str(e).split())))
+        return statements
+
+    def _collect_rows(
+        self,
+        number: int,
+        statement: exp.Expression,
+        rows: dict[str, list[dict[str, Any]]],
+        report: IngestReport,
+        allowed: Optional[set[str]],
+    ) -> None:
+        target = statement.this if isinstance(statement, exp.Insert) else None
+        target_table = target.this if isinstance(target, exp.Schema) else target
+        if not isinstance(target_table, exp.Table):
+            report.rejected.append(
+                RejectedRow(number, None, None, (), "Only INSERT statements can be ingested.")
+            )
+            return
+        table = self.tables.get(target_table.name.lower())
+        if table is None:
+            report.rejected.append(
+                RejectedRow(number, None, target_table.name, (), f"Unknown table '{target_table.name}'.")
+            )
+            return
+        if allowed is not None and table.tablename.lower() not in allowed:
+            report.rejected.append(
+                RejectedRow(number, None, table.tablename, (), f"Table '{table.tablename}' is not expected here.")
+            )
+            return
+        if not isinstance(statement.expression, exp.Values):
+            report.rejected.append(
+                RejectedRow(number, None, table.tablename, (), "Only INSERT ... VALUES statements can be ingested.")
+            )
+            return
+
+        columns_by_name = {column.columnname.lower(): column for column in table.columns}
+        if isinstance(target, exp.Schema):
+            names = [identifier.name for identifier in target.expressions]
+            unknown = [name for name in names if name.lower() not in columns_by_name]
+            if unknown:
+                report.rejected.append(
+                    RejectedRow(
+                        number, None, table.tablename, (),
+                        f"Unknown column '{unknown[0]}' in table '{table.tablename}'.",
+                    )
+                )
+                return
+            columns = [columns_by_name[name.lower()] for name in names]
+        else:
+            columns = table.columns
+
+        for row_number, row in enumerate(statement.expression.expressions, start=1):
+            expressions = row.expressions if isinstance(row, exp.Tuple) else [row]
+            if len(expressions) != len(columns):
+                report.rejected.append(
+                    RejectedRow(
+                        number, row_number, table.tablename, self._values_text(expressions),
+                        f"Row has {len(expressions)} values for {len(columns)} columns.",
+                    )
+                )
+                continue
+            record: dict[str, Any] = {}
+            try:
+                given = {column.columnname: literal_value(e, self.dialect) for column, e in zip(columns, expressions)}
+                for column in table.columns:
+                    record[column.columnname] = check_value(column, given.get(column.columnname))
+            except ValueError as e:
+                report.rejected.append(
+                    RejectedRow(number, row_number, table.tablename, self._values_text(expressions), str(e))
+                )
+                continue
+            record[ROW_COLUMN] = (number, row_number, expressions)
+            rows.setdefault(table.tablename, []).append(record)
+
+    def _key_violations(
+        self, db: DuckDbMan, table: Table, frame: pd.DataFrame, rows: dict[str, list[dict[str, Any]]]
+    ) -> dict[int, str]:
+        """Positions of staged rows whose keys clash with the database, with the reason.
+
+        Cycle foreign keys (including self references) may also point to rows
+        of the script: to the other staged rows of the same table, or to the
+        script rows of a table that is loaded later.
+        """
+        violations: dict[int, str] = {}
+        columns = {column.columnname: column for column in table.columns}
+        views = {STAGING_VIEW: frame.drop(columns=[ROW_COLUMN]).reset_index(names="_edurel_position")}
+
+        def cast(alias: str, columnname: str, column: Column) -> str:
+            return f"CAST({alias}.{db.quote_identifier(columnname)} AS {column.sql_type.render('duckdb')})"
+
+        def staged(columnname: str) -> str:
+            return cast("s", columnname, columns[columnname])
+
+        checks = []
+        if table.primary_key:
+            condition = " AND ".join(
+                f"t.{db.quote_identifier(name)} = {staged(name)}" for name in table.primary_key
+            )
+            checks.append(
+                (
+                    f"EXISTS (SELECT 1 FROM {db.quote_identifier(table.tablename)} t WHERE {condition})",
+                    f"Primary key ({', '.join(table.primary_key)}) already exists in '{table.tablename}'.",
+                )
+            )
+        for number, foreign_key in enumerate(table.foreign_keys):
+            target_table = self.tables.get(foreign_key.targettable.lower())
+            if target_table is None:
+                continue
+            pairs = list(zip(foreign_key.sourcecolumns, foreign_key.targetcolumns))
+            not_null = " AND ".join(f"s.{db.quote_identifier(name)} IS NOT NULL" for name in foreign_key.sourcecolumns)
+            condition = " AND ".join(f"t.{db.quote_identifier(target)} = {staged(source)}" for source, target in pairs)
+            check = (
+                f"{not_null} AND NOT EXISTS "
+                f"(SELECT 1 FROM {db.quote_identifier(target_table.tablename)} t WHERE {condition})"
+            )
+            if foreign_key.is_cycle:
+                if target_table is table:
+                    view = STAGING_VIEW
+                else:
+                    view = f"{STAGING_VIEW}_{number}"
+                    views[view] = pd.DataFrame(
+                        rows.get(target_table.tablename, []),
+                        columns=[column.columnname for column in target_table.columns],
+                    )
+                target_columns = {column.columnname: column for column in target_table.columns}
+                script_condition = " AND ".join(
+                    f"{cast('p', target, target_columns[target])} = {staged(source)}" for source, target in pairs
+                )
+                check += f" AND NOT EXISTS (SELECT 1 FROM {view} p WHERE {script_condition})"
+            checks.append(
+                (
+                    check,
+                    f"Foreign key ({', '.join(foreign_key.sourcecolumns)}) references a missing row "
+                    f"of '{foreign_key.targettable}'.",
+                )
+            )
+        if not checks:
+            return violations
+
+        with db.registered(views):
+            for condition, reason in checks:
+                for (position,) in db.fetch_rows(
+                    f"SELECT s._edurel_position FROM {STAGING_VIEW} s WHERE {condition}"
+                ):
+                    violations.setdefault(position, reason)
+        return violations
+
+    def _load_table(
+        self,
+        db: DuckDbMan,
+        table: Table,
+        rows: dict[str, list[dict[str, Any]]],
+        report: IngestReport,
+        refused: Optional[str] = None,
+    ) -> None:
+        """Check the script rows of a table and append the valid ones.
+
+        If refused is given, the rows that pass the checks are rejected with
+        that reason instead of being inserted.
+        """
+        frame = pd.DataFrame(
+            rows[table.tablename], columns=[ROW_COLUMN, *(column.columnname for column in table.columns)]
+        )
+        if table.primary_key:
+            duplicated = frame.duplicated(subset=table.primary_key, keep="first")
+        else:
+            duplicated = pd.Series(False, index=frame.index)
+        for position in frame.index[duplicated]:
+            number, row_number, expressions = frame.at[position, ROW_COLUMN]
+            report.rejected.append(
+                RejectedRow(
+                    number, row_number, table.tablename, self._values_text(expressions),
+                    f"Duplicate primary key ({', '.join(table.primary_key)}) within the script.",
+                )
+            )
+        frame = frame[~duplicated].reset_index(drop=True)
+
+        self_reference = any(
+            foreign_key.targettable.lower() == table.tablename.lower() for foreign_key in table.foreign_keys
+        )
+        violations: dict[int, str] = {}
+        while True:
+            found = self._key_violations(db, table, frame.drop(index=list(violations)), rows)
+            violations.update(found)
+            # Rows referring to a row rejected just now have to be checked again.
+            if not found or not self_reference:
+                break
+        if refused is not None:
+            for position in frame.index.difference(list(violations)):
+                violations[position] = refused
+        for position, reason in sorted(violations.items()):
+            number, row_number, expressions = frame.at[position, ROW_COLUMN]
+            report.rejected.append(
+                RejectedRow(number, row_number, table.tablename, self._values_text(expressions), reason)
+            )
+        frame = frame.drop(index=list(violations)).drop(columns=[ROW_COLUMN])
+
+        if not frame.empty:
+            db.insert_df(table.tablename, frame)
+        report.inserted[table.tablename] = len(frame)
+
+    def _load(self, db: DuckDbMan, rows: dict[str, list[dict[str, Any]]], report: IngestReport) -> None:
+        """Load all tables in one transaction.
+
+        A constraint the checks do not cover (e.g. a UNIQUE constraint that is
+        not in the schema) aborts DuckDB's transaction. The load is then
+        repeated with the rows of the failing table rejected.
+        """
+        parse_rejected = list(report.rejected)
+        refused: dict[str, str] = {}
+        while True:
+            report.inserted = {}
+            report.rejected = list(parse_rejected)
+            current = None
+            try:
+                with db.transaction():
+                    for table in self.table_order():
+                        if table.tablename in rows:
+                            current = table
+                            self._load_table(db, table, rows, report, refused.get(table.tablename))
+                return
+            except duckdb.ConstraintException as e:
+                if current is None or current.tablename in refused:
+                    raise
+                refused[current.tablename] = f"Rejected by the database: {' '.join(str(e).split())}"
+
+    def ingest(self, db: DuckDbMan, sql: str, tables: Optional[Iterable[str]] = None) -> IngestReport:
+        """Check and load an INSERT script; the rejected rows are in the returned report.
+
+        Args:
+            db: Database whose tables already exist
+            sql: INSERT script
+            tables: If given, statements for other tables are rejected
+        """
+        report = IngestReport()
+        rows: dict[str, list[dict[str, Any]]] = {}
+        allowed = {tablename.lower() for tablename in tables} if tables is not None else None
+        with span("ingest.parse"):
+            for number, statement in self._statements(sql, report):
+                self._collect_rows(number, statement, rows, report, allowed)
+        with span("ingest.load", tables=len(rows)):
+            self._load(db, rows, report)
+        report.rejected.sort(key=lambda rejected: (rejected.statement, rejected.row or 0))
+        return report
+
+
+def ingest_insert_script(db: DuckDbMan, rel_schema: RelSchema, sql: str, dialect: str = "postgres") -> IngestReport:
+    """Load an INSERT script into existing tables; see InsertScriptIngestor."""
+    return InsertScriptIngestor(rel_schema, dialect).ingest(db, sql)
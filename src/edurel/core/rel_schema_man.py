@@ -3,10 +3,17 @@ from pathlib import Path
 from typing import Optional
 from urllib.request import urlopen
 
+import pandas as pd
+
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.core.synthetic_data import SyntheticDataGenerator
 from edurel.syntax.rel_ast import RelAstFactory, RelSchema, validate_ast, enrich_ast
+from edurel.syntax.rel_sql_check import RelSchemaIndex, SqlSchemaCheck, check_sql_against_ast
 from edurel.syntax.rel_yaml_schema import schema
+from edurel.translation.rel_diff import RelSchemaDiff, diff_ast, migration_sql
 from edurel.translation.rel_trans import (
     MermaidTranslationBuilder,
+    PromptTranslationBuilder,
     RelSchemaTranslationBuilder,
     RelSchemaTranslationVisitor,
     RelSchemaLevelTranslationVisitor,
@@ -14,10 +21,13 @@ from edurel.translation.rel_trans import (
     SqlTranslationBuilderFkInternal,
     StructureTranslationBuilder,
     YamlTranslationBuilder,
+    get_sql_dialect,
 )
+from edurel.utils.instrument import span
 from edurel.utils.mermaid import display_mermaid_diagram as display_mermaid_diagram_util, save_mermaid_png
 from edurel.utils.md import display_md, md_plain, md_yaml, md_sql
 from edurel.utils.misc import save_text_to_file
+from edurel.utils.sql import validate_sql
 from edurel.utils.yaml import parse_yaml
 
 
@@ -33,6 +43,7 @@ class RelSchemaMan:
             validate_ast(self.ast)
         else:
             self.ast = deepcopy(rel_ast)
+        self._sql_index: Optional[RelSchemaIndex] = None
 
     @classmethod
     def fromStr(cls, yaml_str: str) -> "RelSchemaMan":
@@ -60,9 +71,10 @@ class RelSchemaMan:
         builder: RelSchemaTranslationBuilder,
         visitor_class: type[RelSchemaTranslationVisitor] = RelSchemaTranslationVisitor,
     ) -> str:
-        visitor = visitor_class(builder)
-        visitor.visit(self.ast)
-        return builder.build()
+        with span("rel.translate", builder=type(builder).__name__):
+            visitor = visitor_class(builder)
+            visitor.visit(self.ast)
+            return builder.build()
 
     # AST
     def get_ast(self) -> RelSchema:
@@ -79,16 +91,98 @@ class RelSchemaMan:
         save_text_to_file(self.get_yaml(), output_path, overwrite=overwrite)
 
     # SQL
-    def get_sql(self, fk_external: bool = True) -> str:
+    def get_sql(self, fk_external: Optional[bool] = None, dialect: str = "postgres", verify: bool = False) -> str:
+        """CREATE TABLE script of the schema.
+
+        fk_external=True adds foreign keys with ALTER TABLE after all tables,
+        False declares them inline (tables in level order, cycle foreign keys
+        skipped). The default picks ALTER TABLE where the dialect supports it
+        and inline foreign keys otherwise (duckdb, sqlite).
+        """
+        if fk_external is None:
+            fk_external = get_sql_dialect(dialect).supports_alter_foreign_key
         if fk_external:
-            return self._translate(SqlTranslationBuilderFkExternal(), RelSchemaTranslationVisitor)
+            sql = self._translate(SqlTranslationBuilderFkExternal(dialect), RelSchemaTranslationVisitor)
         else:
             enrich_ast(self.ast)
-            return self._translate(SqlTranslationBuilderFkInternal(), RelSchemaLevelTranslationVisitor)
-    def display_sql(self, fk_external: bool = True) -> None:
-        display_md(md_sql(self.get_sql(fk_external)))
-    def save_sql(self, output_path: str, fk_external: bool = True, overwrite: bool = False) -> None:
-        save_text_to_file(self.get_sql(fk_external=fk_external), output_path, overwrite=overwrite)
+            sql = self._translate(SqlTranslationBuilderFkInternal(dialect), RelSchemaLevelTranslationVisitor)
+        if verify:
+            validate_sql(sql, dialect)
+        return sql
+    def display_sql(self, fk_external: Optional[bool] = None, dialect: str = "postgres") -> None:
+        display_md(md_sql(self.get_sql(fk_external, dialect=dialect)))
+    def save_sql(self, output_path: str, fk_external: Optional[bool] = None, dialect: str = "postgres", overwrite: bool = False) -> None:
+        save_text_to_file(self.get_sql(fk_external=fk_external, dialect=dialect), output_path, overwrite=overwrite)
+
+    # DATABASE
+    def materialize(self, db: DuckDbMan) -> None:
+        """Create the schema's tables and datalist rows in a DuckDB database.
+
+        Tables are created in dependency level order with inline foreign keys
+        (cycle foreign keys are skipped, as in get_sql(fk_external=False)), and
+        each datalist is loaded with a single bulk insert. Everything runs in
+        one transaction, so a failure leaves the database unchanged.
+
+        Args:
+            db: Target database
+        """
+        enrich_ast(self.ast)
+        builder = SqlTranslationBuilderFkInternal("duckdb")
+        self._translate(builder, RelSchemaLevelTranslationVisitor)
+        with db.transaction():
+            for create_statement in builder.create_statements:
+                db.execute(create_statement)
+            for datalist in self.ast.datalists:
+                positions = list(range(1, len(datalist.values) + 1))
+                db.insert_df(
+                    datalist.tablename,
+                    pd.DataFrame(
+                        {
+                            "ID": positions,
+                            "Description": list(datalist.values),
+                            "IsValid": [1] * len(positions),
+                            "SortOrder": positions,
+                        }
+                    ),
+                )
+
+    def load_synthetic_data(
+        self, db: DuckDbMan, rows: int | dict[str, int] = 100, seed: int = 0, batch_size: int = 1_000_000
+    ) -> dict[str, int]:
+        """Materialize the schema and fill its tables with seeded synthetic rows.
+
+        See SyntheticDataGenerator for how values are chosen.
+
+        Args:
+            db: Target database
+            rows: Rows per table, or a dict of rows per table name
+            seed: Random seed; the same seed and batch size yield the same data
+            batch_size: Maximum rows generated and inserted at once
+
+        Returns:
+            Number of inserted rows per table (datalist tables report 0)
+        """
+        self.materialize(db)
+        return SyntheticDataGenerator(self.ast, seed).load(db, rows, batch_size)
+
+    # MIGRATION
+    def diff(self, target: "RelSchemaMan") -> RelSchemaDiff:
+        return diff_ast(self.ast, target.ast)
+    def display_diff(self, target: "RelSchemaMan") -> None:
+        display_md(md_plain(str(self.diff(target))))
+    def get_migration_sql(self, target: "RelSchemaMan", dialect: str = "duckdb") -> str:
+        return migration_sql(self.diff(target), dialect=dialect)
+    def display_migration_sql(self, target: "RelSchemaMan", dialect: str = "duckdb") -> None:
+        display_md(md_sql(self.get_migration_sql(target, dialect=dialect)))
+
+    # QUERY CHECK
+    def check_sql(self, sql: str, dialect: str = "postgres") -> SqlSchemaCheck:
+        """Check the tables, columns and joins of a query against this schema without a database."""
+        if self._sql_index is None:
+            self._sql_index = RelSchemaIndex(self.ast)
+        return check_sql_against_ast(sql, self._sql_index, dialect=dialect)
+    def display_sql_check(self, sql: str, dialect: str = "postgres") -> None:
+        display_md(md_plain(str(self.check_sql(sql, dialect=dialect))))
 
     # MERMAID
     def get_mermaid_code(self, direction: str = "TB") -> str:
@@ -124,3 +218,10 @@ class RelSchemaMan:
         return self._translate(StructureTranslationBuilder(), RelSchemaTranslationVisitor)
     def display_structure(self) -> None:
         display_md(md_plain(self.get_structure()))
+
+    # PROMPT
+    def get_prompt_schema(self, max_datalist_values: int = 5) -> str:
+        """Compact one-line-per-table schema for LLM prompts; much shorter than get_yaml()."""
+        return self._translate(PromptTranslationBuilder(max_datalist_values), RelSchemaTranslationVisitor)
+    def display_prompt_schema(self, max_datalist_values: int = 5) -> None:
+        display_md(md_plain(self.get_prompt_schema(max_datalist_values)))
@@ -0,0 +1,273 @@
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.syntax.rel_ast import Column, RelSchema, Table, enrich_ast
+from edurel.syntax.sql_type import SqlType
+
+
+INTEGER_RANGES: dict[str, int] = {
+    "SMALLINT": 32_767,
+    "INT": 1_000_000,
+    "INTEGER": 1_000_000,
+    "BIGINT": 1_000_000_000,
+}
+FLOAT_TYPES = frozenset({"FLOAT", "DOUBLE", "REAL"})
+DECIMAL_TYPES = frozenset({"DECIMAL", "NUMERIC"})
+TEXT_TYPES = frozenset({"CHAR", "VARCHAR", "TEXT"})
+
+DATE_ORIGIN = np.datetime64("2020-01-01")
+DATE_SPAN_DAYS = 5 * 365
+
+
+BASE36_DIGITS = np.array(list("0123456789abcdefghijklmnopqrstuvwxyz"))
+
+
+def _base36_codes(numbers: np.ndarray, width: int) -> np.ndarray:
+    """Base-36 representation of non-negative integers, zero-padded to width characters."""
+    codes = np.full(len(numbers), "", dtype=f"U{width}")
+    remaining = numbers.astype(np.int64)
+    for _ in range(width):
+        codes = np.char.add(BASE36_DIGITS[remaining % 36], codes)
+        remaining = remaining // 36
+    return codes
+
+
+class SyntheticDataGenerator:
+    """Seeded synthetic rows for the tables of a RelSchema.
+
+    Values are generated column by column with NumPy according to the SQL
+    type. Single-column integer and text primary keys are sequential and
+    therefore unique; text keys that would not fit their CHAR/VARCHAR width
+    as column_n become base-36 codes of the row number. Foreign key columns
+    sample existing key rows of the referenced table, which is generated
+    first (enrich_ast level order).
+    Tables with a datalist use the datalist rows (ID = position). Nullable
+    columns get a share of NULLs. Cycle foreign key columns are NULL if
+    nullable and unconstrained values otherwise, because the referenced rows
+    may not exist yet.
+
+    The same seed and batch size yield the same data.
+
+    Args:
+        rel_schema: Schema to generate data for
+        seed: Random seed
+        null_fraction: Share of NULLs in nullable, non-key columns
+    """
+
+    def __init__(self, rel_schema: RelSchema, seed: int = 0, null_fraction: float = 0.1):
+        self.rel_schema = rel_schema
+        self.seed = seed
+        self.null_fraction = null_fraction
+        enrich_ast(rel_schema)
+        self.tables: dict[str, Table] = {table.tablename: table for table in rel_schema.tables}
+        self.datalists = {datalist.tablename: datalist for datalist in rel_schema.datalists}
+        self.keys: dict[str, pd.DataFrame] = {}
+
+    def table_order(self) -> list[Table]:
+        """Tables in dependency level order (enrich_ast)."""
+        return sorted(self.rel_schema.tables, key=lambda table: table.level)
+
+    def _rng(self, table: Table, batch_start: int) -> np.random.Generator:
+        table_index = self.rel_schema.tables.index(table)
+        return np.random.default_rng([self.seed, table_index, batch_start])
+
+    def _datalist_frame(self, tablename: str) -> pd.DataFrame:
+        values = self.datalists[tablename].values
+        positions = np.arange(1, len(values) + 1)
+        return pd.DataFrame(
+            {"ID": positions, "Description": list(values), "IsValid": 1, "SortOrder": positions}
+        )
+
+    def _values(
+        self, column: Column, rng: np.random.Generator, start: int, count: int, sequential: bool
+    ) -> np.ndarray:
+        sql_type: SqlType = column.sql_type
+        base = sql_type.base
+        if base in INTEGER_RANGES:
+            if sequential:
+                return np.arange(start + 1, start + count + 1, dtype=np.int64)
+            return rng.integers(0, INTEGER_RANGES[base], size=count, dtype=np.int64)
+        if base in DECIMAL_TYPES:
+            precision = sql_type.precision or 10
+            scale = sql_type.scale or 0
+            upper = 10 ** min(precision - scale, 12) - 1
+            return np.round(rng.uniform(0, upper, size=count), scale)
+        if base in FLOAT_TYPES:
+            return rng.normal(1000.0, 250.0, size=count)
+        if base == "BOOLEAN":
+            return rng.random(count) < 0.5
+        if base == "DATE":
+            return DATE_ORIGIN + rng.integers(0, DATE_SPAN_DAYS, size=count).astype("timedelta64[D]")
+        if base == "TIMESTAMP":
+            seconds = rng.integers(0, DATE_SPAN_DAYS * 86_400, size=count)
+            return DATE_ORIGIN.astype("datetime64[s]") + seconds.astype("timedelta64[s]")
+        if base == "TIME":
+            seconds = rng.integers(0, 86_400, size=count).astype("timedelta64[s]")
+            timestamps = (np.datetime64("1970-01-01T00:00:00") + seconds).astype(str)
+            return np.char.partition(timestamps, "T")[:, 2].astype(object)
+        if base == "UUID":
+            # 32 hex digits per value, which DuckDB casts to UUID.
+            hex_digits = rng.bytes(16 * count).hex().encode("ascii")
+            return np.frombuffer(hex_digits, dtype="S32").astype("U32").astype(object)
+        if base == "BYTEA":
+            data = rng.bytes(8 * count)
+            return np.array([data[i:i + 8] for i in range(0, 8 * count, 8)], dtype=object)
+        numbers = (
+            np.arange(start + 1, start + count + 1)
+            if sequential
+            else rng.integers(0, max(count, 1) * 10, size=count)
+        )
+        width = sql_type.precision if base in TEXT_TYPES else None
+        prefix = f"{column.columnname}_"
+        if sequential and width is not None and len(prefix) + len(str(start + count)) > width:
+            # Truncating column_123 to the width would repeat keys, so use
+            # fixed-width base-36 codes of the row number instead.
+            if start + count >= 36**width:
+                raise ValueError(
+                    f"Cannot generate {start + count} unique keys for column '{column.columnname}': "
+                    f"{column.sql_type.render('duckdb')} fits at most {36**width - 1} base-36 keys."
+                )
+            return _base36_codes(numbers, width).astype(object)
+        texts = np.char.add(prefix, numbers.astype(str))
+        if width is not None:
+            texts = texts.astype(f"U{width}")
+        return texts.astype(object)
+
+    def _null_mask(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        return rng.random(count) < self.null_fraction
+
+    def _generate_batch(self, table: Table, start: int, count: int) -> pd.DataFrame:
+        rng = self._rng(table, start)
+        columns: dict[str, object] = {}
+        foreign_key_columns: set[str] = set()
+        for foreign_key in table.foreign_keys:
+            foreign_key_columns.update(foreign_key.sourcecolumns)
+            nullable = all(
+                column.nullable for column in table.columns if column.columnname in foreign_key.sourcecolumns
+            )
+            target_keys = self.keys.get(foreign_key.targettable)
+            if foreign_key.is_cycle or target_keys is None or target_keys.empty:
+                if not foreign_key.is_cycle and not nullable and count > 0:
+                    raise ValueError(
+                        f"Cannot generate rows for table '{table.tablename}': referenced table "
+                        f"'{foreign_key.targettable}' has no rows."
+                    )
+                if nullable:
+                    for source_column in foreign_key.sourcecolumns:
+                        columns[source_column] = pd.Series([None] * count, dtype=object)
+                else:
+                    foreign_key_columns.difference_update(foreign_key.sourcecolumns)
+                continue
+            picks = rng.integers(0, len(target_keys), size=count)
+            for source_column, target_column in zip(foreign_key.sourcecolumns, foreign_key.targetcolumns):
+                values = pd.Series(target_keys[target_column].to_numpy()[picks])
+                if nullable and source_column not in table.primary_key:
+                    values = values.mask(self._null_mask(rng, count))
+                columns[source_column] = values
+
+        sequential_key = (
+            len(table.primary_key) == 1 and table.primary_key[0] not in foreign_key_columns
+        )
+        for column in table.columns:
+            if column.columnname in columns:
+                continue
+            values = self._values(
+                column,
+                rng,
+                start,
+                count,
+                sequential=sequential_key and column.columnname == table.primary_key[0],
+            )
+            series = pd.Series(values)
+            if column.nullable and column.columnname not in table.primary_key:
+                series = series.mask(self._null_mask(rng, count))
+            columns[column.columnname] = series
+        frame = pd.DataFrame({column.columnname: columns[column.columnname] for column in table.columns})
+        if table.primary_key and not sequential_key:
+            frame = frame.drop_duplicates(subset=table.primary_key, ignore_index=True)
+        return frame
+
+    def generate_table(self, table: Table, rows: int, batch_size: int = 1_000_000) -> Iterator[pd.DataFrame]:
+        """Yield the rows of one table in batches and remember its keys for referencing tables.
+
+        Tables whose primary key is not a single generated column are created
+        in one batch and deduplicated on the key, so they may get fewer rows.
+        """
+        if table.tablename in self.datalists:
+            frame = self._datalist_frame(table.tablename)
+            self.keys[table.tablename] = frame[table.primary_key or ["ID"]]
+            yield frame
+            return
+        key_columns = table.primary_key or [column.columnname for column in table.columns]
+        single_batch = not (
+            len(table.primary_key) == 1
+            and not any(table.primary_key[0] in fk.sourcecolumns for fk in table.foreign_keys)
+        )
+        step = rows if single_batch else max(batch_size, 1)
+        key_frames = []
+        for start in range(0, rows, max(step, 1)):
+            frame = self._generate_batch(table, start, min(step, rows - start))
+            key_frames.append(frame[key_columns])
+            yield frame
+        self.keys[table.tablename] = (
+            pd.concat(key_frames, ignore_index=True) if key_frames else pd.DataFrame(columns=key_columns)
+        )
+
+    def generate(self, rows: int | dict[str, int] = 100) -> dict[str, pd.DataFrame]:
+        """Generate all tables in memory.
+
+        Args:
+            rows: Rows per table, or a dict of rows per table name (missing tables get none)
+        """
+        self.keys = {}
+        frames: dict[str, pd.DataFrame] = {}
+        for table in self.table_order():
+            batches = list(self.generate_table(table, self._rows_for(table, rows)))
+            frames[table.tablename] = (
+                pd.concat(batches, ignore_index=True)
+                if batches
+                else pd.DataFrame(columns=[column.columnname for column in table.columns])
+            )
+        return frames
+
+    @staticmethod
+    def _rows_for(table: Table, rows: int | dict[str, int]) -> int:
+        return rows.get(table.tablename, 0) if isinstance(rows, dict) else rows
+
+    def load(
+        self,
+        db: DuckDbMan,
+        rows: int | dict[str, int] = 100,
+        batch_size: int = 1_000_000,
+        include_datalists: bool = False,
+    ) -> dict[str, int]:
+        """Generate data and bulk insert it into existing tables in one transaction.
+
+        Each batch is a pandas DataFrame of NumPy columns that DuckDB scans
+        directly (see DuckDbMan.insert_df).
+
+        Args:
+            db: Database whose tables already exist, e.g. from RelSchemaMan.materialize
+            rows: Rows per table, or a dict of rows per table name
+            batch_size: Maximum rows generated and inserted at once
+            include_datalists: Also insert datalist rows; materialize already does that
+
+        Returns:
+            Number of inserted rows per table
+        """
+        self.keys = {}
+        inserted: dict[str, int] = {}
+        with db.transaction():
+            for table in self.table_order():
+                is_datalist = table.tablename in self.datalists
+                count = 0
+                for frame in self.generate_table(table, self._rows_for(table, rows), batch_size):
+                    if is_datalist and not include_datalists:
+                        continue
+                    db.insert_df(table.tablename, frame)
+                    count += len(frame)
+                inserted[table.tablename] = count
+        return inserted
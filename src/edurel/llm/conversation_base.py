@@ -1,5 +1,8 @@
+import asyncio
+from dataclasses import dataclass
+import time
 from IPython.display import Markdown, display
-from typing import List, Union, Optional
+from typing import AsyncIterator, Iterator, List, Sequence, Union, Optional
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import (
     BaseMessage,
@@ -8,12 +11,44 @@ from langchain_core.messages import (
     AIMessage,
 )
 
+from edurel.llm.llm_cache import LlmResponseCache
+from edurel.llm.token_budget import (
+    TRIM_POLICIES,
+    Summarizer,
+    TokenUsage,
+    Tokenizer,
+    approx_token_count,
+    count_message_tokens,
+    default_summarizer,
+    trim_messages,
+)
+from edurel.utils.instrument import span
 from edurel.utils.misc import gslice
 
 
+@dataclass
+class StreamMetrics:
+    """Timing of one streamed LLM response, in seconds from the start of the call.
+
+    completed is False when the stream raised or was closed before the model finished.
+    """
+
+    time_to_first_token: Optional[float] = None
+    latency: Optional[float] = None
+    chunks: int = 0
+    completed: bool = False
+
+
 class Conversation:
     def __init__(self):
         self.messages: List[BaseMessage] = []
+        self.last_stream_metrics: Optional[StreamMetrics] = None
+        self.pinned_messages: List[BaseMessage] = []
+        self.token_usage: List[TokenUsage] = []
+        self.tokenizer: Tokenizer = approx_token_count
+        self.token_budget: Optional[int] = None
+        self.trim_policy = "drop_oldest"
+        self.summarizer: Summarizer = default_summarizer
 
     @classmethod
     def create(cls):
@@ -39,13 +74,196 @@ class Conversation:
         else:
             self.messages.insert(0, system_msg)
 
-    def call_llm(self, model: BaseChatModel) -> str:
+    # TOKENS
+    def set_token_budget(
+        self,
+        budget: Optional[int],
+        policy: str = "drop_oldest",
+        tokenizer: Optional[Tokenizer] = None,
+        summarizer: Optional[Summarizer] = None,
+    ) -> None:
+        """Limit the tokens sent per call; the conversation is trimmed before each call.
+
+        Args:
+            budget: Maximum prompt tokens, or None for no limit
+            policy: 'drop_oldest' removes the oldest unpinned messages,
+                'summarize' replaces them with a summary message,
+                'error' raises ValueError instead of trimming
+            tokenizer: Function counting the tokens of a text; defaults to approx_token_count
+            summarizer: Function turning removed messages into summary text for 'summarize'
+        """
+        if policy not in TRIM_POLICIES:
+            raise ValueError(f"Unsupported trim policy '{policy}'. Use one of: {', '.join(TRIM_POLICIES)}.")
+        self.token_budget = budget
+        self.trim_policy = policy
+        if tokenizer is not None:
+            self.tokenizer = tokenizer
+        if summarizer is not None:
+            self.summarizer = summarizer
+
+    def pin_message(self, index: int) -> None:
+        """Keep the message at index when the conversation is trimmed. System messages are always kept."""
+        self.pinned_messages.append(self.messages[index])
+
+    def is_pinned(self, message: BaseMessage) -> bool:
+        return isinstance(message, SystemMessage) or any(
+            message is pinned for pinned in self.pinned_messages
+        )
+
+    def count_tokens(self) -> List[int]:
+        """Token count of each message, including per-message overhead."""
+        return [count_message_tokens(message, self.tokenizer) for message in self.messages]
+
+    def total_tokens(self) -> int:
+        return sum(self.count_tokens())
+
+    def enforce_token_budget(self) -> int:
+        """Trim the conversation to the token budget and return the number of messages removed."""
+        if self.token_budget is None:
+            return 0
+        before = len(self.messages)
+        self.messages = trim_messages(
+            self.messages,
+            self.token_budget,
+            self.is_pinned,
+            policy=self.trim_policy,
+            tokenizer=self.tokenizer,
+            summarizer=self.summarizer,
+        )
+        return before - len(self.messages)
+
+    def _record_usage(self, sent: int, response: BaseMessage) -> TokenUsage:
+        usage_metadata = getattr(response, "usage_metadata", None)
+        if usage_metadata:
+            usage = TokenUsage(
+                sent=usage_metadata["input_tokens"],
+                received=usage_metadata["output_tokens"],
+                estimated=False,
+            )
+        else:
+            usage = TokenUsage(sent=sent, received=count_message_tokens(response, self.tokenizer))
+        self.token_usage.append(usage)
+        return usage
+
+    @property
+    def last_token_usage(self) -> Optional[TokenUsage]:
+        return self.token_usage[-1] if self.token_usage else None
+
+    # LLM
+    def _cached_response(
+        self, model: BaseChatModel, cache: Optional[LlmResponseCache]
+    ) -> Optional[str]:
+        if cache is None:
+            return None
+        content = cache.get(model, self.messages)
+        if content is None and cache.read_only:
+            raise LookupError(
+                f"No cached response for this conversation in read-only LLM cache {cache.path}."
+            )
+        return content
+
+    def call_llm(self, model: BaseChatModel, cache: Optional[LlmResponseCache] = None) -> str:
+        """Send the conversation to the model and return the response text.
+
+        Errors, including a miss in a read-only cache, are returned as
+        'err: ...' strings. With a cache, a stored response is returned
+        without calling the model, and successful responses are stored.
+        Responses made of content blocks are returned as their text.
+        """
+        try:
+            self.enforce_token_budget()
+            cached = self._cached_response(model, cache)
+        except (LookupError, ValueError) as e:
+            return f"err: {str(e)}"
+        if cached is not None:
+            return cached
+        sent = self.total_tokens()
+        with span("llm.call", model=type(model).__name__):
+            try:
+                ai_response = model.invoke(self.messages)
+            except Exception as e:
+                return f"err: {str(e)}"
+
+        self._record_usage(sent, ai_response)
+        if cache is not None:
+            cache.put(model, self.messages, ai_response.text)
+        return ai_response.text
+
+    async def acall_llm(self, model: BaseChatModel, cache: Optional[LlmResponseCache] = None) -> str:
+        """Async variant of call_llm using model.ainvoke."""
         try:
-            ai_response = model.invoke(self.messages)
-        except Exception as e:
-            ai_response = AIMessage(content=f"err: {str(e)}")
+            self.enforce_token_budget()
+            cached = self._cached_response(model, cache)
+        except (LookupError, ValueError) as e:
+            return f"err: {str(e)}"
+        if cached is not None:
+            return cached
+        sent = self.total_tokens()
+        with span("llm.call", model=type(model).__name__):
+            try:
+                ai_response = await model.ainvoke(self.messages)
+            except Exception as e:
+                return f"err: {str(e)}"
+
+        self._record_usage(sent, ai_response)
+        if cache is not None:
+            cache.put(model, self.messages, ai_response.text)
+        return ai_response.text
+
+    def stream_llm(self, model: BaseChatModel, append_response: bool = False) -> Iterator[str]:
+        """Yield the model's response text chunk by chunk using model.stream.
+
+        Unlike call_llm, errors are raised. Timings are stored in
+        last_stream_metrics. Closing the generator early cancels the call.
 
-        return ai_response.content
+        Args:
+            model: Chat model
+            append_response: If True, append the complete response as an AIMessage
+                once the stream has finished
+        """
+        self.enforce_token_budget()
+        sent = self.total_tokens()
+        metrics = StreamMetrics()
+        self.last_stream_metrics = metrics
+        start = time.perf_counter()
+        parts: List[str] = []
+        try:
+            for chunk in model.stream(self.messages):
+                if metrics.time_to_first_token is None:
+                    metrics.time_to_first_token = time.perf_counter() - start
+                metrics.chunks += 1
+                parts.append(chunk.text)
+                yield chunk.text
+            metrics.completed = True
+        finally:
+            metrics.latency = time.perf_counter() - start
+        response = AIMessage(content="".join(parts))
+        self._record_usage(sent, response)
+        if append_response:
+            self.insert_message_at_end(response)
+
+    async def astream_llm(self, model: BaseChatModel, append_response: bool = False) -> AsyncIterator[str]:
+        """Async variant of stream_llm using model.astream."""
+        self.enforce_token_budget()
+        sent = self.total_tokens()
+        metrics = StreamMetrics()
+        self.last_stream_metrics = metrics
+        start = time.perf_counter()
+        parts: List[str] = []
+        try:
+            async for chunk in model.astream(self.messages):
+                if metrics.time_to_first_token is None:
+                    metrics.time_to_first_token = time.perf_counter() - start
+                metrics.chunks += 1
+                parts.append(chunk.text)
+                yield chunk.text
+            metrics.completed = True
+        finally:
+            metrics.latency = time.perf_counter() - start
+        response = AIMessage(content="".join(parts))
+        self._record_usage(sent, response)
+        if append_response:
+            self.insert_message_at_end(response)
     
     def gen_prompt(self, gslice_spec: str = None) -> str:
         if gslice_spec is None:
@@ -189,3 +407,85 @@ class Conversation:
 
         output_str = "\n\n".join(output)
         display(Markdown(output_str))
+
+
+@dataclass
+class ConversationResult:
+    """Response of one conversation in a batch; exactly one of content and error is set.
+
+    latency is the model call's wall-clock time in seconds (0 for cached responses).
+    """
+
+    conversation: Conversation
+    content: Optional[str] = None
+    error: Optional[str] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def acall_llm_batch(
+    conversations: Sequence[Conversation],
+    model: BaseChatModel,
+    max_concurrency: int = 8,
+    cache: Optional[LlmResponseCache] = None,
+) -> List[ConversationResult]:
+    """Send many conversations to a model concurrently.
+
+    At most max_concurrency requests are in flight at once. Results are
+    returned in the order of `conversations`; a failed request is reported
+    in its result instead of aborting the batch. Responses are not appended
+    to the conversations.
+
+    Args:
+        conversations: Conversations to send
+        model: Chat model, called through ainvoke
+        max_concurrency: Maximum number of concurrent requests
+        cache: Optional response cache, used as in Conversation.call_llm
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call(conversation: Conversation) -> ConversationResult:
+        try:
+            conversation.enforce_token_budget()
+            cached = conversation._cached_response(model, cache)
+        except (LookupError, ValueError) as e:
+            return ConversationResult(conversation, error=f"{type(e).__name__}: {e}")
+        if cached is not None:
+            return ConversationResult(conversation, content=cached)
+        async with semaphore:
+            with span("llm.call", model=type(model).__name__):
+                start = time.perf_counter()
+                try:
+                    ai_response = await model.ainvoke(conversation.messages)
+                except Exception as e:
+                    return ConversationResult(
+                        conversation, error=f"{type(e).__name__}: {e}", latency=time.perf_counter() - start
+                    )
+                latency = time.perf_counter() - start
+        conversation._record_usage(conversation.total_tokens(), ai_response)
+        if cache is not None:
+            cache.put(model, conversation.messages, ai_response.text)
+        return ConversationResult(conversation, content=ai_response.text, latency=latency)
+
+    return list(await asyncio.gather(*(call(conversation) for conversation in conversations)))
+
+
+def call_llm_batch(
+    conversations: Sequence[Conversation],
+    model: BaseChatModel,
+    max_concurrency: int = 8,
+    cache: Optional[LlmResponseCache] = None,
+) -> List[ConversationResult]:
+    """Blocking wrapper around acall_llm_batch for scripts.
+
+    In a notebook, where an event loop is already running, await
+    acall_llm_batch directly instead.
+    """
+    return asyncio.run(
+        acall_llm_batch(conversations, model, max_concurrency=max_concurrency, cache=cache)
+    )
@@ -106,6 +106,7 @@ class ERRequirementsConversation(ERConversation):
         """)
 
         self.insert_message_at_end(instructions)
+        self.pin_message(-1)
 
     
     def insert_requirements_message(self, description: str) -> None:
@@ -357,6 +358,7 @@ class ERDesignConversation(ERConversation):
         """)
 
         self.insert_message_at_end(instructions)
+        self.pin_message(-1)
 
     
     def insert_design_message(self, description: str) -> None:
@@ -1,8 +1,10 @@
 from textwrap import dedent
 
-from edurel.utils.md import md_sql, md_yaml
-from typing import List
+from edurel.utils.md import md_plain, md_sql, md_yaml
+from typing import Dict, List, Optional
 from edurel.llm.conversation_base import Conversation
+from edurel.llm.schema_retrieval import SchemaRetrievalIndex
+from edurel.syntax.rel_ast import RelSchema
 
 # ---------------------------------------------------------------------------------------------
 # class DataGenConversation:
@@ -21,12 +23,19 @@ class DataGenConversation(Conversation):
 
         self.set_system_prompt(system_prompt)
 
-    def set_database_schema(self, rel_yaml: str):
+    def set_database_schema(self, rel_yaml: str, format: str = "yaml"):
+        # format can be "yaml" or "compact" (RelSchemaMan.get_prompt_schema())
         prompt = []
         prompt.append("The following tables are given:")
-        prompt.append(md_yaml(rel_yaml))
+        if format == "yaml":
+            prompt.append(md_yaml(rel_yaml))
+        elif format == "compact":
+            prompt.append(md_plain(rel_yaml))
+        else:
+            raise ValueError("Unsupported format. Use 'yaml' or 'compact'.")
         prompt.append("Future request will be based on this schema.")
         self.insert_message_at_end("\n".join(prompt))
+        self.pin_message(-1)
 
         self.is_schema_set = True
 
@@ -64,6 +73,21 @@ class DataGenConversation(Conversation):
 
         self.insert_message_at_end("\n".join(prompt))
 
+    def insert_table_datagen_message(
+        self, tablename: str, no_of_records: int = 5, reference_keys: Optional[Dict[str, List[str]]] = None
+    ) -> None:
+        # reference_keys maps "table(column, ...)" to SQL literals of existing key values
+        if not self.is_schema_set:
+            raise Exception("Database schema not set. Please call set_database_schema().")
+        prompt = []
+        prompt.append(f"Create {no_of_records} insert statements for the table '{tablename}' only.")
+        if reference_keys:
+            prompt.append("Foreign key columns must only use these existing key values:")
+            for target, values in reference_keys.items():
+                prompt.append(f"{target}: {', '.join(values)}")
+        prompt.append("Return the SQL insert statements only, without any explanation or additional text.")
+        self.insert_message_at_end("\n".join(prompt))
+
 # ---------------------------------------------------------------------------------------------
 # class SQLGenConversation:
 # ---------------------------------------------------------------------------------------------
@@ -71,6 +95,8 @@ class SQLGenConversation(Conversation):
     def __init__(self):
         super().__init__()
         self.is_schema_set = False
+        self.schema_index: SchemaRetrievalIndex | None = None
+        self.schema_tables_per_question = 3
 
         system_prompt = dedent("""
         You are an expert SQL query generator. 
@@ -85,14 +111,35 @@ class SQLGenConversation(Conversation):
         prompt.append(db_schema)
         prompt.append("\nFuture request will be based on this schema.")
         self.insert_message_at_end("\n".join(prompt))
+        self.pin_message(-1)
 
         self.is_schema_set = True
 
+    def set_schema_index(
+        self, rel_schema: RelSchema | SchemaRetrievalIndex, tables_per_question: int = 3
+    ) -> None:
+        """Send only the part of the schema relevant to each question instead of the full schema.
+
+        Each question message then carries the best matching tables (BM25 over
+        table, column and datalist terms) plus the tables on their join paths.
+        Pass a prebuilt SchemaRetrievalIndex to share it between conversations.
+        """
+        self.schema_index = (
+            rel_schema if isinstance(rel_schema, SchemaRetrievalIndex) else SchemaRetrievalIndex(rel_schema)
+        )
+        self.schema_tables_per_question = tables_per_question
+        self.is_schema_set = True
+
     def insert_question_message(self, question: str, dbkind: str = "postgres") -> None:
         if not self.is_schema_set:
-            raise Exception("Database schema not set. Please call set_database_schema().")
+            raise Exception("Database schema not set. Please call set_database_schema() or set_schema_index().")
         
         prompt = []
+        if self.schema_index is not None:
+            prompt.append("The relevant part of the database schema is:")
+            prompt.append(
+                md_plain(self.schema_index.prompt_schema(question, k=self.schema_tables_per_question))
+            )
         prompt.append("The user's question is:")
         prompt.append(question)
         prompt.append(f"Turn this question into a valid {dbkind} SQL query based on the given database schema.")
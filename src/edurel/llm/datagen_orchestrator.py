@@ -0,0 +1,234 @@
+import asyncio
+from dataclasses import dataclass, field
+import time
+from typing import Any, Dict, List, Optional
+
+import duckdb
+import pandas as pd
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.core.insert_ingest import IngestReport, InsertScriptIngestor, RejectedRow
+from edurel.llm.conversation_base import acall_llm_batch
+from edurel.llm.conversation_rel import DataGenConversation
+from edurel.llm.llm_cache import LlmResponseCache
+from edurel.llm.token_budget import TokenUsage
+from edurel.syntax.rel_ast import RelSchema, Table, enrich_ast
+from edurel.translation.rel_trans import PromptTranslationBuilder, RelSchemaTranslationVisitor
+from edurel.utils.instrument import span
+from edurel.utils.sql import sql_extract
+
+
+def _key_literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+@dataclass
+class TableDataGenResult:
+    """Outcome of generating and loading the rows of one table."""
+
+    tablename: str
+    level: int
+    rows: int = 0
+    error: Optional[str] = None
+    token_usage: Optional[TokenUsage] = None
+    rejected: List[RejectedRow] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.rejected
+
+
+@dataclass
+class DataGenReport:
+    """Results of a LevelDataGenerator run, in generation order."""
+
+    results: List[TableDataGenResult] = field(default_factory=list)
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    @property
+    def tokens_sent(self) -> int:
+        return sum(result.token_usage.sent for result in self.results if result.token_usage)
+
+    @property
+    def tokens_received(self) -> int:
+        return sum(result.token_usage.received for result in self.results if result.token_usage)
+
+    def to_df(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [
+                {
+                    "table": result.tablename,
+                    "level": result.level,
+                    "rows": result.rows,
+                    "tokens_sent": result.token_usage.sent if result.token_usage else 0,
+                    "tokens_received": result.token_usage.received if result.token_usage else 0,
+                    "rejected": len(result.rejected),
+                    "error": result.error,
+                }
+                for result in self.results
+            ],
+            columns=["table", "level", "rows", "tokens_sent", "tokens_received", "rejected", "error"],
+        )
+
+
+class LevelDataGenerator:
+    """Generate table data with an LLM, one dependency level at a time.
+
+    Tables of the same enrich_ast level do not reference each other, so
+    their requests run concurrently. Each request carries only the compact
+    definition of its table and the existing key values of the tables it
+    references, read from the database. The responses of a level are
+    checked row by row and bulk loaded (InsertScriptIngestor) before the
+    next level is requested. Datalist tables are expected to be filled
+    already (RelSchemaMan.materialize).
+
+    Args:
+        rel_schema: Schema whose tables exist in the target database
+        model: Chat model used for all requests
+        rows: Rows per table, or a dict of rows per table name (missing tables get none)
+        max_concurrency: Maximum number of concurrent requests
+        max_key_values: Maximum key values passed per referenced table
+        cache: Optional response cache, used as in Conversation.call_llm
+    """
+
+    def __init__(
+        self,
+        rel_schema: RelSchema,
+        model: BaseChatModel,
+        rows: int | dict[str, int] = 5,
+        max_concurrency: int = 8,
+        max_key_values: int = 20,
+        cache: Optional[LlmResponseCache] = None,
+    ):
+        self.rel_schema = rel_schema
+        self.model = model
+        self.rows = rows
+        self.max_concurrency = max_concurrency
+        self.max_key_values = max_key_values
+        self.cache = cache
+        enrich_ast(rel_schema)
+        self.tables: dict[str, Table] = {table.tablename: table for table in rel_schema.tables}
+        self.datalist_tables = {datalist.tablename for datalist in rel_schema.datalists}
+        self.ingestor = InsertScriptIngestor(rel_schema, dialect="duckdb")
+
+    def _rows_for(self, table: Table) -> int:
+        return self.rows.get(table.tablename, 0) if isinstance(self.rows, dict) else self.rows
+
+    def levels(self) -> List[List[Table]]:
+        """Tables to generate grouped by dependency level (enrich_ast), lowest level first."""
+        by_level: dict[int, list[Table]] = {}
+        for table in self.rel_schema.tables:
+            if table.tablename in self.datalist_tables or self._rows_for(table) <= 0:
+                continue
+            by_level.setdefault(table.level, []).append(table)
+        return [by_level[level] for level in sorted(by_level)]
+
+    def table_prompt(self, table: Table) -> str:
+        builder = PromptTranslationBuilder()
+        RelSchemaTranslationVisitor(builder).visit(RelSchema(tables=[table], datalists=[]))
+        return builder.build()
+
+    def reference_keys(self, db: DuckDbMan, table: Table) -> Dict[str, List[str]]:
+        """Existing key values of the tables referenced by `table`, as SQL literals."""
+        reference_keys: Dict[str, List[str]] = {}
+        for foreign_key in table.foreign_keys:
+            if foreign_key.targettable not in self.tables:
+                continue
+            columns = ", ".join(db.quote_identifier(column) for column in foreign_key.targetcolumns)
+            rows = db.fetch_rows(
+                f"SELECT DISTINCT {columns} FROM {db.quote_identifier(foreign_key.targettable)} "
+                f"ORDER BY {columns} LIMIT {self.max_key_values}"
+            )
+            values = [
+                _key_literal(row[0]) if len(row) == 1 else f"({', '.join(_key_literal(v) for v in row)})"
+                for row in rows
+            ]
+            reference_keys[f"{foreign_key.targettable}({', '.join(foreign_key.targetcolumns)})"] = values
+        return reference_keys
+
+    def _missing_reference(self, table: Table, reference_keys: Dict[str, List[str]]) -> Optional[str]:
+        for foreign_key in table.foreign_keys:
+            target = f"{foreign_key.targettable}({', '.join(foreign_key.targetcolumns)})"
+            nullable = all(
+                column.nullable for column in table.columns if column.columnname in foreign_key.sourcecolumns
+            )
+            if not foreign_key.is_cycle and not nullable and reference_keys.get(target) == []:
+                return foreign_key.targettable
+        return None
+
+    def conversation(self, table: Table, reference_keys: Dict[str, List[str]]) -> DataGenConversation:
+        conversation = DataGenConversation()
+        conversation.set_database_schema(self.table_prompt(table), format="compact")
+        conversation.insert_table_datagen_message(table.tablename, self._rows_for(table), reference_keys)
+        return conversation
+
+    def load_response(self, db: DuckDbMan, table: Table, content: str) -> IngestReport:
+        """Check the insert statements of a response and bulk load the valid rows (see InsertScriptIngestor).
+
+        Statements for other tables and rows that fail a check are rejected.
+        Raises ValueError if the response contains no SQL.
+        """
+        sql = sql_extract(content)
+        if not sql:
+            raise ValueError("Response contains no SQL statements.")
+        return self.ingestor.ingest(db, sql, tables=[table.tablename])
+
+    async def agenerate(self, db: DuckDbMan) -> DataGenReport:
+        """Generate and load all levels; a failed table is reported and does not stop the run."""
+        report = DataGenReport()
+        start = time.perf_counter()
+        for tables in self.levels():
+            with span("datagen.level", level=tables[0].level, tables=len(tables)):
+                requests: list[tuple[Table, DataGenConversation]] = []
+                for table in tables:
+                    reference_keys = self.reference_keys(db, table)
+                    missing = self._missing_reference(table, reference_keys)
+                    if missing is not None:
+                        report.results.append(
+                            TableDataGenResult(
+                                table.tablename,
+                                table.level,
+                                error=f"Skipped: referenced table '{missing}' has no rows.",
+                            )
+                        )
+                        continue
+                    requests.append((table, self.conversation(table, reference_keys)))
+
+                responses = await acall_llm_batch(
+                    [conversation for _, conversation in requests],
+                    self.model,
+                    max_concurrency=self.max_concurrency,
+                    cache=self.cache,
+                )
+                for (table, conversation), response in zip(requests, responses):
+                    result = TableDataGenResult(
+                        table.tablename, table.level, token_usage=conversation.last_token_usage
+                    )
+                    if not response.ok:
+                        result.error = response.error
+                    else:
+                        try:
+                            ingest_report = self.load_response(db, table, response.content)
+                        except (ValueError, duckdb.Error) as e:
+                            result.error = f"{type(e).__name__}: {e}"
+                        else:
+                            result.rows = ingest_report.inserted.get(table.tablename, 0)
+                            result.rejected = ingest_report.rejected
+                    report.results.append(result)
+        report.latency = time.perf_counter() - start
+        return report
+
+    def generate(self, db: DuckDbMan) -> DataGenReport:
+        """Blocking wrapper around agenerate for scripts; in a notebook, await agenerate instead."""
+        return asyncio.run(self.agenerate(db))
@@ -0,0 +1,156 @@
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+
+
+def model_identity(model: BaseChatModel) -> str:
+    """Describe a model by its class and identifying parameters (model name, temperature, ...)."""
+    return json.dumps(
+        {
+            "class": f"{type(model).__module__}.{type(model).__qualname__}",
+            "params": model._identifying_params,
+        },
+        sort_keys=True,
+        default=str,
+    )
+
+
+def _message_content(message: BaseMessage) -> str | list:
+    """Content of a message as one string if it is text only, else its content blocks."""
+    content = message.content
+    if isinstance(content, str):
+        return content
+    if all(isinstance(block, str) or block.get("type") == "text" for block in content):
+        return message.text
+    return content
+
+
+def cache_key(model: BaseChatModel, messages: Sequence[BaseMessage]) -> str:
+    """Content address of a model call: SHA-256 over the model identity and the messages.
+
+    Text-only content blocks are joined first, so they hash like the same text as a string.
+    """
+    payload = json.dumps(
+        {
+            "model": model_identity(model),
+            "messages": [[message.type, _message_content(message)] for message in messages],
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LlmResponseCache:
+    """Persistent cache of LLM responses in a local SQLite file.
+
+    Entries are keyed by cache_key(model, messages). Expired entries (older
+    than ttl seconds) are ignored and purged; beyond max_entries the least
+    recently used entries are evicted. In read-only mode the cache replays
+    recorded responses and never calls the model: a miss is an error
+    (Conversation.call_llm returns 'err: ...'), which makes a cache file an
+    offline stand-in for the provider in tests.
+
+    Args:
+        path: SQLite file; created with its parent directories if missing
+        ttl: Maximum age of an entry in seconds; None keeps entries forever
+        max_entries: Maximum number of entries; None means unbounded
+        read_only: If True, never write to the cache
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        read_only: bool = False,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        if read_only:
+            if not self.path.exists():
+                raise FileNotFoundError(f"LLM cache file {self.path} does not exist.")
+            self._con = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+            )
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._con = sqlite3.connect(str(self.path), check_same_thread=False)
+            with self._con:
+                self._con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS responses (
+                      key TEXT PRIMARY KEY,
+                      model TEXT NOT NULL,
+                      content TEXT NOT NULL,
+                      created REAL NOT NULL,
+                      last_used REAL NOT NULL
+                    )
+                    """
+                )
+
+    def close(self) -> None:
+        self._con.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._con.execute("SELECT count(*) FROM responses").fetchone()[0]
+
+    def get(self, model: BaseChatModel, messages: Sequence[BaseMessage]) -> Optional[str]:
+        """Return the cached response content, or None on a miss or an expired entry."""
+        key = cache_key(model, messages)
+        now = time.time()
+        with self._lock:
+            row = self._con.execute(
+                "SELECT content, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            content, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                if not self.read_only:
+                    with self._con:
+                        self._con.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            if not self.read_only:
+                with self._con:
+                    self._con.execute(
+                        "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+                    )
+            return content
+
+    def put(self, model: BaseChatModel, messages: Sequence[BaseMessage], content: str) -> None:
+        """Store a response, then apply TTL and size eviction."""
+        if self.read_only:
+            raise ValueError("Cannot write to a read-only LLM cache.")
+        now = time.time()
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (cache_key(model, messages), model_identity(model), content, now, now),
+            )
+            if self.ttl is not None:
+                self._con.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            if self.max_entries is not None:
+                self._con.execute(
+                    "DELETE FROM responses WHERE key NOT IN "
+                    "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        if self.read_only:
+            raise ValueError("Cannot clear a read-only LLM cache.")
+        with self._lock, self._con:
+            self._con.execute("DELETE FROM responses")
@@ -0,0 +1,182 @@
+from collections import Counter, deque
+from dataclasses import dataclass
+import math
+import re
+
+from edurel.syntax.rel_ast import DataList, RelSchema, Table
+from edurel.translation.rel_trans import PromptTranslationBuilder, RelSchemaTranslationVisitor
+
+STOPWORDS = frozenset(
+    {
+        "a", "all", "an", "and", "are", "by", "each", "for", "from", "give", "how", "in",
+        "is", "list", "many", "me", "of", "on", "or", "per", "show", "that", "the", "their",
+        "to", "what", "which", "who", "with",
+    }
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split identifiers and text into lowercase terms (snake_case and camelCase aware).
+
+    A trailing plural 's' is removed so that 'orders' matches the table 'order'.
+    """
+    terms = []
+    for word in re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+", text):
+        term = word.lower()
+        if term in STOPWORDS:
+            continue
+        if len(term) > 3 and term.endswith("s") and not term.endswith("ss"):
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+
+@dataclass
+class TableSelection:
+    """Tables selected for a question.
+
+    Attributes:
+        tables: Selected table names in schema order
+        matched: False if no table matched the question and the best connected tables were used
+    """
+
+    tables: list[str]
+    matched: bool = True
+
+
+class SchemaRetrievalIndex:
+    """Local BM25 index over the tables of a RelSchema.
+
+    A table's document consists of its name (counted twice), its column
+    names, and the values of its datalist. Foreign keys form an undirected
+    graph that is used to add the tables on join paths between matches.
+
+    Args:
+        rel_schema: Schema to index
+        k1: BM25 term frequency saturation
+        b: BM25 document length normalization
+    """
+
+    def __init__(self, rel_schema: RelSchema, k1: float = 1.5, b: float = 0.75):
+        self.rel_schema = rel_schema
+        self.k1 = k1
+        self.b = b
+        self.tables: dict[str, Table] = {table.tablename: table for table in rel_schema.tables}
+        self.datalists: dict[str, DataList] = {
+            datalist.tablename: datalist for datalist in rel_schema.datalists
+        }
+
+        self.term_frequencies: dict[str, Counter[str]] = {}
+        for table in rel_schema.tables:
+            terms = tokenize(table.tablename) * 2
+            for column in table.columns:
+                terms.extend(tokenize(column.columnname))
+            datalist = self.datalists.get(table.tablename)
+            if datalist is not None:
+                for value in datalist.values:
+                    terms.extend(tokenize(value))
+            self.term_frequencies[table.tablename] = Counter(terms)
+
+        self.document_lengths = {
+            tablename: sum(frequencies.values())
+            for tablename, frequencies in self.term_frequencies.items()
+        }
+        self.average_length = (
+            sum(self.document_lengths.values()) / len(self.document_lengths)
+            if self.document_lengths
+            else 0.0
+        )
+        self.postings: dict[str, dict[str, int]] = {}
+        for tablename, frequencies in self.term_frequencies.items():
+            for term, frequency in frequencies.items():
+                self.postings.setdefault(term, {})[tablename] = frequency
+
+        self.neighbors: dict[str, set[str]] = {tablename: set() for tablename in self.tables}
+        for table in rel_schema.tables:
+            for foreign_key in table.foreign_keys:
+                if foreign_key.targettable in self.neighbors:
+                    self.neighbors[table.tablename].add(foreign_key.targettable)
+                    self.neighbors[foreign_key.targettable].add(table.tablename)
+
+    def search(self, question: str, k: int = 5) -> list[tuple[str, float]]:
+        """Return up to k (tablename, BM25 score) pairs with a positive score, best first."""
+        scores: dict[str, float] = {}
+        document_count = len(self.tables)
+        for term in set(tokenize(question)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for tablename, frequency in postings.items():
+                length_norm = 1 - self.b + self.b * self.document_lengths[tablename] / self.average_length
+                scores[tablename] = scores.get(tablename, 0.0) + idf * frequency * (self.k1 + 1) / (
+                    frequency + self.k1 * length_norm
+                )
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
+
+    def _join_path(self, source: str, target: str) -> list[str]:
+        previous: dict[str, str | None] = {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                path = []
+                node: str | None = current
+                while node is not None:
+                    path.append(node)
+                    node = previous[node]
+                return path
+            for neighbor in sorted(self.neighbors[current]):
+                if neighbor not in previous:
+                    previous[neighbor] = current
+                    queue.append(neighbor)
+        return []
+
+    def relevant_tables(self, question: str, k: int = 3) -> TableSelection:
+        """Tables matching the question plus the tables on FK join paths between them.
+
+        If nothing matches, the k tables with the most foreign key neighbors
+        (the hubs of the schema) are selected instead and the selection is
+        marked as not matched. Tables keep schema order.
+        """
+        seeds = [tablename for tablename, _ in self.search(question, k)]
+        if not seeds:
+            position = {tablename: index for index, tablename in enumerate(self.tables)}
+            hubs = sorted(self.tables, key=lambda tablename: (-len(self.neighbors[tablename]), position[tablename]))
+            selected = set(hubs[:max(k, 0)])
+            return TableSelection([tablename for tablename in self.tables if tablename in selected], matched=False)
+        selected = set(seeds)
+        for target in seeds[1:]:
+            selected.update(self._join_path(seeds[0], target))
+        return TableSelection([tablename for tablename in self.tables if tablename in selected])
+
+    def subschema(self, question: str, k: int = 3) -> RelSchema:
+        """Part of the schema relevant to the question; FKs to omitted tables are dropped."""
+        selected = set(self.relevant_tables(question, k).tables)
+        tables = []
+        for tablename, table in self.tables.items():
+            if tablename not in selected:
+                continue
+            tables.append(
+                Table(
+                    tablename=table.tablename,
+                    columns=table.columns,
+                    primary_key=table.primary_key,
+                    foreign_keys=[
+                        foreign_key
+                        for foreign_key in table.foreign_keys
+                        if foreign_key.targettable in selected
+                    ],
+                )
+            )
+        datalists = [
+            datalist for tablename, datalist in self.datalists.items() if tablename in selected
+        ]
+        return RelSchema(tables=tables, datalists=datalists)
+
+    def prompt_schema(self, question: str, k: int = 3, max_datalist_values: int = 5) -> str:
+        """Compact prompt text (see PromptTranslationBuilder) of the relevant subschema."""
+        builder = PromptTranslationBuilder(max_datalist_values)
+        RelSchemaTranslationVisitor(builder).visit(self.subschema(question, k))
+        return builder.build()
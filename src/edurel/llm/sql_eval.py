@@ -0,0 +1,289 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+import threading
+import time
+from typing import Optional, Sequence
+import weakref
+
+import duckdb
+import pandas as pd
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from edurel.core.duckdb_fingerprint import ResultFingerprint
+from edurel.core.duckdb_man import DuckDbCursorPool, DuckDbMan
+from edurel.llm.conversation_base import acall_llm_batch
+from edurel.llm.conversation_rel import SQLGenConversation
+from edurel.llm.llm_cache import LlmResponseCache
+from edurel.llm.schema_retrieval import SchemaRetrievalIndex
+from edurel.syntax.rel_ast import RelSchema
+from edurel.utils.instrument import span
+from edurel.utils.sql import sql_extract
+
+
+@dataclass
+class EvalCase:
+    """A question with its gold query."""
+
+    question: str
+    gold_sql: str
+    case_id: Optional[str] = None
+
+
+@dataclass
+class EvalResult:
+    """Outcome of one question.
+
+    Attributes:
+        correct: The generated query returns the same multiset of rows as the gold query
+        error: Why the question could not be compared, prefixed with 'Generation', 'Generated' or 'Gold'
+        generation_latency: Model call time in seconds (0 for cached responses)
+        execution_latency: Time in seconds to run the generated query
+        gold_cached: The gold result came from the GoldResultCache
+    """
+
+    case_id: str
+    question: str
+    gold_sql: str
+    generated_sql: Optional[str] = None
+    correct: bool = False
+    error: Optional[str] = None
+    generation_latency: float = 0.0
+    execution_latency: float = 0.0
+    gold_cached: bool = False
+
+
+@dataclass
+class _Execution:
+    fingerprint: Optional[ResultFingerprint] = None
+    error: Optional[str] = None
+    latency: float = 0.0
+    cached: bool = False
+
+
+class GoldResultCache:
+    """Fingerprints of gold query results per database, kept across evaluation runs.
+
+    Databases opened from a file are identified by their resolved path. In-memory
+    databases are identified by their connection, so two of them with the same name
+    do not share entries, and the entries of a closed connection are dropped once it
+    is garbage collected. Queries are keyed by their text with whitespace collapsed.
+    """
+
+    def __init__(self):
+        self._file_entries: dict[str, dict[str, ResultFingerprint]] = {}
+        self._memory_entries: weakref.WeakKeyDictionary[
+            duckdb.DuckDBPyConnection, dict[str, ResultFingerprint]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _database_entries(self, db: DuckDbMan) -> dict[str, ResultFingerprint]:
+        if db.db_file_path:
+            return self._file_entries.setdefault(str(Path(db.db_file_path).resolve()), {})
+        return self._memory_entries.setdefault(db.con, {})
+
+    @staticmethod
+    def _key(sql: str) -> str:
+        return " ".join(sql.split())
+
+    def get(self, db: DuckDbMan, sql: str) -> Optional[ResultFingerprint]:
+        with self._lock:
+            return self._database_entries(db).get(self._key(sql))
+
+    def put(self, db: DuckDbMan, sql: str, fingerprint: ResultFingerprint) -> None:
+        with self._lock:
+            self._database_entries(db)[self._key(sql)] = fingerprint
+
+    def clear(self) -> None:
+        with self._lock:
+            self._file_entries.clear()
+            self._memory_entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            databases = [*self._file_entries.values(), *self._memory_entries.values()]
+            return sum(len(entries) for entries in databases)
+
+
+@dataclass
+class EvalReport:
+    """Per-question results of a SqlEvalHarness run."""
+
+    results: list[EvalResult] = field(default_factory=list)
+    latency: float = 0.0
+
+    @property
+    def accuracy(self) -> float:
+        return sum(result.correct for result in self.results) / len(self.results) if self.results else 0.0
+
+    def to_df(self) -> pd.DataFrame:
+        columns = [
+            "case_id", "question", "correct", "error", "generation_latency",
+            "execution_latency", "gold_cached", "generated_sql",
+        ]
+        return pd.DataFrame(
+            [{column: getattr(result, column) for column in columns} for result in self.results],
+            columns=columns,
+        )
+
+    def summary(self) -> pd.DataFrame:
+        """Latency statistics in seconds for generation and execution of the generated queries."""
+        columns = ["stage", "count", "total", "mean", "p50", "p95", "max"]
+        rows = []
+        for stage, attribute in (("generation", "generation_latency"), ("execution", "execution_latency")):
+            series = pd.Series([getattr(result, attribute) for result in self.results], dtype=float)
+            rows.append(
+                {
+                    "stage": stage,
+                    "count": len(series),
+                    "total": series.sum(),
+                    "mean": series.mean(),
+                    "p50": series.quantile(0.5),
+                    "p95": series.quantile(0.95),
+                    "max": series.max(),
+                }
+            )
+        return pd.DataFrame(rows, columns=columns)
+
+    def to_text(self) -> str:
+        correct = sum(result.correct for result in self.results)
+        errors = sum(result.error is not None for result in self.results)
+        lines = [
+            f"Accuracy: {self.accuracy:.1%} ({correct} of {len(self.results)} correct, "
+            f"{errors} errors) in {self.latency:.2f} s"
+        ]
+        for result in self.results:
+            if not result.correct:
+                lines.append(f"- {result.case_id}: {result.error or 'different result'}")
+        return "\n".join(lines)
+
+
+class SqlEvalHarness:
+    """Evaluate text-to-SQL generation by execution against a DuckDB database.
+
+    Queries are generated concurrently with acall_llm_batch; meanwhile the
+    gold queries run on a pool of cursors. The generated queries then run
+    on the same pool. Results are compared by their ResultFingerprint,
+    computed inside DuckDB, so a generated query is correct if it returns
+    the same rows as the gold query in any order. Only single read-only
+    queries are executed (see DuckDbMan.fingerprint).
+
+    Args:
+        db: Database to evaluate against
+        model: Chat model that generates the queries
+        schema: Schema text for SQLGenConversation.set_database_schema, or a
+            RelSchema to send only the relevant tables (set_schema_index)
+        max_concurrency: Maximum number of concurrent model requests
+        pool_size: Number of cursors, i.e. queries running at once
+        timeout: Wall-clock limit in seconds per query
+        cache: Optional LLM response cache
+        gold_cache: Cache of gold results; pass the same instance to reuse them across runs
+        float_digits: Decimals kept when comparing numeric columns
+    """
+
+    def __init__(
+        self,
+        db: DuckDbMan,
+        model: BaseChatModel,
+        schema: str | RelSchema,
+        max_concurrency: int = 8,
+        pool_size: int = 4,
+        timeout: Optional[float] = 10.0,
+        cache: Optional[LlmResponseCache] = None,
+        gold_cache: Optional[GoldResultCache] = None,
+        float_digits: int = 6,
+    ):
+        self.db = db
+        self.model = model
+        self.schema = schema
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cache = cache
+        self.gold_cache = gold_cache if gold_cache is not None else GoldResultCache()
+        self.float_digits = float_digits
+        self.schema_index = SchemaRetrievalIndex(schema) if isinstance(schema, RelSchema) else None
+
+    def conversation(self, case: EvalCase) -> SQLGenConversation:
+        conversation = SQLGenConversation()
+        if self.schema_index is not None:
+            conversation.set_schema_index(self.schema_index)
+        else:
+            conversation.set_database_schema(self.schema)
+        conversation.insert_question_message(case.question, dbkind="duckdb")
+        return conversation
+
+    def _execute(self, pool: DuckDbCursorPool, sql: str, use_gold_cache: bool) -> _Execution:
+        if use_gold_cache:
+            cached = self.gold_cache.get(self.db, sql)
+            if cached is not None:
+                return _Execution(fingerprint=cached, cached=True)
+        start = time.perf_counter()
+        try:
+            with pool.acquire() as cursor:
+                fingerprint = cursor.fingerprint(sql, timeout=self.timeout, float_digits=self.float_digits)
+        except (duckdb.Error, TimeoutError, MemoryError, ValueError) as e:
+            return _Execution(error=f"{type(e).__name__}: {e}", latency=time.perf_counter() - start)
+        if use_gold_cache:
+            self.gold_cache.put(self.db, sql, fingerprint)
+        return _Execution(fingerprint=fingerprint, latency=time.perf_counter() - start)
+
+    def _execute_all(
+        self, pool: DuckDbCursorPool, sqls: Sequence[Optional[str]], use_gold_cache: bool
+    ) -> list[Optional[_Execution]]:
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            futures = [
+                executor.submit(self._execute, pool, sql, use_gold_cache) if sql else None for sql in sqls
+            ]
+            return [future.result() if future is not None else None for future in futures]
+
+    async def aevaluate(self, cases: Sequence[EvalCase]) -> EvalReport:
+        """Generate, run and compare all cases; results keep the order of `cases`."""
+        start = time.perf_counter()
+        with span("eval.run", cases=len(cases)), DuckDbCursorPool(self.db, self.pool_size) as pool:
+            responses, gold = await asyncio.gather(
+                acall_llm_batch(
+                    [self.conversation(case) for case in cases],
+                    self.model,
+                    max_concurrency=self.max_concurrency,
+                    cache=self.cache,
+                ),
+                asyncio.to_thread(self._execute_all, pool, [case.gold_sql for case in cases], True),
+            )
+            generated_sqls = [sql_extract(response.content) if response.ok else None for response in responses]
+            generated = await asyncio.to_thread(self._execute_all, pool, generated_sqls, False)
+
+        report = EvalReport()
+        for number, (case, response, sql, gold_run, run) in enumerate(
+            zip(cases, responses, generated_sqls, gold, generated), start=1
+        ):
+            result = EvalResult(
+                case_id=case.case_id or str(number),
+                question=case.question,
+                gold_sql=case.gold_sql,
+                generated_sql=sql,
+                generation_latency=response.latency,
+                gold_cached=gold_run is not None and gold_run.cached,
+            )
+            if run is not None:
+                result.execution_latency = run.latency
+            if gold_run is None:
+                result.error = "Gold: The gold query is empty."
+            elif not response.ok:
+                result.error = f"Generation: {response.error}"
+            elif not sql:
+                result.error = "Generation: Response contains no SQL query."
+            elif gold_run.error is not None:
+                result.error = f"Gold: {gold_run.error}"
+            elif run.error is not None:
+                result.error = f"Generated: {run.error}"
+            else:
+                result.correct = run.fingerprint == gold_run.fingerprint
+            report.results.append(result)
+        report.latency = time.perf_counter() - start
+        return report
+
+    def evaluate(self, cases: Sequence[EvalCase]) -> EvalReport:
+        """Blocking wrapper around aevaluate for scripts; in a notebook, await aevaluate instead."""
+        return asyncio.run(self.aevaluate(cases))
@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from typing import Callable, List, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage
+
+
+Tokenizer = Callable[[str], int]
+Summarizer = Callable[[List[BaseMessage]], str]
+
+TRIM_POLICIES = ("drop_oldest", "summarize", "error")
+
+# Role markers and separators a chat API adds around each message.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def approx_token_count(text: str) -> int:
+    """Estimate tokens as one per four characters, the usual rule of thumb for English text and code."""
+    return (len(text) + 3) // 4
+
+
+def message_text(message: BaseMessage) -> str:
+    return message.content if isinstance(message.content, str) else str(message.content)
+
+
+def count_message_tokens(message: BaseMessage, tokenizer: Tokenizer = approx_token_count) -> int:
+    return tokenizer(message_text(message)) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass(frozen=True)
+class TokenUsage:
+    """Tokens of one LLM call.
+
+    Attributes:
+        sent: Prompt tokens
+        received: Response tokens
+        estimated: True if counted with the conversation's tokenizer instead of
+            the usage reported by the provider
+    """
+
+    sent: int
+    received: int
+    estimated: bool = True
+
+
+def default_summarizer(messages: List[BaseMessage]) -> str:
+    """Summarize messages by their first lines, without calling a model."""
+    lines = ["Summary of earlier messages that were removed to fit the token budget:"]
+    for message in messages:
+        first_line = next((line for line in message_text(message).splitlines() if line.strip()), "")
+        lines.append(f"- {message.type}: {first_line.strip()[:200]}")
+    return "\n".join(lines)
+
+
+def trim_messages(
+    messages: Sequence[BaseMessage],
+    budget: int,
+    is_pinned: Callable[[BaseMessage], bool],
+    policy: str = "drop_oldest",
+    tokenizer: Tokenizer = approx_token_count,
+    summarizer: Summarizer = default_summarizer,
+) -> List[BaseMessage]:
+    """Return the messages reduced to at most `budget` tokens.
+
+    Pinned messages and the last message (the current request) are always
+    kept. Other messages are removed oldest first: 'drop_oldest' discards
+    them, 'summarize' replaces them with one message produced by
+    `summarizer`, and 'error' refuses to trim. Raises ValueError if the
+    budget cannot be met.
+    """
+    if policy not in TRIM_POLICIES:
+        raise ValueError(f"Unsupported trim policy '{policy}'. Use one of: {', '.join(TRIM_POLICIES)}.")
+    counts = [count_message_tokens(message, tokenizer) for message in messages]
+    total = sum(counts)
+    if total <= budget:
+        return list(messages)
+    if policy == "error":
+        raise ValueError(
+            f"Conversation needs {total} tokens, which exceeds the token budget of {budget}."
+        )
+
+    candidates = [
+        index for index, message in enumerate(messages[:-1]) if not is_pinned(message)
+    ]
+    removed: list[int] = []
+    summary: HumanMessage | None = None
+    for index in candidates:
+        removed.append(index)
+        total -= counts[index]
+        if total > budget:
+            continue
+        if policy != "summarize":
+            break
+        summary = HumanMessage(content=summarizer([messages[i] for i in removed]))
+        if total + count_message_tokens(summary, tokenizer) <= budget:
+            break
+    else:
+        if total <= budget:
+            # The summary itself does not fit; fall back to dropping.
+            summary = None
+        else:
+            raise ValueError(
+                f"Conversation cannot be trimmed to the token budget of {budget}: "
+                f"pinned messages and the last message alone need {total} tokens."
+            )
+
+    removed_set = set(removed)
+    trimmed: List[BaseMessage] = []
+    for index, message in enumerate(messages):
+        if index == removed[0] and summary is not None:
+            trimmed.append(summary)
+        if index not in removed_set:
+            trimmed.append(message)
+    return trimmed
@@ -1,5 +1,8 @@
 from dataclasses import dataclass, field
 
+from edurel.syntax.sql_type import SqlType, parse_sql_type
+from edurel.utils.instrument import instrumented
+
 
 @dataclass
 class Attribute:
@@ -8,6 +11,10 @@ class Attribute:
     attributename: str
     type: str
     nullable: bool = False
+    sql_type: SqlType = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.sql_type = parse_sql_type(self.type)
 
     def __str__(self) -> str:
         nullable_str = " (null)" if self.nullable else " (not null)"
@@ -359,6 +366,7 @@ class ERAstFactory:
             ],
         )
 
+@instrumented("er.validate_ast")
 def validate_ast(er_schema: ERSchema) -> None:
     errors: list[str] = []
 
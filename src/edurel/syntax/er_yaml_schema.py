@@ -1,7 +1,9 @@
 from strictyaml import Bool, Map, Optional, Regex, Seq, Str
 
+from edurel.syntax.sql_type import SQL_TYPE_PATTERN
 
-ATTRIBUTE_TYPE = Regex(r"^[A-Za-z]+(?:\(\s*\d+\s*(?:,\s*\d+\s*)?\))?$")
+
+ATTRIBUTE_TYPE = Regex(SQL_TYPE_PATTERN)
 CARDINALITY = Regex(r"^(?:ONE|MANY|OPTIONAL_ONE|OPTIONAL_MANY)$")
 INHERITANCE_IMPLEMENTATION = Regex(r"^(?:ONE_TABLE_PER_ENTITY|ONE_TABLE)$")
 
@@ -1,5 +1,8 @@
 from dataclasses import dataclass, field
 
+from edurel.syntax.sql_type import SqlType, parse_sql_type
+from edurel.utils.instrument import instrumented
+
 @dataclass
 class Column:
     """Represents a column with name, type, and nullable flag."""
@@ -7,6 +10,10 @@ class Column:
     columnname: str
     type: str
     nullable: bool = False
+    sql_type: SqlType = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.sql_type = parse_sql_type(self.type)
 
     def __str__(self) -> str:
         nullable_str = " (null)" if self.nullable else " (not null)"
@@ -201,6 +208,7 @@ def enrich_ast(rel_schema: RelSchema) -> None:
         if table.level == 0:
             table.level = 1
 
+@instrumented("rel.validate_ast")
 def validate_ast(rel_schema: RelSchema) -> None:
     errors: list[str] = []
 
@@ -0,0 +1,415 @@
+from dataclasses import dataclass, field
+
+from sqlglot import exp
+from sqlglot.optimizer.scope import Scope, traverse_scope, walk_in_scope
+
+from edurel.syntax.rel_ast import RelSchema
+from edurel.utils.sql import parse_sql
+
+
+@dataclass
+class SqlSchemaCheck:
+    """Result of checking a query against a relational schema."""
+
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def __str__(self) -> str:
+        lines = [f"- error: {error}" for error in self.errors]
+        lines.extend(f"- warning: {warning}" for warning in self.warnings)
+        return "\n".join(lines) if lines else "OK"
+
+
+class RelSchemaIndex:
+    """Hash indexes over a RelSchema for resolving SQL identifiers.
+
+    Quoted names must match the schema's spelling exactly. Unquoted names
+    match it exactly or, failing that, case-insensitively, like unquoted
+    PostgreSQL identifiers.
+    """
+
+    def __init__(self, rel_schema: RelSchema):
+        self.columns_by_table: dict[str, set[str]] = {
+            table.tablename: {column.columnname for column in table.columns} for table in rel_schema.tables
+        }
+        self._folded_tables: dict[str, str] = {}
+        self._folded_columns: dict[str, dict[str, str]] = {}
+        for table in rel_schema.tables:
+            self._folded_tables.setdefault(table.tablename.lower(), table.tablename)
+            folded = self._folded_columns.setdefault(table.tablename, {})
+            for column in table.columns:
+                folded.setdefault(column.columnname.lower(), column.columnname)
+        self.foreign_key_pairs: set[frozenset[tuple[str, str]]] = set()
+        for table in rel_schema.tables:
+            for foreign_key in table.foreign_keys:
+                for source_column, target_column in zip(
+                    foreign_key.sourcecolumns, foreign_key.targetcolumns
+                ):
+                    self.foreign_key_pairs.add(
+                        frozenset(
+                            {
+                                (table.tablename, source_column),
+                                (foreign_key.targettable, target_column),
+                            }
+                        )
+                    )
+
+    def table_name(self, tablename: str, quoted: bool = False) -> str | None:
+        """Schema spelling of a table name, or None if the schema has no such table."""
+        if tablename in self.columns_by_table:
+            return tablename
+        return None if quoted else self._folded_tables.get(tablename.lower())
+
+    def column_name(self, tablename: str, columnname: str, quoted: bool = False) -> str | None:
+        """Schema spelling of a column of a table given in schema spelling (see table_name)."""
+        if columnname in self.columns_by_table.get(tablename, ()):
+            return columnname
+        return None if quoted else self._folded_columns.get(tablename, {}).get(columnname.lower())
+
+    def has_table(self, tablename: str, quoted: bool = False) -> bool:
+        return self.table_name(tablename, quoted) is not None
+
+    def has_column(self, tablename: str, columnname: str, quoted: bool = False) -> bool:
+        table = self.table_name(tablename)
+        return table is not None and self.column_name(table, columnname, quoted) is not None
+
+    def is_foreign_key_pair(self, left: tuple[str, str], right: tuple[str, str]) -> bool:
+        """Whether two (table, column) pairs in schema spelling are linked by a foreign key."""
+        return frozenset({left, right}) in self.foreign_key_pairs
+
+
+Sources = dict[str, exp.Table | Scope]
+
+DML_STATEMENTS = (exp.Insert, exp.Update, exp.Delete)
+
+
+def _is_quoted(identifier: exp.Expression | None) -> bool:
+    return isinstance(identifier, exp.Identifier) and identifier.quoted
+
+
+def _name_matches(name: str, quoted: bool, candidate: str) -> bool:
+    return name == candidate or (not quoted and name.lower() == candidate.lower())
+
+
+def _schema_table(index: RelSchemaIndex, table: exp.Table) -> str | None:
+    return index.table_name(table.name, _is_quoted(table.this)) if table.name else None
+
+
+def _source_chain(scope: Scope, outer_sources: Sources) -> list[Sources]:
+    """Sources visible in a scope, innermost first: its own, its parents', then outer_sources."""
+    chain = []
+    current: Scope | None = scope
+    while current is not None:
+        chain.append(current.sources)
+        current = current.parent
+    chain.append(outer_sources)
+    return chain
+
+
+def _source_alias(sources: Sources, alias: str, quoted: bool) -> str | None:
+    if alias in sources:
+        return alias
+    return next((key for key in sources if _name_matches(alias, quoted, key)), None)
+
+
+def _find_source(chain: list[Sources], column: exp.Column) -> exp.Table | Scope | None:
+    quoted = _is_quoted(column.args.get("table"))
+    for sources in chain:
+        alias = _source_alias(sources, column.table, quoted)
+        if alias is not None:
+            return sources[alias]
+    return None
+
+
+def _source_has_column(
+    index: RelSchemaIndex, source: exp.Table | Scope, columnname: str, quoted: bool
+) -> bool:
+    if isinstance(source, Scope):
+        if not isinstance(source.expression, exp.Query) or source.expression.is_star:
+            return True
+        return any(_name_matches(columnname, quoted, name) for name in source.expression.named_selects)
+    if not source.name:
+        # Table functions such as generate_series(1, 3) only name their columns in an alias.
+        aliases = source.alias_column_names
+        return not aliases or any(_name_matches(columnname, quoted, name) for name in aliases)
+    table = _schema_table(index, source)
+    if table is None:
+        # Unknown tables are reported once on their own.
+        return True
+    return index.column_name(table, columnname, quoted) is not None
+
+
+def _column_alias(index: RelSchemaIndex, sources: Sources, column: exp.Column) -> str | None:
+    """Alias of the source among sources that a column belongs to, if it is unambiguous."""
+    quoted = _is_quoted(column.this)
+    if column.table:
+        return _source_alias(sources, column.table, _is_quoted(column.args.get("table")))
+    matches = [
+        alias for alias, source in sources.items() if _source_has_column(index, source, column.name, quoted)
+    ]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _schema_column(
+    index: RelSchemaIndex, source: exp.Table | Scope | None, columnname: str, quoted: bool
+) -> tuple[str, str] | None:
+    """(table, column) in schema spelling if source is a schema table with that column."""
+    if not isinstance(source, exp.Table):
+        return None
+    table = _schema_table(index, source)
+    column = index.column_name(table, columnname, quoted) if table is not None else None
+    return (table, column) if column is not None else None
+
+
+def _check_tables(index: RelSchemaIndex, sources: Sources, check: SqlSchemaCheck) -> None:
+    for source in sources.values():
+        if isinstance(source, exp.Table) and source.name and _schema_table(index, source) is None:
+            message = f"Unknown table '{source.name}'."
+            if message not in check.errors:
+                check.errors.append(message)
+
+
+def _check_columns(
+    index: RelSchemaIndex,
+    chain: list[Sources],
+    columns: list[exp.Column],
+    select_aliases: set[str],
+    check: SqlSchemaCheck,
+) -> None:
+    """Resolve columns against the innermost sources of chain, falling back to the outer ones."""
+    for column in columns:
+        if isinstance(column.this, exp.Star):
+            continue
+        quoted = _is_quoted(column.this)
+        if column.table:
+            source = _find_source(chain, column)
+            if source is None:
+                check.errors.append(
+                    f"Unknown table or alias '{column.table}' in column '{column.sql()}'."
+                )
+            elif not _source_has_column(index, source, column.name, quoted):
+                source_name = source.name if isinstance(source, exp.Table) else column.table
+                check.errors.append(
+                    f"Unknown column '{column.name}' in table '{source_name}'."
+                )
+            continue
+        found = any(_name_matches(column.name, quoted, alias) for alias in select_aliases) or any(
+            _source_has_column(index, source, column.name, quoted)
+            for sources in chain
+            for source in sources.values()
+        )
+        if not found:
+            check.errors.append(f"Unknown column '{column.name}'.")
+
+
+def _check_join_key(
+    index: RelSchemaIndex,
+    left: tuple[str, str] | None,
+    right: tuple[str, str] | None,
+    condition: str,
+    check: SqlSchemaCheck,
+) -> None:
+    if left is not None and right is not None and not index.is_foreign_key_pair(left, right):
+        check.warnings.append(f"Join condition '{condition}' does not follow a foreign key.")
+
+
+def _check_joins(index: RelSchemaIndex, scope: Scope, chain: list[Sources], check: SqlSchemaCheck) -> None:
+    """Check ON, USING and WHERE join conditions against the foreign keys.
+
+    Equalities in the WHERE conjunction between columns of two different
+    sources are join conditions too (comma joins).
+    """
+    sources = scope.sources
+    where = scope.expression.args.get("where")
+    where_joins: list[tuple[exp.EQ, str, str]] = []
+    if where is not None:
+        conjuncts = list(where.this.flatten()) if isinstance(where.this, exp.And) else [where.this]
+        for equality in conjuncts:
+            if not (
+                isinstance(equality, exp.EQ)
+                and isinstance(equality.this, exp.Column)
+                and isinstance(equality.expression, exp.Column)
+            ):
+                continue
+            left_alias = _column_alias(index, sources, equality.this)
+            right_alias = _column_alias(index, sources, equality.expression)
+            if left_alias is not None and right_alias is not None and left_alias != right_alias:
+                where_joins.append((equality, left_alias, right_alias))
+    where_joined = {alias for _, left_alias, right_alias in where_joins for alias in (left_alias, right_alias)}
+
+    from_ = scope.expression.args.get("from_")
+    preceding = [from_.this] if from_ is not None else []
+    for join in scope.expression.args.get("joins") or []:
+        condition = join.args.get("on")
+        using = join.args.get("using")
+        if condition is not None:
+            for equality in condition.find_all(exp.EQ):
+                left, right = equality.this, equality.expression
+                if isinstance(left, exp.Column) and isinstance(right, exp.Column):
+                    _check_join_key(
+                        index, _resolve_column(index, chain, left), _resolve_column(index, chain, right),
+                        equality.sql(), check,
+                    )
+        elif using:
+            # USING (x) joins x of the first preceding source that has it with x of the joined source.
+            for identifier in using:
+                quoted = _is_quoted(identifier)
+                left_source = next(
+                    (
+                        source
+                        for source in (sources.get(node.alias_or_name) for node in preceding)
+                        if source is not None and _source_has_column(index, source, identifier.name, quoted)
+                    ),
+                    None,
+                )
+                _check_join_key(
+                    index,
+                    _schema_column(index, left_source, identifier.name, quoted),
+                    _schema_column(index, sources.get(join.this.alias_or_name), identifier.name, quoted),
+                    f"USING ({identifier.sql()}) of '{join.this.sql()}'",
+                    check,
+                )
+        elif join.this.alias_or_name not in where_joined:
+            check.warnings.append(
+                f"Join with '{join.this.sql()}' has no join condition (cross product)."
+            )
+        preceding.append(join.this)
+
+    for equality, left_alias, right_alias in where_joins:
+        _check_join_key(
+            index,
+            _schema_column(index, sources[left_alias], equality.this.name, _is_quoted(equality.this.this)),
+            _schema_column(
+                index, sources[right_alias], equality.expression.name, _is_quoted(equality.expression.this)
+            ),
+            equality.sql(),
+            check,
+        )
+
+
+def _resolve_column(
+    index: RelSchemaIndex, chain: list[Sources], column: exp.Column
+) -> tuple[str, str] | None:
+    """Return (table, column) in schema spelling if the column belongs to a schema table."""
+    quoted = _is_quoted(column.this)
+    if column.table:
+        return _schema_column(index, _find_source(chain, column), column.name, quoted)
+    matches = [
+        match
+        for match in (_schema_column(index, source, column.name, quoted) for source in chain[0].values())
+        if match is not None
+    ]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _check_scope(
+    index: RelSchemaIndex, scope: Scope, check: SqlSchemaCheck, outer_sources: Sources
+) -> None:
+    _check_tables(index, scope.sources, check)
+    chain = _source_chain(scope, outer_sources)
+
+    # scope.columns also lists the unqualified columns of subqueries, which
+    # belong to (and are checked in) their own scope.
+    own_nodes = {id(node) for node in walk_in_scope(scope.expression)}
+    columns = [column for column in scope.columns if id(column) in own_nodes]
+    select_aliases = (
+        {select.alias for select in scope.expression.selects if isinstance(select, exp.Alias)}
+        if isinstance(scope.expression, exp.Query)
+        else set()
+    )
+    _check_columns(index, chain, columns, select_aliases, check)
+    _check_joins(index, scope, chain, check)
+
+
+def _dml_sources(expression: exp.Update | exp.Delete) -> Sources:
+    tables = [expression.this]
+    if isinstance(expression, exp.Update) and expression.args.get("from_"):
+        first = expression.args["from_"].this
+        tables.append(first)
+        tables.extend(join.this for join in first.args.get("joins") or [])
+    if isinstance(expression, exp.Delete):
+        tables.extend(expression.args.get("using") or [])
+    return {table.alias_or_name: table for table in tables if isinstance(table, exp.Table)}
+
+
+def _check_target_columns(
+    index: RelSchemaIndex, target: exp.Expression, identifiers: list[exp.Expression], check: SqlSchemaCheck
+) -> None:
+    table = _schema_table(index, target) if isinstance(target, exp.Table) else None
+    if table is None:
+        return
+    for identifier in identifiers:
+        if index.column_name(table, identifier.name, _is_quoted(identifier)) is None:
+            check.errors.append(f"Unknown column '{identifier.name}' in table '{target.name}'.")
+
+
+def _check_dml(index: RelSchemaIndex, expression: exp.Expression, check: SqlSchemaCheck) -> Sources:
+    """Check the target table and columns of UPDATE, DELETE and INSERT.
+
+    Returns the sources that subqueries of the statement may refer to.
+    """
+    if isinstance(expression, exp.Insert):
+        target = expression.this
+        identifiers = []
+        if isinstance(target, exp.Schema):
+            identifiers = target.expressions
+            target = target.this
+        _check_tables(index, {"": target}, check)
+        _check_target_columns(index, target, identifiers, check)
+        return {}
+    if not isinstance(expression, DML_STATEMENTS):
+        return {}
+
+    sources = _dml_sources(expression)
+    _check_tables(index, sources, check)
+    assigned = []
+    if isinstance(expression, exp.Update):
+        assigned = [
+            assignment.this for assignment in expression.expressions if isinstance(assignment.this, exp.Column)
+        ]
+        _check_target_columns(index, expression.this, [column.this for column in assigned], check)
+    assigned_ids = {id(column) for column in assigned}
+    columns = [
+        node
+        for node in walk_in_scope(expression)
+        if isinstance(node, exp.Column) and id(node) not in assigned_ids
+    ]
+    _check_columns(index, [sources], columns, set(), check)
+    return sources
+
+
+def check_sql_against_ast(
+    sql: str, rel_schema: RelSchema | RelSchemaIndex, dialect: str = "postgres"
+) -> SqlSchemaCheck:
+    """Resolve the tables, columns and join keys of a query against a schema.
+
+    Unknown tables and columns are errors; joins that do not follow a foreign
+    key and joins without a condition are warnings. Each column is resolved
+    against the tables of its own (sub)query first, then of the enclosing
+    queries. INSERT, UPDATE and DELETE are checked for their target table,
+    the inserted or assigned columns and their conditions. Raises ValueError
+    if the SQL does not parse.
+
+    Args:
+        sql: Query text
+        rel_schema: Schema AST, or a RelSchemaIndex built once for many checks
+        dialect: sqlglot dialect of the query
+    """
+    index = rel_schema if isinstance(rel_schema, RelSchemaIndex) else RelSchemaIndex(rel_schema)
+    check = SqlSchemaCheck()
+    for expression in parse_sql(sql, dialect):
+        if expression is None:
+            continue
+        outer_sources = _check_dml(index, expression, check)
+        scopes = traverse_scope(expression)
+        if not scopes and not isinstance(expression, DML_STATEMENTS):
+            for table in expression.find_all(exp.Table):
+                if table.name and _schema_table(index, table) is None:
+                    check.errors.append(f"Unknown table '{table.name}'.")
+        for scope in scopes:
+            _check_scope(index, scope, check, outer_sources)
+    return check
@@ -1,7 +1,9 @@
 from strictyaml import Bool, Map, Optional, Regex, Seq, Str
 
+from edurel.syntax.sql_type import SQL_TYPE_PATTERN
 
-SQL_TYPE = Regex(r"^[A-Za-z]+(?:\(\s*\d+\s*(?:,\s*\d+\s*)?\))?$")
+
+SQL_TYPE = Regex(SQL_TYPE_PATTERN)
 
 column_schema = Map(
     {
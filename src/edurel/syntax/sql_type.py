@@ -0,0 +1,104 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+import re
+
+
+SQL_TYPE_PATTERN = r"^[A-Za-z]+(?:\s*\(\s*\d+\s*(?:,\s*\d+\s*)?\))?$"
+
+_SQL_TYPE_PARTS = re.compile(r"([A-Za-z]+)(?:\s*\(\s*(\d+)\s*(?:,\s*(\d+)\s*)?\))?")
+
+DIALECT_TYPE_NAMES: dict[str, dict[str, str]] = {
+    "postgres": {},
+    "duckdb": {"FLOAT": "DOUBLE", "BYTEA": "BLOB"},
+    "sqlite": {
+        "INT": "INTEGER",
+        "INTEGER": "INTEGER",
+        "SMALLINT": "INTEGER",
+        "BIGINT": "INTEGER",
+        "CHAR": "TEXT",
+        "VARCHAR": "TEXT",
+        "DECIMAL": "NUMERIC",
+        "DOUBLE": "REAL",
+        "FLOAT": "REAL",
+        "BOOLEAN": "INTEGER",
+        "BYTEA": "BLOB",
+    },
+    "mysql": {
+        "FLOAT": "DOUBLE",
+        "TIMESTAMP": "DATETIME",
+        "BYTEA": "LONGBLOB",
+        "UUID": "CHAR(36)",
+    },
+}
+
+DIALECT_UNSIZED_TYPES: dict[str, frozenset[str]] = {
+    "sqlite": frozenset({"INTEGER", "TEXT", "REAL", "BLOB"}),
+    "mysql": frozenset({"LONGBLOB", "CHAR(36)"}),
+}
+
+DUCKDB_TYPE_ALIASES: dict[str, str] = {
+    "TIMESTAMP WITH TIME ZONE": "TIMESTAMPTZ",
+    "TIME WITH TIME ZONE": "TIMETZ",
+    "DOUBLE PRECISION": "DOUBLE",
+}
+
+
+@dataclass(frozen=True)
+class SqlType:
+    """Parsed SQL type: base name with optional precision and scale.
+
+    Types that do not follow the `NAME` / `NAME(p)` / `NAME(p, s)` form keep
+    their text as the name and are marked as not structured.
+    """
+
+    base: str
+    precision: int | None = None
+    scale: int | None = None
+    text: str = field(default="", compare=False)
+    name: str = field(default="", compare=False)
+    is_structured: bool = field(default=True, compare=False)
+
+    def __str__(self) -> str:
+        return self.text
+
+    @property
+    def size(self) -> str:
+        if self.precision is None:
+            return ""
+        if self.scale is None:
+            return f"({self.precision})"
+        return f"({self.precision}, {self.scale})"
+
+    def render(self, dialect: str = "postgres") -> str:
+        """Spell the type for a SQL dialect; unmapped types keep their text."""
+        if not self.is_structured:
+            return self.text
+        target_name = DIALECT_TYPE_NAMES.get(dialect, {}).get(self.base)
+        if target_name is None:
+            return self.text
+        if self.precision is None or target_name in DIALECT_UNSIZED_TYPES.get(dialect, ()):
+            return target_name
+        return f"{target_name}{self.text[self.text.index('('):]}"
+
+
+@lru_cache(maxsize=None)
+def parse_sql_type(text: str) -> SqlType:
+    """Parse a type string once; equal strings share one SqlType instance."""
+    if re.fullmatch(SQL_TYPE_PATTERN, text):
+        match = _SQL_TYPE_PARTS.fullmatch(text)
+        assert match is not None
+        name, precision, scale = match.groups()
+        return SqlType(
+            base=name.upper(),
+            precision=int(precision) if precision is not None else None,
+            scale=int(scale) if scale is not None else None,
+            text=text,
+            name=name,
+        )
+    name = re.sub(r"\s*\(.*\)$", "", text).strip()
+    return SqlType(base=text.strip().upper(), text=text, name=name, is_structured=False)
+
+
+def parse_duckdb_type(text: str) -> SqlType:
+    """Parse a type name reported by DuckDB, mapping multi-word names to aliases."""
+    return parse_sql_type(DUCKDB_TYPE_ALIASES.get(text.upper(), text))
@@ -16,6 +16,7 @@ from edurel.syntax.er_ast import (
     ValueList,
 )
 from edurel.syntax.rel_ast import Column, DataList, ForeignKey, RelSchema, Table
+from edurel.syntax.sql_type import SqlType, parse_sql_type
 
 
 class ERSchemaTranslationBuilder(ABC):
@@ -356,6 +357,14 @@ class YamlTranslationBuilder(ERSchemaTranslationBuilder):
             return value
         return "'" + value.replace("'", "''") + "'"
 
+    @classmethod
+    def _yaml_type(cls, sql_type: SqlType | str) -> str:
+        if isinstance(sql_type, str):
+            sql_type = parse_sql_type(sql_type)
+        if sql_type.is_structured and sql_type.base not in {"TRUE", "FALSE", "NULL"}:
+            return sql_type.text
+        return cls._yaml_scalar(sql_type.text)
+
     def build(self) -> str:
         lines: list[str] = []
 
@@ -366,7 +375,7 @@ class YamlTranslationBuilder(ERSchemaTranslationBuilder):
                 if "key" in entity:
                     lines.append(f"  key: {self._yaml_scalar(entity['key'])}")
                 if "keytype" in entity:
-                    lines.append(f"  keytype: {self._yaml_scalar(entity['keytype'])}")
+                    lines.append(f"  keytype: {self._yaml_type(entity['keytype'])}")
                 self._append_attributes(lines, entity.get("attributes", []))
 
         if self.associative_entities:
@@ -458,7 +467,7 @@ class YamlTranslationBuilder(ERSchemaTranslationBuilder):
     def _attribute_dict(attribute: Attribute) -> dict:
         attribute_dict = {
             "attributename": attribute.attributename,
-            "type": attribute.type,
+            "type": attribute.sql_type,
         }
         if attribute.nullable:
             attribute_dict["nullable"] = True
@@ -474,7 +483,7 @@ class YamlTranslationBuilder(ERSchemaTranslationBuilder):
                 f"  - attributename: {YamlTranslationBuilder._yaml_scalar(attribute['attributename'])}"
             )
             lines.append(
-                f"    type: {YamlTranslationBuilder._yaml_scalar(attribute['type'])}"
+                f"    type: {YamlTranslationBuilder._yaml_type(attribute['type'])}"
             )
             if attribute.get("nullable"):
                 lines.append("    nullable: true")
@@ -491,7 +500,7 @@ class YamlTranslationBuilder(ERSchemaTranslationBuilder):
             )
         if "keytype" in identification:
             lines.append(
-                f"    keytype: {YamlTranslationBuilder._yaml_scalar(identification['keytype'])}"
+                f"    keytype: {YamlTranslationBuilder._yaml_type(identification['keytype'])}"
             )
         global_keys = identification.get("global", [])
         if global_keys:
@@ -567,7 +576,7 @@ class MermaidTranslationBuilder(ERSchemaTranslationBuilder):
     def add_entity_attribute(self, entity: Entity, attribute: Attribute) -> None:
         visibility = "-" if attribute.nullable else "+"
         self._add_attribute_member(
-            f"{visibility}{attribute.attributename} {self._member_type(attribute.type)}"
+            f"{visibility}{attribute.attributename} {attribute.sql_type.name or 'INTEGER'}"
         )
 
     def end_entity(self, entity: Entity) -> None:
@@ -620,7 +629,7 @@ class MermaidTranslationBuilder(ERSchemaTranslationBuilder):
     ) -> None:
         visibility = "-" if attribute.nullable else "+"
         self._add_attribute_member(
-            f"{visibility}{attribute.attributename} {self._member_type(attribute.type)}"
+            f"{visibility}{attribute.attributename} {attribute.sql_type.name or 'INTEGER'}"
         )
 
     def end_associative_entity(self, associative_entity: AssociativeEntity) -> None:
@@ -682,8 +691,8 @@ class MermaidTranslationBuilder(ERSchemaTranslationBuilder):
     def _member_type(attribute_type: str | None, default: str = "INTEGER") -> str:
         if attribute_type is None:
             return default
-        stripped_type = re.sub(r"\s*\(.*\)$", "", attribute_type).strip()
-        return stripped_type or default
+        # parse_sql_type memoizes per type string, which replaces the per-schema cache.
+        return parse_sql_type(attribute_type).name or default
 
     @staticmethod
     def _mermaid_text(value: str) -> str:
@@ -0,0 +1,404 @@
+from copy import deepcopy
+from dataclasses import dataclass, field
+import re
+
+from edurel.syntax.rel_ast import Column, ForeignKey, RelSchema, Table, enrich_ast
+from edurel.translation.rel_trans import (
+    RelSchemaLevelTranslationVisitor,
+    SqlTranslationBuilderFkExternal,
+    SqlTranslationBuilderFkInternal,
+    get_sql_dialect,
+)
+
+
+MIGRATION_DIALECTS = ("postgres", "duckdb")
+
+# Value that replaces NULLs in existing rows before a column becomes NOT NULL.
+NOT_NULL_FILL_VALUES: dict[str, str] = {
+    "SMALLINT": "0",
+    "INT": "0",
+    "INTEGER": "0",
+    "BIGINT": "0",
+    "DECIMAL": "0",
+    "NUMERIC": "0",
+    "FLOAT": "0",
+    "DOUBLE": "0",
+    "REAL": "0",
+    "CHAR": "''",
+    "VARCHAR": "''",
+    "TEXT": "''",
+    "BOOLEAN": "FALSE",
+    "DATE": "DATE '1970-01-01'",
+    "TIMESTAMP": "TIMESTAMP '1970-01-01 00:00:00'",
+    "TIME": "TIME '00:00:00'",
+}
+
+POSTGRES_MAX_IDENTIFIER_BYTES = 63
+
+
+def _primary_key_constraint(tablename: str) -> str:
+    """Name PostgreSQL gives the unnamed primary key constraint of a get_sql() table.
+
+    Unquoted table names are folded to lower case, and the table part is cut
+    so the whole name fits into PostgreSQL's identifier length limit.
+    """
+    if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", tablename):
+        tablename = tablename.lower()
+    suffix = "_pkey"
+    limit = POSTGRES_MAX_IDENTIFIER_BYTES - len(suffix)
+    return tablename.encode("utf-8")[:limit].decode("utf-8", errors="ignore") + suffix
+
+
+@dataclass
+class ColumnChange:
+    """Represents a column whose type or nullability changed."""
+
+    old: Column
+    new: Column
+
+    def __str__(self) -> str:
+        return f"{self.old} => {self.new}"
+
+
+@dataclass
+class TableDiff:
+    """Represents the changes between two versions of the same table."""
+
+    tablename: str
+    added_columns: list[Column] = field(default_factory=list)
+    removed_columns: list[Column] = field(default_factory=list)
+    changed_columns: list[ColumnChange] = field(default_factory=list)
+    old_primary_key: list[str] = field(default_factory=list)
+    new_primary_key: list[str] = field(default_factory=list)
+    added_foreign_keys: list[ForeignKey] = field(default_factory=list)
+    removed_foreign_keys: list[ForeignKey] = field(default_factory=list)
+
+    @property
+    def primary_key_changed(self) -> bool:
+        return self.old_primary_key != self.new_primary_key
+
+    def is_empty(self) -> bool:
+        return not (
+            self.added_columns
+            or self.removed_columns
+            or self.changed_columns
+            or self.primary_key_changed
+            or self.added_foreign_keys
+            or self.removed_foreign_keys
+        )
+
+    def __str__(self) -> str:
+        lines = [f"Table: {self.tablename}"]
+        lines.extend(f"  + column {column}" for column in self.added_columns)
+        lines.extend(f"  - column {column}" for column in self.removed_columns)
+        lines.extend(f"  ~ column {change}" for change in self.changed_columns)
+        if self.primary_key_changed:
+            lines.append(
+                f"  ~ primary key [{', '.join(self.old_primary_key)}] => "
+                f"[{', '.join(self.new_primary_key)}]"
+            )
+        lines.extend(f"  + fk {foreign_key}" for foreign_key in self.added_foreign_keys)
+        lines.extend(f"  - fk {foreign_key}" for foreign_key in self.removed_foreign_keys)
+        return "\n".join(lines)
+
+
+@dataclass
+class DataListDiff:
+    """Represents changed values of a datalist."""
+
+    tablename: str
+    old_values: list[str] = field(default_factory=list)
+    new_values: list[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return (
+            f"DataList: {self.tablename}\n"
+            f"  Old: {', '.join(self.old_values)}\n"
+            f"  New: {', '.join(self.new_values)}"
+        )
+
+
+@dataclass
+class RelSchemaDiff:
+    """Structural difference between an old and a new relational schema."""
+
+    added_tables: list[Table] = field(default_factory=list)
+    removed_tables: list[Table] = field(default_factory=list)
+    changed_tables: list[TableDiff] = field(default_factory=list)
+    changed_datalists: list[DataListDiff] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (
+            self.added_tables
+            or self.removed_tables
+            or self.changed_tables
+            or self.changed_datalists
+        )
+
+    def __str__(self) -> str:
+        sections = []
+        if self.added_tables:
+            sections.append(
+                "=== ADDED TABLES ===\n"
+                + "\n".join(table.tablename for table in self.added_tables)
+            )
+        if self.removed_tables:
+            sections.append(
+                "=== REMOVED TABLES ===\n"
+                + "\n".join(table.tablename for table in self.removed_tables)
+            )
+        if self.changed_tables:
+            sections.append(
+                "=== CHANGED TABLES ===\n"
+                + "\n\n".join(str(table_diff) for table_diff in self.changed_tables)
+            )
+        if self.changed_datalists:
+            sections.append(
+                "=== CHANGED DATALISTS ===\n"
+                + "\n\n".join(str(datalist_diff) for datalist_diff in self.changed_datalists)
+            )
+        return "\n\n".join(sections) if sections else "No changes"
+
+
+def _foreign_key_signature(foreign_key: ForeignKey) -> tuple:
+    return (
+        foreign_key.fkname,
+        tuple(foreign_key.sourcecolumns),
+        foreign_key.targettable,
+        tuple(foreign_key.targetcolumns),
+    )
+
+
+def _diff_table(old_table: Table, new_table: Table) -> TableDiff:
+    table_diff = TableDiff(
+        tablename=new_table.tablename,
+        old_primary_key=list(old_table.primary_key),
+        new_primary_key=list(new_table.primary_key),
+    )
+
+    old_columns = {column.columnname: column for column in old_table.columns}
+    new_columns = {column.columnname: column for column in new_table.columns}
+    for column in new_table.columns:
+        old_column = old_columns.get(column.columnname)
+        if old_column is None:
+            table_diff.added_columns.append(column)
+        elif old_column.sql_type != column.sql_type or old_column.nullable != column.nullable:
+            table_diff.changed_columns.append(ColumnChange(old=old_column, new=column))
+    table_diff.removed_columns = [
+        column for column in old_table.columns if column.columnname not in new_columns
+    ]
+
+    old_foreign_keys = {_foreign_key_signature(fk) for fk in old_table.foreign_keys}
+    new_foreign_keys = {_foreign_key_signature(fk) for fk in new_table.foreign_keys}
+    table_diff.added_foreign_keys = [
+        fk for fk in new_table.foreign_keys if _foreign_key_signature(fk) not in old_foreign_keys
+    ]
+    table_diff.removed_foreign_keys = [
+        fk for fk in old_table.foreign_keys if _foreign_key_signature(fk) not in new_foreign_keys
+    ]
+    return table_diff
+
+
+def diff_ast(old_schema: RelSchema, new_schema: RelSchema) -> RelSchemaDiff:
+    """Compare two relational schema ASTs table by table and column by column."""
+    old_tables = {table.tablename: table for table in old_schema.tables}
+    new_tables = {table.tablename: table for table in new_schema.tables}
+
+    schema_diff = RelSchemaDiff(
+        added_tables=[
+            table for table in new_schema.tables if table.tablename not in old_tables
+        ],
+        removed_tables=[
+            table for table in old_schema.tables if table.tablename not in new_tables
+        ],
+    )
+    for table in new_schema.tables:
+        old_table = old_tables.get(table.tablename)
+        if old_table is None:
+            continue
+        table_diff = _diff_table(old_table, table)
+        if not table_diff.is_empty():
+            schema_diff.changed_tables.append(table_diff)
+
+    old_datalists = {datalist.tablename: datalist for datalist in old_schema.datalists}
+    new_datalists = {datalist.tablename: datalist for datalist in new_schema.datalists}
+    for tablename in list(old_datalists) + [
+        name for name in new_datalists if name not in old_datalists
+    ]:
+        if tablename not in new_tables:
+            continue
+        old_values = old_datalists[tablename].values if tablename in old_datalists else []
+        new_values = new_datalists[tablename].values if tablename in new_datalists else []
+        if tablename not in old_tables:
+            old_values = []
+        if old_values != new_values:
+            schema_diff.changed_datalists.append(
+                DataListDiff(
+                    tablename=tablename,
+                    old_values=list(old_values),
+                    new_values=list(new_values),
+                )
+            )
+    return schema_diff
+
+
+def _leveled(tables: list[Table]) -> list[Table]:
+    sub_schema = RelSchema(tables=deepcopy(tables))
+    enrich_ast(sub_schema)
+    return sorted(sub_schema.tables, key=lambda table: table.level)
+
+
+def migration_sql(schema_diff: RelSchemaDiff, dialect: str = "duckdb") -> str:
+    """Generate SQL statements that migrate a database from the old to the new schema.
+
+    Datalist rows are matched by position, the same way get_sql() numbers them,
+    so the migrated rows equal a fresh rebuild. Changes the dialect cannot apply
+    with ALTER TABLE are emitted as comments that need a manual migration.
+
+    Before a new or existing column becomes NOT NULL, NULLs in existing rows
+    are replaced by a fill value of its type (NOT_NULL_FILL_VALUES: 0, '',
+    FALSE, 1970-01-01, ...), announced by a comment in the script so it can be
+    reviewed. Types without a fill value are left to a manual migration.
+    A changed primary key is dropped under the name PostgreSQL gives it
+    (<table>_pkey, see _primary_key_constraint).
+
+    Args:
+        schema_diff: Result of diff_ast(old_schema, new_schema)
+        dialect: Either `postgres` or `duckdb`
+
+    Returns:
+        Migration script, empty if there are no changes
+    """
+    if dialect not in MIGRATION_DIALECTS:
+        supported = ", ".join(f"`{name}`" for name in MIGRATION_DIALECTS)
+        raise ValueError(
+            f"Unsupported migration dialect '{dialect}'. Use one of: {supported}."
+        )
+    sql_dialect = get_sql_dialect(dialect)
+    identifier = sql_dialect.identifier
+
+    def manual(statement: str) -> str:
+        return f"-- not supported by {dialect}, migrate manually: " + " ".join(
+            statement.split()
+        )
+
+    def set_not_null(tablename: str, column: Column) -> list[str]:
+        table_sql = identifier(tablename)
+        column_sql = identifier(column.columnname)
+        statement = f"ALTER TABLE {table_sql} ALTER COLUMN {column_sql} SET NOT NULL;"
+        fill = NOT_NULL_FILL_VALUES.get(column.sql_type.base) if column.sql_type.is_structured else None
+        if fill is None:
+            return [
+                f"-- no fill value for {column.type}, replace NULLs in {tablename}.{column.columnname} "
+                f"and migrate manually: {statement}"
+            ]
+        return [
+            f"-- NULLs in {tablename}.{column.columnname} become {fill} before SET NOT NULL; "
+            "review the fill value",
+            f"UPDATE {table_sql} SET {column_sql} = {fill} WHERE {column_sql} IS NULL;",
+            statement,
+        ]
+
+    statements: list[str] = []
+
+    for table_diff in schema_diff.changed_tables:
+        for foreign_key in table_diff.removed_foreign_keys:
+            if foreign_key.fkname is None:
+                statements.append(
+                    f"-- cannot drop unnamed foreign key on {table_diff.tablename}: {foreign_key}"
+                )
+                continue
+            statement = (
+                f"ALTER TABLE {identifier(table_diff.tablename)} "
+                f"DROP CONSTRAINT {identifier(foreign_key.fkname)};"
+            )
+            statements.append(
+                statement if sql_dialect.supports_alter_foreign_key else manual(statement)
+            )
+
+    for table in reversed(_leveled(schema_diff.removed_tables)):
+        statements.append(f"DROP TABLE {identifier(table.tablename)};")
+
+    for table_diff in schema_diff.changed_tables:
+        table_sql = identifier(table_diff.tablename)
+        for column in table_diff.added_columns:
+            statements.append(
+                f"ALTER TABLE {table_sql} ADD COLUMN {identifier(column.columnname)} "
+                f"{sql_dialect.sql_type(column.sql_type)};"
+            )
+            if not column.nullable:
+                statements.extend(set_not_null(table_diff.tablename, column))
+        for change in table_diff.changed_columns:
+            column_sql = identifier(change.new.columnname)
+            if change.old.sql_type != change.new.sql_type:
+                statements.append(
+                    f"ALTER TABLE {table_sql} ALTER COLUMN {column_sql} "
+                    f"TYPE {sql_dialect.sql_type(change.new.sql_type)};"
+                )
+            if change.new.nullable and not change.old.nullable:
+                statements.append(
+                    f"ALTER TABLE {table_sql} ALTER COLUMN {column_sql} DROP NOT NULL;"
+                )
+            elif change.old.nullable and not change.new.nullable:
+                statements.extend(set_not_null(table_diff.tablename, change.new))
+        for column in table_diff.removed_columns:
+            statements.append(
+                f"ALTER TABLE {table_sql} DROP COLUMN {identifier(column.columnname)};"
+            )
+        if table_diff.primary_key_changed:
+            if table_diff.old_primary_key:
+                statement = (
+                    f"ALTER TABLE {table_sql} DROP CONSTRAINT "
+                    f"{identifier(_primary_key_constraint(table_diff.tablename))};"
+                )
+                statements.append(
+                    statement if sql_dialect.supports_alter_foreign_key else manual(statement)
+                )
+            if table_diff.new_primary_key:
+                statement = (
+                    f"ALTER TABLE {table_sql} ADD PRIMARY KEY "
+                    f"({', '.join(identifier(name) for name in table_diff.new_primary_key)});"
+                )
+                can_add = sql_dialect.supports_alter_foreign_key or not table_diff.old_primary_key
+                statements.append(statement if can_add else manual(statement))
+
+    # New tables are created after the column changes: DuckDB refuses to alter a
+    # table once another table references it.
+    if schema_diff.added_tables:
+        create_builder = SqlTranslationBuilderFkInternal(dialect)
+        sub_schema = RelSchema(tables=_leveled(schema_diff.added_tables))
+        RelSchemaLevelTranslationVisitor(create_builder).visit(sub_schema)
+        statements.extend(create_builder.create_statements)
+
+    foreign_key_builder = SqlTranslationBuilderFkExternal(
+        "postgres" if not sql_dialect.supports_alter_foreign_key else dialect
+    )
+    for table_diff in schema_diff.changed_tables:
+        table = Table(tablename=table_diff.tablename)
+        for foreign_key in table_diff.added_foreign_keys:
+            foreign_key_builder.add_foreign_key(table, foreign_key)
+    for statement in foreign_key_builder.alter_statements:
+        statement = " ".join(statement.split())
+        statements.append(
+            statement if sql_dialect.supports_alter_foreign_key else manual(statement)
+        )
+
+    literal = SqlTranslationBuilderFkInternal._sql_string_literal
+    for datalist_diff in schema_diff.changed_datalists:
+        table_sql = identifier(datalist_diff.tablename)
+        old_values = datalist_diff.old_values
+        new_values = datalist_diff.new_values
+        for index, value in enumerate(new_values, start=1):
+            if index > len(old_values):
+                statements.append(
+                    f"INSERT INTO {table_sql} (ID, Description, IsValid, SortOrder) "
+                    f"VALUES ({index}, {literal(value)}, 1, {index});"
+                )
+            elif old_values[index - 1] != value:
+                statements.append(
+                    f"UPDATE {table_sql} SET Description = {literal(value)} WHERE ID = {index};"
+                )
+        if len(old_values) > len(new_values):
+            statements.append(f"DELETE FROM {table_sql} WHERE ID > {len(new_values)};")
+
+    return "\n".join(statements)
@@ -1,7 +1,48 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 import re
 
 from edurel.syntax.rel_ast import Column, DataList, ForeignKey, RelSchema, Table
+from edurel.syntax.sql_type import SqlType, parse_sql_type
+
+
+@dataclass(frozen=True)
+class SqlDialect:
+    """Describes how SQL DDL is spelled in a target dialect."""
+
+    name: str
+    quote_start: str = '"'
+    quote_end: str = '"'
+    supports_alter_foreign_key: bool = True
+
+    def identifier(self, identifier: str) -> str:
+        if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", identifier):
+            return identifier
+        escaped = identifier.replace(self.quote_end, self.quote_end * 2)
+        return f"{self.quote_start}{escaped}{self.quote_end}"
+
+    def sql_type(self, sql_type: SqlType | str) -> str:
+        if isinstance(sql_type, str):
+            sql_type = parse_sql_type(sql_type)
+        return sql_type.render(self.name)
+
+
+SQL_DIALECTS: dict[str, SqlDialect] = {
+    "postgres": SqlDialect(name="postgres"),
+    "duckdb": SqlDialect(name="duckdb", supports_alter_foreign_key=False),
+    "sqlite": SqlDialect(name="sqlite", supports_alter_foreign_key=False),
+    "mysql": SqlDialect(name="mysql", quote_start="`", quote_end="`"),
+}
+
+
+def get_sql_dialect(dialect: str) -> SqlDialect:
+    sql_dialect = SQL_DIALECTS.get(dialect.strip().lower())
+    if sql_dialect is None:
+        supported = ", ".join(f"`{name}`" for name in SQL_DIALECTS)
+        raise ValueError(
+            f"Unsupported SQL dialect '{dialect}'. Use one of: {supported}."
+        )
+    return sql_dialect
 
 
 class RelSchemaTranslationBuilder(ABC):
@@ -108,7 +149,7 @@ class YamlTranslationBuilder(RelSchemaTranslationBuilder):
         assert self.current_table is not None
         column_dict = {
             "columnname": column.columnname,
-            "type": column.type,
+            "type": column.sql_type,
         }
         if column.nullable:
             column_dict["nullable"] = True
@@ -152,6 +193,12 @@ class YamlTranslationBuilder(RelSchemaTranslationBuilder):
             return value
         return "'" + value.replace("'", "''") + "'"
 
+    @classmethod
+    def _yaml_type(cls, sql_type: SqlType) -> str:
+        if sql_type.is_structured and sql_type.base not in {"TRUE", "FALSE", "NULL"}:
+            return sql_type.text
+        return cls._yaml_scalar(sql_type.text)
+
     def build(self) -> str:
         lines: list[str] = ["tables:"]
         for table in self.tables:
@@ -159,7 +206,7 @@ class YamlTranslationBuilder(RelSchemaTranslationBuilder):
             lines.append("  columns:")
             for column in table["columns"]:
                 lines.append(f"  - columnname: {self._yaml_scalar(column['columnname'])}")
-                lines.append(f"    type: {self._yaml_scalar(column['type'])}")
+                lines.append(f"    type: {self._yaml_type(column['type'])}")
                 if column.get("nullable"):
                     lines.append("    nullable: true")
             lines.append("  primary_key:")
@@ -192,7 +239,8 @@ class YamlTranslationBuilder(RelSchemaTranslationBuilder):
 
 
 class SqlTranslationBuilder(RelSchemaTranslationBuilder):
-    def __init__(self) -> None:
+    def __init__(self, dialect: str = "postgres") -> None:
+        self.dialect = get_sql_dialect(dialect)
         self.create_statements: list[str] = []
         self.insert_statements: list[str] = []
         self.current_table_lines: list[str] = []
@@ -208,19 +256,25 @@ class SqlTranslationBuilder(RelSchemaTranslationBuilder):
         self.current_table_lines = []
 
     def add_column(self, table: Table, column: Column) -> None:
-        column_sql = f"  {column.columnname} {column.type}"
+        column_sql = (
+            f"  {self.dialect.identifier(column.columnname)} "
+            f"{self.dialect.sql_type(column.sql_type)}"
+        )
         if not column.nullable:
             column_sql += " NOT NULL"
         self.current_table_lines.append(column_sql)
 
-    @staticmethod
-    def _sql_foreign_key_constraint(foreign_key: ForeignKey) -> str:
+    def _sql_identifiers(self, identifiers: list[str]) -> str:
+        return ", ".join(self.dialect.identifier(identifier) for identifier in identifiers)
+
+    def _sql_foreign_key_constraint(self, foreign_key: ForeignKey) -> str:
         constraint_sql = ""
         if foreign_key.fkname:
-            constraint_sql += f"CONSTRAINT {foreign_key.fkname} "
+            constraint_sql += f"CONSTRAINT {self.dialect.identifier(foreign_key.fkname)} "
         constraint_sql += (
-            f"FOREIGN KEY ({', '.join(foreign_key.sourcecolumns)}) "
-            f"REFERENCES {foreign_key.targettable} ({', '.join(foreign_key.targetcolumns)})"
+            f"FOREIGN KEY ({self._sql_identifiers(foreign_key.sourcecolumns)}) "
+            f"REFERENCES {self.dialect.identifier(foreign_key.targettable)} "
+            f"({self._sql_identifiers(foreign_key.targetcolumns)})"
         )
         return constraint_sql
 
@@ -228,25 +282,29 @@ class SqlTranslationBuilder(RelSchemaTranslationBuilder):
     def _sql_string_literal(value: str) -> str:
         return "'" + value.replace("'", "''") + "'"
 
-    @classmethod
-    def _sql_datalist_insert_statements(cls, datalist: DataList) -> list[str]:
+    def _sql_datalist_insert_statements(self, datalist: DataList) -> list[str]:
+        table_sql = self.dialect.identifier(datalist.tablename)
         statements: list[str] = []
         for index, value in enumerate(datalist.values, start=1):
             statements.append(
-                f"INSERT INTO {datalist.tablename} (ID, Description, IsValid, SortOrder) "
-                f"VALUES ({index}, {cls._sql_string_literal(value)}, 1, {index});"
+                f"INSERT INTO {table_sql} (ID, Description, IsValid, SortOrder) "
+                f"VALUES ({index}, {self._sql_string_literal(value)}, 1, {index});"
             )
         return statements
 
     def add_primary_key(self, table: Table) -> None:
-        self.current_table_lines.append(f"  PRIMARY KEY ({', '.join(table.primary_key)})")
+        self.current_table_lines.append(
+            f"  PRIMARY KEY ({self._sql_identifiers(table.primary_key)})"
+        )
 
     def add_foreign_key(self, table: Table, foreign_key: ForeignKey) -> None:
         raise NotImplementedError
 
     def end_table(self, table: Table) -> None:
         body = ",\n".join(self.current_table_lines)
-        self.create_statements.append(f"CREATE TABLE {table.tablename} (\n{body}\n);")
+        self.create_statements.append(
+            f"CREATE TABLE {self.dialect.identifier(table.tablename)} (\n{body}\n);"
+        )
 
     def add_datalist(self, datalist: DataList) -> None:
         self.insert_statements.extend(self._sql_datalist_insert_statements(datalist))
@@ -258,8 +316,8 @@ class SqlTranslationBuilder(RelSchemaTranslationBuilder):
 
 
 class SqlTranslationBuilderFkExternal(SqlTranslationBuilder):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, dialect: str = "postgres") -> None:
+        super().__init__(dialect)
         self.alter_statements: list[str] = []
 
     def start_schema(self, rel_schema: RelSchema) -> None:
@@ -267,8 +325,13 @@ class SqlTranslationBuilderFkExternal(SqlTranslationBuilder):
         self.alter_statements = []
 
     def add_foreign_key(self, table: Table, foreign_key: ForeignKey) -> None:
+        if not self.dialect.supports_alter_foreign_key:
+            raise ValueError(
+                f"Dialect '{self.dialect.name}' cannot add foreign keys with ALTER TABLE. "
+                "Use inline foreign keys (fk_external=False) instead."
+            )
         constraint_sql = (
-            f"ALTER TABLE {table.tablename}\n"
+            f"ALTER TABLE {self.dialect.identifier(table.tablename)}\n"
             f"  ADD {self._sql_foreign_key_constraint(foreign_key)};"
         )
         self.alter_statements.append(constraint_sql)
@@ -281,8 +344,8 @@ class SqlTranslationBuilderFkExternal(SqlTranslationBuilder):
 
 
 class SqlTranslationBuilderFkInternal(SqlTranslationBuilder):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, dialect: str = "postgres") -> None:
+        super().__init__(dialect)
         self.current_table_comments: list[str] = []
 
     def start_table(self, table: Table) -> None:
@@ -301,7 +364,9 @@ class SqlTranslationBuilderFkInternal(SqlTranslationBuilder):
         if self.current_table_comments:
             body_lines.extend(self.current_table_comments)
         body = "\n".join(line for line in body_lines if line)
-        self.create_statements.append(f"CREATE TABLE {table.tablename} (\n{body}\n);")
+        self.create_statements.append(
+            f"CREATE TABLE {self.dialect.identifier(table.tablename)} (\n{body}\n);"
+        )
 
 
 class MermaidTranslationBuilder(RelSchemaTranslationBuilder):
@@ -311,6 +376,8 @@ class MermaidTranslationBuilder(RelSchemaTranslationBuilder):
         self.relationships: list[str] = []
         self.table_columns: dict[str, list[str]] = {}
         self.table_column_lookup: dict[str, dict[str, Column]] = {}
+        self.table_primary_key_columns: dict[str, set[str]] = {}
+        self.table_foreign_key_columns: dict[str, set[str]] = {}
 
     def start_schema(self, rel_schema: RelSchema) -> None:
         self.lines = ["erDiagram", f"  direction {self.direction}"]
@@ -320,6 +387,17 @@ class MermaidTranslationBuilder(RelSchemaTranslationBuilder):
             table.tablename: {column.columnname: column for column in table.columns}
             for table in rel_schema.tables
         }
+        self.table_primary_key_columns = {
+            table.tablename: set(table.primary_key) for table in rel_schema.tables
+        }
+        self.table_foreign_key_columns = {
+            table.tablename: {
+                column_name
+                for foreign_key in table.foreign_keys
+                for column_name in foreign_key.sourcecolumns
+            }
+            for table in rel_schema.tables
+        }
 
     def end_schema(self, rel_schema: RelSchema) -> None:
         for table in rel_schema.tables:
@@ -331,19 +409,15 @@ class MermaidTranslationBuilder(RelSchemaTranslationBuilder):
     def start_table(self, table: Table) -> None:
         self.table_columns[table.tablename] = []
 
-    @staticmethod
-    def _strip_sql_type_size(sql_type: str) -> str:
-        return re.sub(r"\s*\(.*\)$", "", sql_type).strip()
-
     def add_column(self, table: Table, column: Column) -> None:
         labels: list[str] = []
-        if column.columnname in table.primary_key:
+        if column.columnname in self.table_primary_key_columns[table.tablename]:
             labels.append("PK")
-        if any(column.columnname in foreign_key.sourcecolumns for foreign_key in table.foreign_keys):
+        if column.columnname in self.table_foreign_key_columns[table.tablename]:
             labels.append("FK")
         label_suffix = f" {', '.join(labels)}" if labels else ""
         self.table_columns[table.tablename].append(
-            f"    {self._strip_sql_type_size(column.type)} {column.columnname}{label_suffix}"
+            f"    {column.sql_type.name} {column.columnname}{label_suffix}"
         )
 
     def add_primary_key(self, table: Table) -> None:
@@ -405,3 +479,71 @@ class StructureTranslationBuilder(RelSchemaTranslationBuilder):
 
     def build(self) -> str:
         return "\n".join(self.lines)
+
+
+class PromptTranslationBuilder(RelSchemaTranslationBuilder):
+    """Compact schema text for LLM prompts: one line per table.
+
+    Columns carry their type and markers: PK for primary key columns, ? for
+    nullable columns and ->table.column for single-column foreign keys.
+    Composite foreign keys follow the column list. Datalists are listed with
+    at most max_datalist_values values.
+    """
+
+    def __init__(self, max_datalist_values: int = 5) -> None:
+        self.max_datalist_values = max_datalist_values
+        self.lines: list[str] = []
+        self.current_columns: list[str] = []
+        self.current_markers: dict[str, list[str]] = {}
+        self.current_composite_keys: list[str] = []
+        self.datalist_lines: list[str] = []
+
+    def start_schema(self, rel_schema: RelSchema) -> None:
+        self.lines = ["# table(column TYPE); PK primary key, ? nullable, -> foreign key"]
+        self.datalist_lines = []
+
+    def end_schema(self, rel_schema: RelSchema) -> None:
+        return None
+
+    def start_table(self, table: Table) -> None:
+        self.current_columns = []
+        self.current_markers = {}
+        self.current_composite_keys = []
+
+    def add_column(self, table: Table, column: Column) -> None:
+        self.current_columns.append(column.columnname)
+        self.current_markers[column.columnname] = [
+            f"{column.columnname} {column.sql_type.text}{'?' if column.nullable else ''}"
+        ]
+
+    def add_primary_key(self, table: Table) -> None:
+        for columnname in table.primary_key:
+            if columnname in self.current_markers:
+                self.current_markers[columnname].append("PK")
+
+    def add_foreign_key(self, table: Table, foreign_key: ForeignKey) -> None:
+        if len(foreign_key.sourcecolumns) == 1 and foreign_key.sourcecolumns[0] in self.current_markers:
+            self.current_markers[foreign_key.sourcecolumns[0]].append(
+                f"->{foreign_key.targettable}.{foreign_key.targetcolumns[0]}"
+            )
+            return
+        self.current_composite_keys.append(
+            f"FK({', '.join(foreign_key.sourcecolumns)})->"
+            f"{foreign_key.targettable}({', '.join(foreign_key.targetcolumns)})"
+        )
+
+    def end_table(self, table: Table) -> None:
+        columns = ", ".join(" ".join(self.current_markers[name]) for name in self.current_columns)
+        self.lines.append(" ".join([f"{table.tablename}({columns})", *self.current_composite_keys]))
+
+    def add_datalist(self, datalist: DataList) -> None:
+        values = datalist.values[: self.max_datalist_values]
+        text = " | ".join(values)
+        if len(datalist.values) > len(values):
+            text += f" | ... ({len(datalist.values)} values)"
+        self.datalist_lines.append(f"{datalist.tablename}: {text}")
+
+    def build(self) -> str:
+        if not self.datalist_lines:
+            return "\n".join(self.lines)
+        return "\n".join([*self.lines, "# datalists: Description values, ID = position", *self.datalist_lines])
@@ -0,0 +1,179 @@
+from bisect import bisect_left
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import wraps
+import threading
+import time
+from typing import Any, Callable, ContextManager, Optional, TypeVar
+
+import pandas as pd
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    """Timing of one instrumented stage.
+
+    Attributes:
+        stage: Stage name, e.g. 'yaml.parse' or 'duckdb.query'
+        duration: Wall-clock seconds
+        attributes: Extra data passed to span()
+        error: Exception class name if the stage raised
+    """
+
+    stage: str
+    duration: float
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+SpanCallback = Callable[[SpanRecord], None]
+
+_callbacks: list[SpanCallback] = []
+_NULL_SPAN = nullcontext()
+
+
+def add_span_callback(callback: SpanCallback) -> None:
+    """Call `callback` with a SpanRecord whenever an instrumented stage finishes."""
+    _callbacks.append(callback)
+
+
+def remove_span_callback(callback: SpanCallback) -> None:
+    if callback in _callbacks:
+        _callbacks.remove(callback)
+
+
+class _Span:
+    __slots__ = ("stage", "attributes", "start")
+
+    def __init__(self, stage: str, attributes: dict[str, Any]):
+        self.stage = stage
+        self.attributes = attributes
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        record = SpanRecord(
+            stage=self.stage,
+            duration=time.perf_counter() - self.start,
+            attributes=self.attributes,
+            error=exc_type.__name__ if exc_type is not None else None,
+        )
+        for callback in list(_callbacks):
+            callback(record)
+
+
+def span(stage: str, **attributes: Any) -> ContextManager[Any]:
+    """Time the enclosed block as `stage`.
+
+    Without registered callbacks this returns a shared no-op context manager,
+    so instrumentation costs one list check when it is switched off.
+    """
+    if not _callbacks:
+        return _NULL_SPAN
+    return _Span(stage, attributes)
+
+
+def instrumented(stage: str) -> Callable[[F], F]:
+    """Decorator that times every call of the function as `stage`."""
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _callbacks:
+                return func(*args, **kwargs)
+            with _Span(stage, {}):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0,
+)
+
+
+class SpanCollector:
+    """Collect span durations per stage and summarize them as histograms.
+
+    Use as a context manager to register it for the enclosed block:
+
+        with SpanCollector() as collector:
+            man = RelSchemaMan.fromStr(yaml_str)
+            man.get_sql()
+        print(collector.summary())
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.durations: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record: SpanRecord) -> None:
+        with self._lock:
+            self.durations.setdefault(record.stage, []).append(record.duration)
+            if record.error is not None:
+                self.errors[record.stage] = self.errors.get(record.stage, 0) + 1
+
+    def __enter__(self) -> "SpanCollector":
+        add_span_callback(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        remove_span_callback(self)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.durations.clear()
+            self.errors.clear()
+
+    def histogram(self, stage: str) -> list[tuple[float, int]]:
+        """Count durations per bucket as (upper bound in seconds, count); the last bound is inf."""
+        bounds = list(self.buckets) + [float("inf")]
+        counts = [0] * len(bounds)
+        for duration in self.durations.get(stage, []):
+            counts[bisect_left(bounds, duration)] += 1
+        return list(zip(bounds, counts))
+
+    def histograms(self) -> dict[str, list[tuple[float, int]]]:
+        return {stage: self.histogram(stage) for stage in self.durations}
+
+    def summary(self) -> pd.DataFrame:
+        """One row per stage with count, errors and duration statistics in seconds."""
+        columns = ["stage", "count", "errors", "total", "mean", "p50", "p95", "max"]
+        rows = []
+        for stage, durations in self.durations.items():
+            series = pd.Series(durations)
+            rows.append(
+                {
+                    "stage": stage,
+                    "count": len(durations),
+                    "errors": self.errors.get(stage, 0),
+                    "total": series.sum(),
+                    "mean": series.mean(),
+                    "p50": series.quantile(0.5),
+                    "p95": series.quantile(0.95),
+                    "max": series.max(),
+                }
+            )
+        return (
+            pd.DataFrame(rows, columns=columns)
+            .sort_values("total", ascending=False, ignore_index=True)
+        )
+
+    def to_text(self) -> str:
+        """Render the per-stage histograms, skipping empty buckets."""
+        lines = []
+        for stage, histogram in self.histograms().items():
+            durations = self.durations[stage]
+            lines.append(f"{stage}: {len(durations)} calls, {sum(durations) * 1000:.2f} ms total")
+            for bound, count in histogram:
+                if count:
+                    label = "inf" if bound == float("inf") else f"{bound * 1000:g} ms"
+                    lines.append(f"  <= {label}: {count}")
+        return "\n".join(lines)
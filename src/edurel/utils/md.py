@@ -1,6 +1,8 @@
 import re
 from IPython.display import display, Markdown
 
+from edurel.utils.stream import accept_sql_block, extract_from_stream
+
 # ---------------------------------------------------------------------------------------------
 # Markdown
 # ---------------------------------------------------------------------------------------------
@@ -70,3 +72,15 @@ def yaml_extract(md):
 
     return ""
 
+
+def _accept_yaml_block(language, body):
+    # Only ```yaml/```yml blocks end the stream early. Generic blocks are
+    # never accepted here; yaml_extract picks them up from the full text
+    # once the stream has ended without a yaml block.
+    return language in ("yaml", "yml")
+
+def sql_extract_stream(chunks):
+    return extract_from_stream(chunks, accept_sql_block, sql_extract)
+
+def yaml_extract_stream(chunks):
+    return extract_from_stream(chunks, _accept_yaml_block, yaml_extract)
@@ -7,6 +7,8 @@ import tempfile
 
 from IPython.display import HTML, display
 
+from edurel.utils.instrument import instrumented
+
 def display_mermaid_diagram(mermaid_code, width="100%", height="500px") -> None:
     div_id = "mermaid_" + uuid.uuid4().hex
     html_content = f"""
@@ -42,6 +44,7 @@ def display_mermaid_diagram(mermaid_code, width="100%", height="500px") -> None:
     display(HTML(html_content))
 
 
+@instrumented("mermaid.png")
 def save_mermaid_png(
     mermaid_code: str,
     output_path: str,
@@ -1,8 +1,47 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+import os
+from pathlib import Path
 import re
+from typing import AsyncIterable, Iterable, Iterator
 
 import sqlglot
+from sqlglot import exp
+from sqlglot.dialects.dialect import Dialect
 from sqlglot.errors import ParseError, UnsupportedError
 
+from edurel.utils.instrument import instrumented
+from edurel.utils.stream import accept_sql_block, aextract_from_stream, extract_from_stream
+
+
+@dataclass
+class TranspileResult:
+    """Outcome of transpiling SQL to one target dialect."""
+
+    dialect: str
+    sql: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class SqlCheckResult:
+    """Validation and transpilation outcome for one SQL input of a batch."""
+
+    source: str
+    error: str | None = None
+    transpiled: dict[str, TranspileResult] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and all(result.ok for result in self.transpiled.values())
+
 
 def sql_extract(text: str) -> str:
     """Extract SQL code from text (supports both plain text and markdown)."""
@@ -31,6 +70,20 @@ def sql_extract(text: str) -> str:
     return ""
 
 
+def sql_extract_stream(chunks: Iterable[str]) -> str:
+    """Extract SQL from streamed text, returning as soon as the code block closes.
+
+    Unlike sql_extract, the first SQL block to close wins, even if a ```sql
+    block follows a generic one. Without any block, sql_extract runs on the
+    complete text.
+    """
+    return extract_from_stream(chunks, accept_sql_block, sql_extract)
+
+
+async def asql_extract_stream(chunks: AsyncIterable[str]) -> str:
+    return await aextract_from_stream(chunks, accept_sql_block, sql_extract)
+
+
 def _first_sqlglot_error(exc: Exception) -> dict | None:
     errors = getattr(exc, "errors", None)
     if isinstance(errors, list) and errors:
@@ -85,22 +138,57 @@ def _build_potential_fix(problem: str, context: str) -> str:
     return "Review the SQL syntax and the requested dialect, then try again."
 
 
-def validate_postgres_sql(sql: str) -> None:
+_DIALECT_LABELS = {
+    "postgres": "PostgreSQL",
+    "duckdb": "DuckDB",
+    "sqlite": "SQLite",
+    "mysql": "MySQL",
+}
+
+
+def _dialect_label(dialect: str) -> str:
+    return _DIALECT_LABELS.get(dialect, dialect)
+
+
+SQL_PARSE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=SQL_PARSE_CACHE_SIZE)
+def _parse_sql_cached(
+    sql: str, dialect: str
+) -> tuple[tuple[exp.Expression | None, ...], Exception | None]:
+    # Failures are cached too, so re-validating the same broken SQL is cheap.
+    try:
+        return tuple(sqlglot.parse(sql, read=dialect)), None
+    except Exception as exc:
+        return (), exc
+
+
+def clear_sql_parse_cache() -> None:
+    _parse_sql_cached.cache_clear()
+
+
+def parse_sql(sql: str, dialect: str = "postgres") -> list[exp.Expression | None]:
+    """Parse SQL into sqlglot expression trees, reusing earlier parses of the same text.
+
+    The returned trees are shared through the parse cache; copy them before
+    modifying. Raises ValueError with the same messages as validate_sql.
+    """
+    label = _dialect_label(dialect)
     if not sql.strip():
         raise ValueError(
             "SQL validation failed. "
             "\nProblem: Empty SQL input. "
-            "\nContext: PostgreSQL validation requires at least one SQL statement. "
-            "\nPotential fix: Provide one or more PostgreSQL statements to validate."
+            f"\nContext: {label} validation requires at least one SQL statement. "
+            f"\nPotential fix: Provide one or more {label} statements to validate."
         ) from None
 
-    try:
-        sqlglot.parse(sql, read="postgres")
-    except ParseError as exc:
+    expressions, exc = _parse_sql_cached(sql, dialect)
+    if isinstance(exc, ParseError):
         problem = (
             _first_sqlglot_error(exc) or {}
-        ).get("description") or "The SQL text is not valid PostgreSQL syntax."
-        context = "PostgreSQL parsing failed."
+        ).get("description") or f"The SQL text is not valid {label} syntax."
+        context = f"{label} parsing failed."
         location = _format_error_location(exc)
         snippet = _format_error_snippet(exc)
 
@@ -113,33 +201,34 @@ def validate_postgres_sql(sql: str) -> None:
             error_parts.append(f"\nSnippet: {snippet}")
         error_parts.append(f"\nPotential fix: {_build_potential_fix(problem, context)}")
         raise ValueError(" ".join(error_parts)) from None
-    except Exception as exc:
+    if exc is not None:
         raise ValueError(
             "Unexpected error while validating SQL: "
             f"{exc.__class__.__name__}: {exc}\n"
-            "Potential fix: Check that the input is valid PostgreSQL SQL text and try again. "
+            f"Potential fix: Check that the input is valid {label} SQL text and try again. "
             "If the problem persists, inspect custom SQL parser configuration."
         ) from None
+    return list(expressions)
 
 
-def transpile_postgres_sql(sql: str, target_dialect: str) -> str:
-    if not target_dialect.strip():
-        raise ValueError(
-            "SQL transpilation failed. "
-            "\nProblem: Empty target dialect. "
-            "\nContext: SQL transpilation requires a destination dialect name. "
-            "\nPotential fix: Provide a sqlglot dialect name such as `sqlite`, `mysql`, or `duckdb`."
-        ) from None
+def validate_sql(sql: str, dialect: str = "postgres") -> None:
+    parse_sql(sql, dialect)
+
+
+def validate_postgres_sql(sql: str) -> None:
+    validate_sql(sql, "postgres")
 
-    validate_postgres_sql(sql)
 
+def _generate_sql(expressions: list[exp.Expression | None], target_dialect: str) -> str:
     try:
-        transpiled = sqlglot.transpile(
-            sql,
-            read="postgres",
-            write=target_dialect,
-            unsupported_level=sqlglot.ErrorLevel.RAISE,
-        )
+        writer = Dialect.get_or_raise(target_dialect)
+        transpiled = [
+            writer.generate(
+                expression, copy=True, unsupported_level=sqlglot.ErrorLevel.RAISE
+            )
+            for expression in expressions
+            if expression
+        ]
         return ";\n".join(statement.rstrip(";") for statement in transpiled if statement.strip())
     except (ParseError, UnsupportedError, ValueError) as exc:
         if isinstance(exc, ValueError):
@@ -168,3 +257,147 @@ def transpile_postgres_sql(sql: str, target_dialect: str) -> str:
             "Potential fix: Check that the SQL is valid PostgreSQL and that the target dialect "
             "is supported by sqlglot."
         ) from None
+
+
+@instrumented("sql.transpile")
+def transpile_postgres_sql(sql: str, target_dialect: str) -> str:
+    if not target_dialect.strip():
+        raise ValueError(
+            "SQL transpilation failed. "
+            "\nProblem: Empty target dialect. "
+            "\nContext: SQL transpilation requires a destination dialect name. "
+            "\nPotential fix: Provide a sqlglot dialect name such as `sqlite`, `mysql`, or `duckdb`."
+        ) from None
+
+    return _generate_sql(parse_sql(sql, "postgres"), target_dialect)
+
+
+def _transpile_result(expressions: list[exp.Expression | None], target_dialect: str) -> TranspileResult:
+    try:
+        if not target_dialect.strip():
+            raise ValueError(
+                "SQL transpilation failed. "
+                "\nProblem: Empty target dialect. "
+                "\nContext: SQL transpilation requires a destination dialect name. "
+                "\nPotential fix: Provide a sqlglot dialect name such as `sqlite`, `mysql`, or `duckdb`."
+            )
+        return TranspileResult(
+            dialect=target_dialect, sql=_generate_sql(expressions, target_dialect)
+        )
+    except ValueError as exc:
+        return TranspileResult(dialect=target_dialect, error=str(exc))
+
+
+def _transpile_worker(sql: str, target_dialect: str) -> TranspileResult:
+    return _transpile_result(parse_sql(sql, "postgres"), target_dialect)
+
+
+def transpile_postgres_sql_multi(
+    sql: str, dialects: Iterable[str], processes: int | None = None
+) -> dict[str, TranspileResult]:
+    """Transpile PostgreSQL SQL to several dialects from a single parse.
+
+    Args:
+        sql: PostgreSQL SQL text
+        dialects: Target sqlglot dialect names
+        processes: If given, generate the dialects in a pool of that many worker
+            processes. Each worker parses the SQL once, so this only pays off
+            for very large scripts.
+
+    Returns:
+        Dict mapping each dialect to its TranspileResult. A dialect that fails
+        carries the same error message transpile_postgres_sql would raise,
+        without affecting the other dialects.
+
+    Raises:
+        ValueError: If the SQL is not valid PostgreSQL
+    """
+    dialects = list(dict.fromkeys(dialects))
+    expressions = parse_sql(sql, "postgres")
+
+    if processes is None or len(dialects) < 2:
+        return {dialect: _transpile_result(expressions, dialect) for dialect in dialects}
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        results = executor.map(_transpile_worker, [sql] * len(dialects), dialects)
+        return dict(zip(dialects, results))
+
+
+def _check_sql_item(
+    source: str, sql: str | None, path: str | None, target_dialects: tuple[str, ...]
+) -> SqlCheckResult:
+    if path is not None:
+        try:
+            sql = Path(path).read_text(encoding="utf-8")
+        except OSError as exc:
+            return SqlCheckResult(
+                source=source,
+                error=f"Could not read SQL file {path}: {exc.__class__.__name__}: {exc}",
+            )
+    assert sql is not None
+    try:
+        expressions = parse_sql(sql, "postgres")
+    except ValueError as exc:
+        return SqlCheckResult(source=source, error=str(exc))
+    return SqlCheckResult(
+        source=source,
+        transpiled={
+            dialect: _transpile_result(expressions, dialect) for dialect in target_dialects
+        },
+    )
+
+
+def _check_sql_chunk(
+    chunk: list[tuple[str, str | None, str | None]], target_dialects: tuple[str, ...]
+) -> list[SqlCheckResult]:
+    return [
+        _check_sql_item(source, sql, path, target_dialects) for source, sql, path in chunk
+    ]
+
+
+def check_sql_batch(
+    items: Iterable[str | Path],
+    target_dialects: Iterable[str] = (),
+    processes: int | None = None,
+    chunksize: int = 64,
+) -> Iterator[SqlCheckResult]:
+    """Validate, and optionally transpile, many PostgreSQL inputs across worker processes.
+
+    Args:
+        items: SQL texts (str) or SQL files (Path)
+        target_dialects: Dialects to transpile every valid input to
+        processes: Number of worker processes. Defaults to the CPU count;
+            1 checks everything in the calling process.
+        chunksize: Number of inputs sent to a worker at a time
+
+    Yields:
+        One SqlCheckResult per input, in input order, as soon as its chunk is
+        done. `source` is the file path, or `#<index>` for SQL text. Errors
+        carry the messages validate_postgres_sql and transpile_postgres_sql
+        would raise.
+    """
+    target_dialects = tuple(dict.fromkeys(target_dialects))
+    processes = processes or os.cpu_count() or 1
+
+    def chunks() -> Iterator[list[tuple[str, str | None, str | None]]]:
+        indexed = (
+            (str(item), None, str(item)) if isinstance(item, Path) else (f"#{index}", item, None)
+            for index, item in enumerate(items)
+        )
+        while chunk := list(islice(indexed, chunksize)):
+            yield chunk
+
+    if processes == 1:
+        for chunk in chunks():
+            yield from _check_sql_chunk(chunk, target_dialects)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # Keep a bounded number of chunks in flight so huge inputs stream through.
+        pending: deque[Future] = deque()
+        for chunk in chunks():
+            pending.append(executor.submit(_check_sql_chunk, chunk, target_dialects))
+            if len(pending) >= 2 * processes:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
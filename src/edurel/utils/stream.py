@@ -0,0 +1,109 @@
+import re
+from typing import AsyncIterable, Callable, Iterable
+
+
+_FENCE_OPEN_PATTERN = re.compile(r"```([A-Za-z]*)([^\n]*)\n")
+_SQL_START_PATTERN = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|CREATE|DROP|ALTER|WITH)\b", re.IGNORECASE)
+
+
+def accept_sql_block(language: str, body: str) -> bool:
+    """Accept ```sql blocks and generic blocks that start with an SQL keyword."""
+    return language == "sql" or (language == "" and bool(_SQL_START_PATTERN.match(body)))
+
+
+class FencedBlockExtractor:
+    """Find fenced code blocks in text that arrives chunk by chunk.
+
+    Each chunk is scanned only from where the previous scan stopped, and the
+    first closed block accepted by `accept(language, body)` becomes the result.
+    A fence line must look like the ones the regex extractors match: three
+    backticks, an optional language name, optional whitespace, newline.
+    """
+
+    def __init__(self, accept: Callable[[str, str], bool]):
+        self.accept = accept
+        self.text = ""
+        self.result: str | None = None
+        self._open_scan = 0
+        self._block_language: str | None = None
+        self._block_start = 0
+        self._close_scan = 0
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    def feed(self, chunk: str) -> str | None:
+        """Add a chunk and return the block content once an accepted block has closed."""
+        if self.done:
+            return self.result
+        self.text += chunk
+        while not self.done:
+            if self._block_language is None:
+                if not self._find_open_fence():
+                    break
+            elif not self._find_close_fence():
+                break
+        return self.result
+
+    def _find_open_fence(self) -> bool:
+        while True:
+            match = _FENCE_OPEN_PATTERN.search(self.text, self._open_scan)
+            if match is None:
+                # Only a fence that is still missing its newline can match later.
+                pending = self.text.find("```", self._open_scan)
+                self._open_scan = pending if pending >= 0 else max(
+                    self._open_scan, len(self.text) - 2
+                )
+                return False
+            self._open_scan = match.end()
+            if match.group(2).strip():
+                continue
+            self._block_language = match.group(1).lower()
+            self._block_start = match.end()
+            self._close_scan = match.end()
+            return True
+
+    def _find_close_fence(self) -> bool:
+        close_index = self.text.find("\n```", self._close_scan)
+        if close_index < 0:
+            self._close_scan = max(self._close_scan, len(self.text) - 3)
+            return False
+        assert self._block_language is not None
+        body = self.text[self._block_start:close_index]
+        if self.accept(self._block_language, body):
+            self.result = body.strip()
+        self._block_language = None
+        self._open_scan = close_index + 4
+        return True
+
+
+def extract_from_stream(
+    chunks: Iterable[str],
+    accept: Callable[[str, str], bool],
+    fallback: Callable[[str], str],
+) -> str:
+    """Return the first accepted fenced block as soon as it closes.
+
+    Stops consuming `chunks` at that point, so a generator producing them can
+    be closed early. If the stream ends without such a block, `fallback` is
+    applied to the complete text.
+    """
+    extractor = FencedBlockExtractor(accept)
+    for chunk in chunks:
+        if extractor.feed(chunk) is not None:
+            return extractor.result
+    return fallback(extractor.text)
+
+
+async def aextract_from_stream(
+    chunks: AsyncIterable[str],
+    accept: Callable[[str, str], bool],
+    fallback: Callable[[str], str],
+) -> str:
+    """Async variant of extract_from_stream."""
+    extractor = FencedBlockExtractor(accept)
+    async for chunk in chunks:
+        if extractor.feed(chunk) is not None:
+            return extractor.result
+    return fallback(extractor.text)
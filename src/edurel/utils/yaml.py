@@ -1,7 +1,10 @@
 from strictyaml import load, Map
 from strictyaml.exceptions import YAMLValidationError
 
+from edurel.utils.instrument import instrumented
 
+
+@instrumented("yaml.parse")
 def parse_yaml(text: str, schema: Map) -> dict:
     def _format_error_location(exc: Exception) -> str | None:
         mark = getattr(exc, "problem_mark", None) or getattr(exc, "context_mark", None)
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from edurel.llm.conversation_base import Conversation, acall_llm_batch, call_llm_batch
+
+
+class EchoChatModel(BaseChatModel):
+    """Answers with the last message; fails on messages containing 'fail'."""
+
+    delay: float = 0.0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+    def _answer(self, messages: list[BaseMessage]) -> ChatResult:
+        content = messages[-1].content
+        if "fail" in content:
+            raise RuntimeError(f"cannot answer {content}")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"echo: {content}"))])
+
+    def _generate(self, messages: list[BaseMessage], stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        return self._answer(messages)
+
+    async def _agenerate(self, messages: list[BaseMessage], stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._answer(messages)
+        finally:
+            self.in_flight -= 1
+
+
+def _conversation(question: str) -> Conversation:
+    conversation = Conversation.create()
+    conversation.insert_message_at_end(question)
+    return conversation
+
+
+def test_acall_llm_matches_call_llm() -> None:
+    model = EchoChatModel()
+    conversation = _conversation("hello")
+
+    assert asyncio.run(conversation.acall_llm(model)) == conversation.call_llm(model) == "echo: hello"
+    assert asyncio.run(_conversation("fail").acall_llm(model)).startswith("err: ")
+
+
+def test_batch_maps_results_and_errors_to_conversations_under_concurrency_limit() -> None:
+    model = EchoChatModel(delay=0.01)
+    conversations = [_conversation(f"q{i}") for i in range(10)] + [_conversation("fail")]
+
+    results = asyncio.run(acall_llm_batch(conversations, model, max_concurrency=3))
+
+    assert [result.conversation for result in results] == conversations
+    assert [result.content for result in results[:10]] == [f"echo: q{i}" for i in range(10)]
+    assert not results[10].ok
+    assert results[10].error == "RuntimeError: cannot answer fail"
+    assert model.max_in_flight == 3
+    assert call_llm_batch(conversations[:2], model)[1].content == "echo: q1"
+
+
+def test_stream_llm_yields_chunks_records_metrics_and_appends_response() -> None:
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="SELECT id FROM users")]))
+    conversation = _conversation("question")
+
+    chunks = list(conversation.stream_llm(model, append_response=True))
+    metrics = conversation.last_stream_metrics
+
+    assert "".join(chunks) == "SELECT id FROM users"
+    assert len(chunks) > 1
+    assert metrics.completed and metrics.chunks == len(chunks)
+    assert 0 <= metrics.time_to_first_token <= metrics.latency
+    assert conversation.messages[-1].content == "SELECT id FROM users"
+
+
+def test_astream_llm_closed_early_is_not_appended() -> None:
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="one two three four")]))
+    conversation = _conversation("question")
+
+    async def first_chunk() -> str:
+        stream = conversation.astream_llm(model, append_response=True)
+        chunk = await stream.__anext__()
+        await stream.aclose()
+        return chunk
+
+    assert asyncio.run(first_chunk()) == "one"
+    assert not conversation.last_stream_metrics.completed
+    assert conversation.messages[-1].content == "question"
@@ -0,0 +1,156 @@
+import re
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.core.rel_schema_man import RelSchemaMan
+from edurel.llm.datagen_orchestrator import LevelDataGenerator
+from edurel.syntax.rel_ast import Column, DataList, ForeignKey, RelSchema, Table
+
+
+class TableChatModel(BaseChatModel):
+    """Answers a table request with canned SQL and records the prompts it saw."""
+
+    responses: dict[str, str] = {}
+    prompts: list[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "table"
+
+    def _generate(self, messages: list[BaseMessage], stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        prompt = messages[-1].content
+        self.prompts.append(prompt)
+        tablename = re.search(r"for the table '(\w+)'", prompt).group(1)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.responses[tablename]))])
+
+
+def _shop_schema() -> RelSchema:
+    return RelSchema(
+        tables=[
+            Table(
+                tablename="orders",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="customer_id", type="INTEGER"),
+                    Column(columnname="status", type="INTEGER"),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(sourcecolumns=["customer_id"], targettable="customer", targetcolumns=["id"]),
+                    ForeignKey(sourcecolumns=["status"], targettable="status_codes", targetcolumns=["ID"]),
+                ],
+            ),
+            Table(
+                tablename="customer",
+                columns=[Column(columnname="id", type="INTEGER"), Column(columnname="name", type="VARCHAR(20)")],
+                primary_key=["id"],
+            ),
+            Table(
+                tablename="product",
+                columns=[Column(columnname="id", type="INTEGER"), Column(columnname="title", type="TEXT")],
+                primary_key=["id"],
+            ),
+            Table(
+                tablename="status_codes",
+                columns=[
+                    Column(columnname="ID", type="INTEGER"),
+                    Column(columnname="Description", type="VARCHAR(255)"),
+                    Column(columnname="IsValid", type="BOOLEAN"),
+                    Column(columnname="SortOrder", type="INTEGER"),
+                ],
+                primary_key=["ID"],
+            ),
+        ],
+        datalists=[DataList(tablename="status_codes", values=["Open", "Closed"])],
+    )
+
+
+def test_levels_group_independent_tables_and_skip_datalists() -> None:
+    generator = LevelDataGenerator(_shop_schema(), TableChatModel())
+
+    assert [[table.tablename for table in level] for level in generator.levels()] == [
+        ["customer", "product"],
+        ["orders"],
+    ]
+
+
+def test_generate_loads_levels_and_passes_only_referenced_keys() -> None:
+    model = TableChatModel(
+        responses={
+            "customer": "```sql\nINSERT INTO customer VALUES (1, 'Ann');\nINSERT INTO customer VALUES (2, 'Bob');\n```",
+            "product": "INSERT INTO product (id, title) VALUES (1, 'Pen'), (2, 'Ink');",
+            "orders": "```sql\nINSERT INTO orders VALUES (10, 2, 1), (11, 1, 2);\n```",
+        },
+        prompts=[],
+    )
+    db = DuckDbMan.fromMem("datagen")
+    try:
+        schema_man = RelSchemaMan.fromAST(_shop_schema())
+        schema_man.materialize(db)
+
+        report = LevelDataGenerator(schema_man.get_ast(), model, rows=2).generate(db)
+
+        assert report.ok
+        assert [(result.tablename, result.level, result.rows) for result in report.results] == [
+            ("customer", 1, 2),
+            ("product", 1, 2),
+            ("orders", 2, 2),
+        ]
+        assert report.tokens_sent > 0
+        orders_prompt = next(prompt for prompt in model.prompts if "'orders'" in prompt)
+        assert "customer(id): 1, 2" in orders_prompt
+        assert "status_codes(ID): 1, 2" in orders_prompt
+        assert "product" not in orders_prompt
+        assert db.con.execute("SELECT count(*) FROM orders").fetchone() == (2,)
+    finally:
+        db.close()
+
+
+def test_generate_reports_the_schema_level_of_each_table() -> None:
+    db = DuckDbMan.fromMem("datagen")
+    try:
+        schema_man = RelSchemaMan.fromAST(_shop_schema())
+        schema_man.materialize(db)
+
+        report = LevelDataGenerator(schema_man.get_ast(), TableChatModel(), rows={"orders": 1}).generate(db)
+
+        assert [(result.tablename, result.level) for result in report.results] == [("orders", 2)]
+    finally:
+        db.close()
+
+
+def test_generate_reports_rejected_rows_and_skips_dependents() -> None:
+    model = TableChatModel(
+        responses={
+            "customer": "INSERT INTO customer VALUES ('one', 'Ann'), (NULL, 'Bob');",
+            "product": "INSERT INTO product VALUES (1, 'Pen'), (1, 'Duplicate');\nDELETE FROM product;",
+            "orders": "INSERT INTO orders VALUES (10, 1, 1);",
+        },
+        prompts=[],
+    )
+    db = DuckDbMan.fromMem("datagen")
+    try:
+        schema_man = RelSchemaMan.fromAST(_shop_schema())
+        schema_man.materialize(db)
+
+        report = LevelDataGenerator(schema_man.get_ast(), model, rows=2).generate(db)
+
+        results = {result.tablename: result for result in report.results}
+        assert [rejected.reason for rejected in results["customer"].rejected] == [
+            "Value 'one' is not a valid INTEGER for column 'id'.",
+            "Column 'id' must not be NULL.",
+        ]
+        assert results["product"].rows == 1
+        assert [rejected.reason for rejected in results["product"].rejected] == [
+            "Duplicate primary key (id) within the script.",
+            "Only INSERT statements can be ingested.",
+        ]
+        assert results["orders"].error == "Skipped: referenced table 'customer' has no rows."
+        assert not report.ok
+        assert list(report.to_df()["rejected"]) == [2, 2, 0]
+    finally:
+        db.close()
@@ -1,4 +1,11 @@
-from edurel.core.duckdb_man import DuckDbMan
+import json
+
+import pandas as pd
+import pytest
+
+from edurel.core.duckdb_man import DuckDbCursorPool, DuckDbMan
+from edurel.core.duckdb_plan import QueryCostPolicy
+from edurel.core.duckdb_profile import aggregate_profiles, parse_profile
 
 
 def test_export_data_as_insert_statements_exports_rows_with_sql_literals() -> None:
@@ -66,3 +73,236 @@ def test_export_data_as_insert_statements_preserves_requested_table_order() -> N
         )
     finally:
         db.close()
+
+
+def test_sql_timeout_interrupts_long_running_query() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        with pytest.raises(TimeoutError, match="time limit of 0.2 seconds"):
+            db.sql_df("SELECT count(*) FROM range(100000) a, range(100000) b", timeout=0.2)
+
+        assert db.sql_df("SELECT 42 AS answer", timeout=5)["answer"].tolist() == [42]
+        assert db.sql_nx(
+            "SELECT count(*) FROM range(100000) a, range(100000) b", timeout=0.2
+        ).startswith("err: Query exceeded the time limit")
+    finally:
+        db.close()
+
+
+def test_sql_max_rows_rejects_large_results_and_set_limits_applies_defaults() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        assert len(db.sql_df("SELECT * FROM range(5)", max_rows=5)) == 5
+        with pytest.raises(ValueError, match="exceeds the limit of 4 rows"):
+            db.sql_df("SELECT * FROM range(5)", max_rows=4)
+
+        db.set_limits(max_rows=3, memory_limit="1GB", threads=1)
+
+        with pytest.raises(ValueError, match="exceeds the limit of 3 rows"):
+            db.sql("SELECT * FROM range(1000000000)")
+        assert db.sql_df("SELECT current_setting('threads') AS threads")["threads"].tolist() == [1]
+        assert len(db.sql_df("SELECT * FROM range(10)", max_rows=10)) == 10
+    finally:
+        db.close()
+
+
+def test_sql_max_bytes_stops_fetching_large_results() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        small = db.sql_df("SELECT range AS n FROM range(5)", max_bytes=1000)
+
+        assert small["n"].tolist() == [0, 1, 2, 3, 4]
+        assert db.sql_df("SELECT 1 AS n WHERE false", max_bytes=1000).columns.tolist() == ["n"]
+        with pytest.raises(ValueError, match="exceeds the limit of 1000 bytes"):
+            db.sql_df("SELECT range AS n, repeat('x', 100) AS s FROM range(1000000000)", max_bytes=1000)
+
+        db.set_limits(max_bytes=1000)
+
+        assert db.sql_nx("SELECT * FROM range(100000)").startswith("err: Query result exceeds the limit")
+        assert db.cursor().sql("SELECT 42 AS answer").count("42") == 1
+    finally:
+        db.close()
+
+
+def test_preview_renders_first_rows_and_reports_truncation() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        db.execute("CREATE TABLE numbers AS SELECT range AS n FROM range(1000)")
+
+        preview = db.sql("SELECT n FROM numbers ORDER BY n", preview_rows=3)
+        counted = db.preview("SELECT n FROM numbers ORDER BY n", rows=3, exact_count=True)
+        complete = db.preview("SELECT n FROM numbers WHERE n < 3", rows=3)
+
+        assert preview.endswith("(first 3 rows shown, more rows exist)\n")
+        assert "│     2 │" in preview
+        assert "│     3 │" not in preview
+        assert counted.endswith("(3 of 1000 rows shown)\n")
+        assert "│     2 │" in complete
+        assert "rows shown" not in complete
+        assert db.sql_nx("SELECT * FROM missing", preview_rows=3).startswith("err: ")
+    finally:
+        db.close()
+
+
+def test_estimate_parses_plan_and_cost_policy_refuses_cross_products() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        db.execute("CREATE TABLE a AS SELECT range AS x FROM range(1000)")
+        db.execute("CREATE TABLE b AS SELECT range AS y FROM range(500)")
+
+        join_plan = db.estimate("SELECT * FROM a JOIN b ON x = y")
+        cross_plan = db.estimate("SELECT * FROM a, b")
+
+        assert "HASH_JOIN" in [node.name for node in join_plan.walk()]
+        assert join_plan.unbounded_cross_products() == []
+        assert cross_plan.max_cardinality == 500000
+        assert QueryCostPolicy().check(cross_plan) == [
+            "Cross product of 1000 x 500 rows; add a join condition."
+        ]
+
+        db.set_limits(cost_policy=QueryCostPolicy(max_cardinality=10000))
+
+        assert len(db.sql_df("SELECT * FROM a JOIN b ON x = y")) == 500
+        assert len(db.sql_df("SELECT * FROM a, (SELECT max(y) AS m FROM b) s")) == 1000
+        with pytest.raises(ValueError, match="Query refused by cost policy"):
+            db.sql_df("SELECT * FROM a, b")
+        with pytest.raises(ValueError, match="Query refused by cost policy"):
+            db.sql_df("WITH c AS (SELECT * FROM a, b) SELECT count(*) FROM c;")
+
+        assert "a" in db.sql("PRAGMA show_tables")
+        assert db.sql("SET threads = 2") == "None"
+        assert db.sql("CREATE TABLE c (z INTEGER); INSERT INTO c SELECT 1") == "None"
+        assert db.sql_df("SELECT * FROM c")["z"].tolist() == [1]
+    finally:
+        db.close()
+
+
+def test_estimate_refuses_anything_but_a_single_query() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        db.execute("CREATE TABLE t AS SELECT range AS x FROM range(10)")
+
+        for sql in ["SELECT 1; DROP TABLE t", "DROP TABLE t", "DELETE FROM t", "CREATE TABLE u (a INTEGER)"]:
+            with pytest.raises(ValueError, match="single query"):
+                db.estimate(sql)
+
+        assert db.get_tablenames() == ["t"]
+        assert db.con.execute("SELECT count(*) FROM t").fetchone() == (10,)
+        assert db.estimate("SHOW TABLES").name
+    finally:
+        db.close()
+
+
+def test_profile_returns_operator_tree_and_aggregates_runs() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        db.execute("CREATE TABLE a AS SELECT range AS x FROM range(10000)")
+        sql = "SELECT x % 10 AS k, count(*) FROM a GROUP BY k"
+
+        profiles = [db.profile(sql) for _ in range(3)]
+        operators = profiles[0].to_df()
+        summary = aggregate_profiles(profiles)
+
+        assert profiles[0].rows_returned == 10
+        assert profiles[0].hot_path()[0].name == "HASH_GROUP_BY"
+        assert operators.loc[operators["operator"] == "SEQ_SCAN", "rows_scanned"].tolist() == [10000]
+        assert "* HASH_GROUP_BY" in profiles[0].to_text()
+        assert summary.set_index("operator").loc["HASH_GROUP_BY", "count"] == 3
+    finally:
+        db.close()
+
+
+def test_registered_frames_are_queryable_through_fetch_rows() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        with db.registered({"my view": pd.DataFrame({"a": [2, 1]})}):
+            rows = db.fetch_rows(f"SELECT a FROM {db.quote_identifier('my view')} ORDER BY a")
+
+        assert rows == [(1,), (2,)]
+        assert db.quote_identifier("plain_name") == "plain_name"
+        assert db.fetch_rows("SELECT count(*) FROM duckdb_views() WHERE view_name = 'my view'") == [(0,)]
+    finally:
+        db.close()
+
+
+def test_parse_profile_reads_operator_peak_memory() -> None:
+    profile = parse_profile(
+        json.dumps(
+            {
+                "latency": 0.01,
+                "rows_returned": 3,
+                "system_peak_buffer_memory": 4096,
+                "children": [
+                    {
+                        "operator_name": "HASH_JOIN",
+                        "system_peak_buffer_memory": 2048,
+                        "children": [{"operator_name": "SEQ_SCAN", "children": []}],
+                    }
+                ],
+            }
+        ),
+        sql="SELECT 1",
+    )
+
+    assert profile.peak_memory == 4096
+    assert [node.peak_memory for _, node in profile.walk()] == [2048, 0]
+    assert profile.to_df()["peak_memory"].tolist() == [2048, 0]
+
+
+def test_fingerprint_ignores_row_order_and_names_but_not_multiplicity() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        db.execute("CREATE TABLE t AS SELECT range::INTEGER AS a, (range % 3)::VARCHAR AS b FROM range(10)")
+
+        base = db.fingerprint("SELECT a, b FROM t;")
+
+        assert (base.rows, base.columns) == (10, 2)
+        assert db.fingerprint("SELECT a::DECIMAL(10, 2) AS x, b FROM t ORDER BY b DESC") == base
+        assert db.fingerprint("SELECT b, a FROM t") != base
+        assert db.fingerprint("SELECT a, b FROM t UNION ALL SELECT 0, '0'") != base
+        with pytest.raises(ValueError, match="single read-only query"):
+            db.fingerprint("DELETE FROM t")
+        assert db.con.execute("SELECT count(*) FROM t").fetchone() == (10,)
+    finally:
+        db.close()
+
+
+def test_fingerprint_refuses_statements_smuggled_into_the_subquery() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        db.execute("CREATE TABLE t (a INTEGER); CREATE TABLE t2 (a INTEGER)")
+
+        for sql in [
+            "SELECT 1); INSERT INTO t2 VALUES (42); SELECT (1",
+            "SELECT 1) AS x; DROP TABLE t; SELECT * FROM (SELECT 1",
+            "SELECT 1; SELECT 2",
+        ]:
+            with pytest.raises(ValueError):
+                db.fingerprint(sql)
+
+        assert db.con.execute("SELECT count(*) FROM t2").fetchone() == (0,)
+        assert sorted(db.get_tablenames()) == ["t", "t2"]
+    finally:
+        db.close()
+
+
+def test_read_only_cursor_refuses_changes_and_transaction_control() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        db.execute("CREATE TABLE t AS SELECT range AS a FROM range(100)")
+        with DuckDbCursorPool(db, size=1) as pool, pool.acquire() as cursor:
+            for sql in ["DELETE FROM t RETURNING a", "COMMIT; DELETE FROM t; SELECT 1", "SELECT 1; DROP TABLE t"]:
+                with pytest.raises(ValueError, match="Read-only cursor"):
+                    cursor.sql(sql)
+            assert cursor.sql_nx("COMMIT; DELETE FROM t; SELECT 1").startswith("err: Read-only cursor")
+            with pytest.raises(ValueError):
+                cursor.insert_df("t", pd.DataFrame({"a": [1]}))
+            assert cursor.fingerprint("SELECT a FROM t").rows == 100
+
+            profile = cursor.profile("SELECT a % 10 AS k, count(*) FROM t GROUP BY k")
+            assert profile.rows_returned == 10
+            assert "HASH_GROUP_BY" in [node.name for _, node in profile.walk()]
+
+        assert db.con.execute("SELECT count(*) FROM t").fetchone() == (100,)
+    finally:
+        db.close()
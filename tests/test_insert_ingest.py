@@ -0,0 +1,158 @@
+from decimal import Decimal
+
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.core.insert_ingest import ingest_insert_script, split_statements
+from edurel.core.rel_schema_man import RelSchemaMan
+from edurel.syntax.rel_ast import Column, ForeignKey, RelSchema, Table
+
+
+def _shop_schema() -> RelSchema:
+    return RelSchema(
+        tables=[
+            Table(
+                tablename="orders",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="customer_id", type="SMALLINT"),
+                    Column(columnname="total", type="DECIMAL(6, 2)", nullable=True),
+                    Column(columnname="placed", type="DATE"),
+                    Column(columnname="paid", type="BOOLEAN"),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(sourcecolumns=["customer_id"], targettable="customer", targetcolumns=["id"])
+                ],
+            ),
+            Table(
+                tablename="customer",
+                columns=[Column(columnname="id", type="SMALLINT"), Column(columnname="name", type="VARCHAR(5)")],
+                primary_key=["id"],
+            ),
+        ]
+    )
+
+
+def test_split_statements_ignores_semicolons_in_literals() -> None:
+    assert split_statements("INSERT INTO t VALUES ('a;b'); -- x;\nINSERT INTO t VALUES (2);") == [
+        "INSERT INTO t VALUES ('a;b')",
+        "-- x;\nINSERT INTO t VALUES (2)",
+    ]
+
+
+def test_ingest_loads_valid_rows_in_dependency_order_and_reports_the_rest() -> None:
+    db = DuckDbMan.fromMem("ingest")
+    try:
+        schema_man = RelSchemaMan.fromAST(_shop_schema())
+        schema_man.materialize(db)
+        db.execute("INSERT INTO customer VALUES (9, 'Old')")
+
+        report = ingest_insert_script(
+            db,
+            schema_man.get_ast(),
+            """
+            INSERT INTO orders VALUES
+              (1, 1, 9.99, '2024-01-02', TRUE),
+              (2, 3, 1, '2024-01-02', 'f'),
+              (3, 2, 123456.1, '2024-01-02', FALSE),
+              (4, 1, NULL, 'yesterday', TRUE),
+              (5, 2, -3.5, DATE '2024-02-03', 0),
+              (6, 1, NOW(), '2024-01-02', TRUE);
+            INSERT INTO customer (id, name) VALUES (1, 'Ann'), (2, 'Bob'), (2, 'Dup'), (40000, 'Big'), (9, 'Again');
+            INSERT INTO customer VALUES (4 'x');
+            INSERT INTO customer (id, nickname) VALUES (5, 'Eve');
+            """,
+        )
+
+        assert report.inserted == {"customer": 2, "orders": 2}
+        assert [(rejected.statement, rejected.row, rejected.reason) for rejected in report.rejected] == [
+            (1, 2, "Foreign key (customer_id) references a missing row of 'customer'."),
+            (1, 3, "Value 123456.1 has too many digits for DECIMAL(6, 2) column 'total'."),
+            (1, 4, "Value 'yesterday' is not a valid DATE for column 'placed'."),
+            (1, 6, "Unsupported value 'CURRENT_TIMESTAMP'; only literals can be ingested."),
+            (2, 3, "Duplicate primary key (id) within the script."),
+            (2, 4, "Value 40000 is out of range for SMALLINT column 'id'."),
+            (2, 5, "Primary key (id) already exists in 'customer'."),
+            (3, None, report.rejected[7].reason),
+            (4, None, "Unknown column 'nickname' in table 'customer'."),
+        ]
+        assert report.rejected[7].reason.startswith("SQL validation failed.")
+        assert report.rejected[0].values == ("2", "3", "1", "'2024-01-02'", "'f'")
+        assert db.con.execute("SELECT id, total, placed::VARCHAR, paid FROM orders ORDER BY id").fetchall() == [
+            (1, Decimal("9.99"), "2024-01-02", True),
+            (5, Decimal("-3.50"), "2024-02-03", False),
+        ]
+        assert len(report.rejected_df()) == 9
+    finally:
+        db.close()
+
+
+def test_ingest_checks_cycle_and_self_references_against_script_rows() -> None:
+    schema = RelSchema(
+        tables=[
+            Table(
+                tablename="employee",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="manager_id", type="INTEGER", nullable=True),
+                    Column(columnname="dept_id", type="INTEGER", nullable=True),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(sourcecolumns=["manager_id"], targettable="employee", targetcolumns=["id"]),
+                    ForeignKey(sourcecolumns=["dept_id"], targettable="dept", targetcolumns=["id"]),
+                ],
+            ),
+            Table(
+                tablename="dept",
+                columns=[Column(columnname="id", type="INTEGER"), Column(columnname="head_id", type="INTEGER")],
+                primary_key=["id"],
+                foreign_keys=[ForeignKey(sourcecolumns=["head_id"], targettable="employee", targetcolumns=["id"])],
+            ),
+        ]
+    )
+    db = DuckDbMan.fromMem("ingest")
+    try:
+        RelSchemaMan.fromAST(schema).materialize(db)
+
+        report = ingest_insert_script(
+            db,
+            schema,
+            """
+            INSERT INTO employee VALUES (1, NULL, 10), (2, 1, 10), (3, 7, NULL), (4, 3, NULL), (5, 1, 11);
+            INSERT INTO dept VALUES (10, 2), (11, 8);
+            """,
+        )
+
+        assert report.inserted == {"dept": 1, "employee": 2}
+        assert [(rejected.statement, rejected.row, rejected.reason) for rejected in report.rejected] == [
+            (1, 3, "Foreign key (manager_id) references a missing row of 'employee'."),
+            (1, 4, "Foreign key (manager_id) references a missing row of 'employee'."),
+            (1, 5, "Foreign key (dept_id) references a missing row of 'dept'."),
+            (2, 2, "Foreign key (head_id) references a missing row of 'employee'."),
+        ]
+    finally:
+        db.close()
+
+
+def test_ingest_rejects_rows_refused_by_database_constraints() -> None:
+    db = DuckDbMan.fromMem("ingest")
+    try:
+        schema_man = RelSchemaMan.fromAST(_shop_schema())
+        schema_man.materialize(db)
+        db.execute("CREATE UNIQUE INDEX customer_name ON customer (name)")
+
+        report = ingest_insert_script(
+            db,
+            schema_man.get_ast(),
+            """
+            INSERT INTO customer VALUES (1, 'Ann'), (2, 'Ann');
+            INSERT INTO orders VALUES (1, 1, NULL, '2024-01-02', TRUE);
+            """,
+        )
+
+        assert report.inserted == {"customer": 0, "orders": 0}
+        assert [(rejected.statement, rejected.row) for rejected in report.rejected] == [(1, 1), (1, 2), (2, 1)]
+        assert report.rejected[0].reason.startswith("Rejected by the database: Constraint Error")
+        assert db.con.execute("SELECT count(*) FROM customer").fetchone() == (0,)
+    finally:
+        db.close()
@@ -0,0 +1,69 @@
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.core.rel_schema_man import RelSchemaMan
+from edurel.utils.instrument import (
+    _NULL_SPAN,
+    SpanCollector,
+    SpanRecord,
+    add_span_callback,
+    remove_span_callback,
+    span,
+)
+from edurel.utils.sql import transpile_postgres_sql
+
+
+YAML_SCHEMA = """
+tables:
+  - tablename: users
+    columns:
+      - columnname: id
+        type: INTEGER
+    primary_key:
+      - id
+"""
+
+
+def test_span_is_a_shared_no_op_without_callbacks() -> None:
+    assert span("anything", detail=1) is _NULL_SPAN
+
+
+def test_collector_records_pipeline_stages_and_histograms() -> None:
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        with SpanCollector(buckets=(0.001, 1.0)) as collector:
+            manager = RelSchemaMan.fromStr(YAML_SCHEMA)
+            manager.get_sql()
+            manager.materialize(db)
+            db.sql("SELECT * FROM users")
+            db.sql_nx("SELECT * FROM missing")
+            transpile_postgres_sql("SELECT 1", "duckdb")
+
+        summary = collector.summary().set_index("stage")
+        histogram = collector.histogram("duckdb.query")
+
+        assert {"yaml.parse", "rel.validate_ast", "rel.translate", "duckdb.query", "sql.transpile"} <= set(
+            summary.index
+        )
+        assert summary.loc["duckdb.query", "count"] == 2
+        assert summary.loc["duckdb.query", "errors"] == 1
+        assert [bound for bound, _ in histogram] == [0.001, 1.0, float("inf")]
+        assert sum(count for _, count in histogram) == 2
+        assert "duckdb.query: 2 calls" in collector.to_text()
+
+        db.sql("SELECT 1")
+        assert collector.summary().loc[lambda df: df["stage"] == "duckdb.query", "count"].item() == 2
+    finally:
+        db.close()
+
+
+def test_span_passes_attributes_to_callbacks() -> None:
+    records: list[SpanRecord] = []
+    add_span_callback(records.append)
+    try:
+        with span("custom.stage", size=3):
+            pass
+    finally:
+        remove_span_callback(records.append)
+
+    assert [(record.stage, record.attributes, record.error) for record in records] == [
+        ("custom.stage", {"size": 3}, None)
+    ]
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel, GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from edurel.llm.conversation_base import Conversation, acall_llm_batch
+from edurel.llm.llm_cache import LlmResponseCache, cache_key
+
+
+def _conversation(question: str) -> Conversation:
+    conversation = Conversation.create()
+    conversation.set_system_prompt("You write SQL.")
+    conversation.insert_message_at_end(question)
+    return conversation
+
+
+def test_call_llm_serves_repeated_prompts_from_cache_across_instances(tmp_path) -> None:
+    path = tmp_path / "llm" / "cache.sqlite"
+    model = FakeListChatModel(responses=["SELECT 1", "SELECT 2"])
+
+    cache = LlmResponseCache(path)
+    first = _conversation("q").call_llm(model, cache=cache)
+    cache.close()
+    cache = LlmResponseCache(path)
+    second = _conversation("q").call_llm(model, cache=cache)
+    other = _conversation("other").call_llm(model, cache=cache)
+
+    assert (first, second, other) == ("SELECT 1", "SELECT 1", "SELECT 2")
+    assert len(cache) == 2
+    assert cache_key(model, _conversation("q").messages) != cache_key(
+        FakeListChatModel(responses=["x"]), _conversation("q").messages
+    )
+    cache.close()
+
+
+def test_read_only_replay_never_calls_model_and_raises_on_miss(tmp_path) -> None:
+    path = tmp_path / "cache.sqlite"
+    recorder = LlmResponseCache(path)
+    _conversation("q").call_llm(FakeListChatModel(responses=["SELECT 1"]), cache=recorder)
+    recorder.close()
+
+    replay = LlmResponseCache(path, read_only=True)
+    model = FakeListChatModel(responses=["SELECT 1"])
+
+    assert _conversation("q").call_llm(model, cache=replay) == "SELECT 1"
+    assert _conversation("unknown").call_llm(model, cache=replay).startswith("err: No cached response")
+    assert asyncio.run(_conversation("unknown").acall_llm(model, cache=replay)).startswith("err: ")
+    results = asyncio.run(
+        acall_llm_batch([_conversation("q"), _conversation("unknown")], model, cache=replay)
+    )
+    assert results[0].content == "SELECT 1"
+    assert results[1].error.startswith("LookupError")
+    replay.close()
+
+
+def test_content_blocks_are_cached_and_returned_as_text(tmp_path) -> None:
+    cache = LlmResponseCache(tmp_path / "cache.sqlite")
+    model = GenericFakeChatModel(messages=iter([AIMessage(content=[{"type": "text", "text": "SELECT 1"}])]))
+    blocks = Conversation.create()
+    blocks.set_system_prompt("You write SQL.")
+    blocks.insert_message_at_end(HumanMessage(content=[{"type": "text", "text": "q"}]))
+
+    assert blocks.call_llm(model, cache=cache) == "SELECT 1"
+    assert cache_key(model, blocks.messages) == cache_key(model, _conversation("q").messages)
+    assert _conversation("q").call_llm(model, cache=cache) == "SELECT 1"
+    cache.close()
+
+
+def test_ttl_and_size_eviction(tmp_path) -> None:
+    model = FakeListChatModel(responses=["a", "b", "c", "d"])
+    cache = LlmResponseCache(tmp_path / "cache.sqlite", max_entries=2)
+    for question in ["q1", "q2", "q3"]:
+        _conversation(question).call_llm(model, cache=cache)
+
+    assert len(cache) == 2
+    assert cache.get(model, _conversation("q1").messages) is None
+    assert cache.get(model, _conversation("q3").messages) == "c"
+
+    cache.ttl = 0.01
+    time.sleep(0.02)
+    assert cache.get(model, _conversation("q3").messages) is None
+    cache.close()
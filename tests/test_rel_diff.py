@@ -0,0 +1,223 @@
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.core.rel_schema_man import RelSchemaMan
+from edurel.syntax.rel_ast import Column, DataList, ForeignKey, RelSchema, Table
+from edurel.translation.rel_diff import diff_ast, migration_sql
+
+
+def _status_codes_table() -> Table:
+    return Table(
+        tablename="status_codes",
+        columns=[
+            Column(columnname="ID", type="INTEGER"),
+            Column(columnname="Description", type="TEXT"),
+            Column(columnname="IsValid", type="INTEGER"),
+            Column(columnname="SortOrder", type="INTEGER"),
+        ],
+        primary_key=["ID"],
+    )
+
+
+def _old_schema() -> RelSchema:
+    return RelSchema(
+        tables=[
+            _status_codes_table(),
+            Table(
+                tablename="users",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="email", type="VARCHAR(100)"),
+                    Column(columnname="legacy", type="TEXT", nullable=True),
+                ],
+                primary_key=["id"],
+            ),
+            Table(
+                tablename="audit",
+                columns=[Column(columnname="id", type="INTEGER")],
+                primary_key=["id"],
+            ),
+        ],
+        datalists=[DataList(tablename="status_codes", values=["Open", "Closed", "Void"])],
+    )
+
+
+def _new_schema() -> RelSchema:
+    return RelSchema(
+        tables=[
+            _status_codes_table(),
+            Table(
+                tablename="users",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="email", type="VARCHAR(255)", nullable=True),
+                    Column(columnname="status_id", type="INTEGER", nullable=True),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(
+                        fkname="fk_users_status",
+                        sourcecolumns=["status_id"],
+                        targettable="status_codes",
+                        targetcolumns=["ID"],
+                    )
+                ],
+            ),
+            Table(
+                tablename="orders",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="user_id", type="INTEGER"),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(
+                        sourcecolumns=["user_id"],
+                        targettable="users",
+                        targetcolumns=["id"],
+                    )
+                ],
+            ),
+        ],
+        datalists=[DataList(tablename="status_codes", values=["Open", "Done"])],
+    )
+
+
+def test_diff_ast_reports_table_column_key_and_datalist_changes() -> None:
+    schema_diff = diff_ast(_old_schema(), _new_schema())
+
+    assert [table.tablename for table in schema_diff.added_tables] == ["orders"]
+    assert [table.tablename for table in schema_diff.removed_tables] == ["audit"]
+    assert len(schema_diff.changed_tables) == 1
+
+    users_diff = schema_diff.changed_tables[0]
+    assert users_diff.tablename == "users"
+    assert [column.columnname for column in users_diff.added_columns] == ["status_id"]
+    assert [column.columnname for column in users_diff.removed_columns] == ["legacy"]
+    assert [change.new.columnname for change in users_diff.changed_columns] == ["email"]
+    assert not users_diff.primary_key_changed
+    assert [fk.fkname for fk in users_diff.added_foreign_keys] == ["fk_users_status"]
+    assert users_diff.removed_foreign_keys == []
+
+    assert len(schema_diff.changed_datalists) == 1
+    assert schema_diff.changed_datalists[0].old_values == ["Open", "Closed", "Void"]
+    assert schema_diff.changed_datalists[0].new_values == ["Open", "Done"]
+
+
+def test_diff_ast_of_identical_schemas_is_empty() -> None:
+    schema_diff = diff_ast(_old_schema(), _old_schema())
+
+    assert schema_diff.is_empty()
+    assert str(schema_diff) == "No changes"
+
+
+def test_migration_sql_for_postgres_emits_minimal_statements() -> None:
+    assert migration_sql(diff_ast(_old_schema(), _new_schema()), dialect="postgres") == (
+        "DROP TABLE audit;\n"
+        "ALTER TABLE users ADD COLUMN status_id INTEGER;\n"
+        "ALTER TABLE users ALTER COLUMN email TYPE VARCHAR(255);\n"
+        "ALTER TABLE users ALTER COLUMN email DROP NOT NULL;\n"
+        "ALTER TABLE users DROP COLUMN legacy;\n"
+        "CREATE TABLE orders (\n"
+        "  id INTEGER NOT NULL,\n"
+        "  user_id INTEGER NOT NULL,\n"
+        "  PRIMARY KEY (id),\n"
+        "  FOREIGN KEY (user_id) REFERENCES users (id)\n"
+        ");\n"
+        "ALTER TABLE users ADD CONSTRAINT fk_users_status FOREIGN KEY (status_id) "
+        "REFERENCES status_codes (ID);\n"
+        "UPDATE status_codes SET Description = 'Done' WHERE ID = 2;\n"
+        "DELETE FROM status_codes WHERE ID > 2;"
+    )
+
+
+def test_migration_sql_upgrades_duckdb_database_in_place() -> None:
+    old_man = RelSchemaMan.fromAST(_old_schema())
+    new_man = RelSchemaMan.fromAST(_new_schema())
+
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        old_man.materialize(db)
+        db.execute("INSERT INTO users VALUES (1, 'a@example.org', NULL)")
+
+        migration = old_man.get_migration_sql(new_man, dialect="duckdb")
+        assert (
+            "-- not supported by duckdb, migrate manually: ALTER TABLE users ADD CONSTRAINT "
+            "fk_users_status FOREIGN KEY (status_id) REFERENCES status_codes (ID);"
+        ) in migration
+        db.execute(migration)
+
+        assert sorted(db.get_tablenames()) == ["orders", "status_codes", "users"]
+        assert db.get_columns("users") == [
+            {"columnname": "id", "type": "INTEGER", "nullable": False},
+            {"columnname": "email", "type": "VARCHAR", "nullable": True},
+            {"columnname": "status_id", "type": "INTEGER", "nullable": True},
+        ]
+        assert db.con.execute("SELECT * FROM users").fetchall() == [(1, "a@example.org", None)]
+        assert db.con.execute(
+            "SELECT ID, Description FROM status_codes ORDER BY ID"
+        ).fetchall() == [(1, "Open"), (2, "Done")]
+    finally:
+        db.close()
+
+
+def test_migration_sql_sets_not_null_on_populated_table() -> None:
+    def schema(columns: list[Column]) -> RelSchema:
+        return RelSchema(
+            tables=[
+                Table(
+                    tablename="items",
+                    columns=[Column(columnname="id", type="INTEGER"), *columns],
+                    primary_key=["id"],
+                )
+            ]
+        )
+
+    old_schema = schema([Column(columnname="note", type="TEXT", nullable=True)])
+    new_schema = schema(
+        [
+            Column(columnname="note", type="TEXT"),
+            Column(columnname="amount", type="DECIMAL(8, 2)"),
+            Column(columnname="token", type="UUID"),
+        ]
+    )
+
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        RelSchemaMan.fromAST(old_schema).materialize(db)
+        db.execute("INSERT INTO items VALUES (1, NULL), (2, 'kept')")
+
+        migration = migration_sql(diff_ast(old_schema, new_schema), dialect="duckdb")
+        assert "-- no fill value for UUID, replace NULLs in items.token and migrate manually: " in migration
+        assert "-- NULLs in items.note become '' before SET NOT NULL; review the fill value\n" in migration
+        db.execute(migration)
+
+        assert db.con.execute("SELECT id, note, amount FROM items ORDER BY id").fetchall() == [
+            (1, "", 0),
+            (2, "kept", 0),
+        ]
+        assert [column["nullable"] for column in db.get_columns("items")] == [False, False, False, True]
+    finally:
+        db.close()
+
+
+def test_migration_sql_drops_primary_key_under_the_postgres_constraint_name() -> None:
+    def schema(tablename: str, primary_key: list[str]) -> RelSchema:
+        return RelSchema(
+            tables=[
+                Table(
+                    tablename=tablename,
+                    columns=[Column(columnname="id", type="INTEGER"), Column(columnname="code", type="TEXT")],
+                    primary_key=primary_key,
+                )
+            ]
+        )
+
+    plain = migration_sql(diff_ast(schema("Items", ["id"]), schema("Items", ["code"])), dialect="postgres")
+    quoted = migration_sql(
+        diff_ast(schema("Line Items", ["id"]), schema("Line Items", ["code"])), dialect="postgres"
+    )
+    long_name = "t" * 70
+    truncated = migration_sql(diff_ast(schema(long_name, ["id"]), schema(long_name, ["code"])), dialect="postgres")
+
+    assert "ALTER TABLE Items DROP CONSTRAINT items_pkey;" in plain
+    assert 'ALTER TABLE "Line Items" DROP CONSTRAINT "Line Items_pkey";' in quoted
+    assert f"DROP CONSTRAINT {'t' * 58}_pkey;" in truncated
@@ -1,6 +1,10 @@
 from textwrap import dedent
 
+import pytest
+
+from edurel.core.duckdb_man import DuckDbMan
 from edurel.core.rel_schema_man import RelSchemaMan
+from edurel.llm.token_budget import approx_token_count
 from edurel.syntax.rel_ast import Column, DataList, ForeignKey, RelSchema, Table
 from edurel.syntax.rel_yaml_schema import schema
 from edurel.utils.yaml import parse_yaml
@@ -172,6 +176,140 @@ def test_get_sql_generates_foreign_keys_in_alter_table_statements() -> None:
     ).strip()
 
 
+def test_get_sql_emits_verified_duckdb_ddl_with_inline_foreign_keys() -> None:
+    rel_schema = RelSchema(
+        tables=[
+            Table(
+                tablename="orders",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="user_id", type="INTEGER"),
+                    Column(columnname="total", type="FLOAT"),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(
+                        sourcecolumns=["user_id"],
+                        targettable="users",
+                        targetcolumns=["id"],
+                    )
+                ],
+            ),
+            Table(
+                tablename="users",
+                columns=[Column(columnname="id", type="INTEGER")],
+                primary_key=["id"],
+            ),
+        ]
+    )
+
+    manager = RelSchemaMan.fromAST(rel_schema)
+
+    assert manager.get_sql(dialect="duckdb") == manager.get_sql(fk_external=False, dialect="duckdb")
+    assert "ALTER TABLE orders\n  ADD FOREIGN KEY" in manager.get_sql(dialect="postgres")
+    assert manager.get_sql(
+        fk_external=False, dialect="duckdb", verify=True
+    ) == dedent(
+        """
+        CREATE TABLE users (
+          id INTEGER NOT NULL,
+          PRIMARY KEY (id)
+        );
+        CREATE TABLE orders (
+          id INTEGER NOT NULL,
+          user_id INTEGER NOT NULL,
+          total DOUBLE NOT NULL,
+          PRIMARY KEY (id),
+          FOREIGN KEY (user_id) REFERENCES users (id)
+        );
+        """
+    ).strip()
+
+
+def test_materialize_creates_tables_in_level_order_and_loads_datalists() -> None:
+    rel_schema = RelSchema(
+        tables=[
+            Table(
+                tablename="tickets",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="status_id", type="INTEGER"),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(
+                        sourcecolumns=["status_id"],
+                        targettable="status_codes",
+                        targetcolumns=["ID"],
+                    )
+                ],
+            ),
+            Table(
+                tablename="status_codes",
+                columns=[
+                    Column(columnname="ID", type="INTEGER"),
+                    Column(columnname="Description", type="VARCHAR(255)"),
+                    Column(columnname="IsValid", type="BOOLEAN"),
+                    Column(columnname="SortOrder", type="INTEGER"),
+                ],
+                primary_key=["ID"],
+            ),
+        ],
+        datalists=[DataList(tablename="status_codes", values=["Open", "Owner's Review"])],
+    )
+
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        RelSchemaMan.fromAST(rel_schema).materialize(db)
+
+        assert sorted(db.get_tablenames()) == ["status_codes", "tickets"]
+        assert db.get_foreign_keys("tickets") == [{"status_codes": [["status_id"], ["ID"]]}]
+        assert db.con.execute("SELECT * FROM status_codes ORDER BY ID").fetchall() == [
+            (1, "Open", True, 1),
+            (2, "Owner's Review", True, 2),
+        ]
+    finally:
+        db.close()
+
+
+def test_materialize_rolls_back_when_a_table_already_exists() -> None:
+    rel_schema = RelSchema(
+        tables=[
+            Table(
+                tablename="users",
+                columns=[Column(columnname="id", type="INTEGER")],
+                primary_key=["id"],
+            ),
+            Table(
+                tablename="orders",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="user_id", type="INTEGER"),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(
+                        sourcecolumns=["user_id"],
+                        targettable="users",
+                        targetcolumns=["id"],
+                    )
+                ],
+            ),
+        ]
+    )
+
+    db = DuckDbMan.fromMem("test_db")
+    try:
+        db.execute("CREATE TABLE orders (id INTEGER)")
+
+        with pytest.raises(Exception, match="orders"):
+            RelSchemaMan.fromAST(rel_schema).materialize(db)
+
+        assert db.get_tablenames() == ["orders"]
+    finally:
+        db.close()
+
+
 def test_get_mermaid_uses_requested_fk_connectors_and_strips_type_sizes() -> None:
     rel_schema = RelSchema(
         tables=[
@@ -296,3 +434,37 @@ def test_get_structure_emits_compact_prompt_friendly_lines() -> None:
         - fk: orders(user_id)->users(id)
         """
     ).strip()
+
+
+def test_get_prompt_schema_needs_far_fewer_tokens_than_yaml() -> None:
+    tables = [
+        Table(
+            tablename=f"table_{index}",
+            columns=[
+                Column(columnname="id", type="INTEGER"),
+                Column(columnname="name", type="VARCHAR(100)"),
+                Column(columnname="note", type="TEXT", nullable=True),
+                Column(columnname="amount", type="DECIMAL(10, 2)"),
+                Column(columnname="parent_id", type="INTEGER", nullable=True),
+            ],
+            primary_key=["id"],
+            foreign_keys=[
+                ForeignKey(
+                    fkname=f"fk_table_{index}_parent",
+                    sourcecolumns=["parent_id"],
+                    targettable=f"table_{index - 1}",
+                    targetcolumns=["id"],
+                )
+            ]
+            if index > 0
+            else [],
+        )
+        for index in range(300)
+    ]
+    manager = RelSchemaMan.fromAST(RelSchema(tables=tables))
+
+    yaml_tokens = approx_token_count(manager.get_yaml())
+    prompt_tokens = approx_token_count(manager.get_prompt_schema())
+
+    assert manager.get_prompt_schema().count("\n") == 300
+    assert prompt_tokens < 0.35 * yaml_tokens
@@ -0,0 +1,171 @@
+import pytest
+
+from edurel.core.rel_schema_man import RelSchemaMan
+from edurel.syntax.rel_ast import Column, ForeignKey, RelSchema, Table
+from edurel.syntax.rel_sql_check import RelSchemaIndex, check_sql_against_ast
+
+
+def _schema() -> RelSchema:
+    return RelSchema(
+        tables=[
+            Table(
+                tablename="users",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="email", type="TEXT"),
+                ],
+                primary_key=["id"],
+            ),
+            Table(
+                tablename="orders",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="user_id", type="INTEGER"),
+                    Column(columnname="total", type="DECIMAL(10, 2)"),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(
+                        fkname="fk_orders_users",
+                        sourcecolumns=["user_id"],
+                        targettable="users",
+                        targetcolumns=["id"],
+                    )
+                ],
+            ),
+        ],
+    )
+
+
+def test_check_accepts_query_following_foreign_keys() -> None:
+    check = check_sql_against_ast(
+        """
+        WITH big AS (SELECT user_id, SUM(total) AS amount FROM orders GROUP BY user_id)
+        SELECT u.Email, b.amount AS spent
+        FROM users u JOIN big b ON b.user_id = u.id
+        JOIN orders o ON o.user_id = u.id
+        WHERE EXISTS (SELECT 1 FROM orders x WHERE x.user_id = u.id)
+        ORDER BY spent
+        """,
+        _schema(),
+    )
+
+    assert check.ok
+    assert check.warnings == []
+
+
+def test_check_reports_unknown_tables_and_columns() -> None:
+    check = check_sql_against_ast(
+        "SELECT u.name, missing_col FROM users u JOIN orders o ON o.user_id = u.id",
+        _schema(),
+    )
+    unknown_table = check_sql_against_ast("SELECT p.id FROM payments p", _schema())
+
+    assert not check.ok
+    assert check.errors == [
+        "Unknown column 'name' in table 'users'.",
+        "Unknown column 'missing_col'.",
+    ]
+    assert unknown_table.errors == ["Unknown table 'payments'."]
+
+
+def test_check_resolves_subquery_columns_in_their_own_scope() -> None:
+    index = RelSchemaIndex(_schema())
+
+    for sql in [
+        "SELECT email FROM users WHERE id IN (SELECT user_id FROM orders)",
+        "SELECT email FROM users u WHERE EXISTS (SELECT 1 FROM orders WHERE user_id = u.id)",
+        "SELECT email, (SELECT SUM(total) FROM orders WHERE user_id = u.id) AS spent FROM users u",
+        "SELECT g FROM generate_series(1, 3) AS t(g)",
+    ]:
+        check = check_sql_against_ast(sql, index)
+        assert check.ok, (sql, check.errors)
+
+    wrong_scope = check_sql_against_ast("SELECT email FROM users WHERE total > (SELECT 1 FROM orders)", index)
+    correlated = check_sql_against_ast(
+        "SELECT email FROM users u WHERE EXISTS (SELECT 1 FROM orders WHERE user_idx = u.idd)", index
+    )
+
+    assert wrong_scope.errors == ["Unknown column 'total'."]
+    assert correlated.errors == ["Unknown column 'user_idx'.", "Unknown column 'idd' in table 'users'."]
+
+
+def test_check_resolves_insert_update_and_delete() -> None:
+    index = RelSchemaIndex(_schema())
+
+    update = check_sql_against_ast("UPDATE users SET nam = 1 WHERE idd = 2", index)
+    delete = check_sql_against_ast(
+        "DELETE FROM orders WHERE user_id IN (SELECT id FROM users WHERE email = orders.user_id::TEXT)", index
+    )
+    insert = check_sql_against_ast("INSERT INTO users (id, nam) SELECT idd FROM orders", index)
+    unknown_target = check_sql_against_ast("DELETE FROM payments WHERE id = 1", index)
+
+    assert update.errors == ["Unknown column 'nam' in table 'users'.", "Unknown column 'idd'."]
+    assert delete.ok
+    assert insert.errors == ["Unknown column 'nam' in table 'users'.", "Unknown column 'idd'."]
+    assert unknown_target.errors == ["Unknown table 'payments'."]
+
+
+def test_check_warns_on_non_foreign_key_join_and_cross_product() -> None:
+    index = RelSchemaIndex(_schema())
+
+    non_fk = check_sql_against_ast("SELECT * FROM users u JOIN orders o ON o.id = u.id", index)
+    cross = check_sql_against_ast("SELECT * FROM users, orders", index)
+
+    assert non_fk.ok
+    assert non_fk.warnings == ["Join condition 'o.id = u.id' does not follow a foreign key."]
+    assert cross.ok
+    assert cross.warnings == ["Join with 'orders' has no join condition (cross product)."]
+
+
+def test_check_treats_where_equalities_as_join_conditions() -> None:
+    index = RelSchemaIndex(_schema())
+
+    fk = check_sql_against_ast("SELECT * FROM users u, orders o WHERE o.user_id = u.id AND o.total > 1", index)
+    non_fk = check_sql_against_ast("SELECT * FROM users u, orders o WHERE o.id = u.id", index)
+    unqualified = check_sql_against_ast("SELECT * FROM users, orders WHERE user_id = email", index)
+
+    assert fk.ok
+    assert fk.warnings == []
+    assert non_fk.warnings == ["Join condition 'o.id = u.id' does not follow a foreign key."]
+    assert unqualified.warnings == ["Join condition 'user_id = email' does not follow a foreign key."]
+
+
+def test_check_expands_using_into_column_pairs() -> None:
+    index = RelSchemaIndex(_schema())
+
+    check = check_sql_against_ast("SELECT * FROM users JOIN orders USING (id)", index)
+
+    assert check.ok
+    assert check.warnings == ["Join condition 'USING (id) of 'orders'' does not follow a foreign key."]
+
+
+def test_check_matches_quoted_identifiers_exactly() -> None:
+    schema = _schema()
+    schema.tables[0].columns.append(Column(columnname="Email", type="TEXT"))
+    index = RelSchemaIndex(schema)
+
+    for sql in [
+        'SELECT "Email", email, EMAIL FROM users',
+        'SELECT u."Email" FROM "users" u',
+    ]:
+        check = check_sql_against_ast(sql, index)
+        assert check.ok, (sql, check.errors)
+
+    assert check_sql_against_ast('SELECT "EMAIL" FROM users', index).errors == ["Unknown column 'EMAIL'."]
+    assert check_sql_against_ast('SELECT id FROM "Users"', index).errors == ["Unknown table 'Users'."]
+
+
+def test_check_reports_unknown_alias_and_invalid_sql() -> None:
+    check = check_sql_against_ast("SELECT z.id FROM users u", _schema())
+
+    assert check.errors == ["Unknown table or alias 'z' in column 'z.id'."]
+    with pytest.raises(ValueError):
+        check_sql_against_ast("SELECT FROM WHERE", _schema())
+
+
+def test_rel_schema_man_check_sql() -> None:
+    manager = RelSchemaMan.fromAST(_schema())
+
+    assert manager.check_sql("SELECT email FROM users").ok
+    assert manager.check_sql("SELECT phone FROM users").errors == ["Unknown column 'phone'."]
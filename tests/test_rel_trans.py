@@ -1,5 +1,8 @@
+import pytest
+
 from edurel.syntax.rel_ast import Column, DataList, ForeignKey, RelSchema, Table
 from edurel.translation.rel_trans import (
+    PromptTranslationBuilder,
     RelSchemaLevelTranslationVisitor,
     RelSchemaTranslationBuilder,
     RelSchemaTranslationVisitor,
@@ -286,3 +289,170 @@ def test_sql_translation_builder_fk_internal_generates_datalist_insert_statement
         "INSERT INTO status_codes (ID, Description, IsValid, SortOrder) VALUES (1, 'Open', 1, 1);\n"
         "INSERT INTO status_codes (ID, Description, IsValid, SortOrder) VALUES (2, 'Closed', 1, 2);"
     )
+
+
+def test_sql_translation_builder_emits_sqlite_types_and_quoting() -> None:
+    rel_schema = RelSchema(
+        tables=[
+            Table(
+                tablename="order lines",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="label", type="VARCHAR(255)"),
+                    Column(columnname="price", type="DECIMAL(9, 2)"),
+                    Column(columnname="is open", type="BOOLEAN", nullable=True),
+                ],
+                primary_key=["id"],
+            )
+        ],
+        datalists=[DataList(tablename="order lines", values=["Open"])],
+    )
+
+    builder = SqlTranslationBuilderFkInternal(dialect="sqlite")
+    visitor = RelSchemaTranslationVisitor(builder)
+
+    visitor.visit(rel_schema)
+
+    assert builder.build() == (
+        'CREATE TABLE "order lines" (\n'
+        "  id INTEGER NOT NULL,\n"
+        "  label TEXT NOT NULL,\n"
+        "  price NUMERIC(9, 2) NOT NULL,\n"
+        '  "is open" INTEGER,\n'
+        "  PRIMARY KEY (id)\n"
+        ");\n"
+        'INSERT INTO "order lines" (ID, Description, IsValid, SortOrder) VALUES (1, \'Open\', 1, 1);'
+    )
+
+
+def test_sql_translation_builder_fk_external_emits_mysql_syntax() -> None:
+    rel_schema = RelSchema(
+        tables=[
+            Table(
+                tablename="users",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="created", type="TIMESTAMP"),
+                ],
+                primary_key=["id"],
+            ),
+            Table(
+                tablename="user orders",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="user_id", type="INTEGER"),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(
+                        fkname="fk_orders_users",
+                        sourcecolumns=["user_id"],
+                        targettable="users",
+                        targetcolumns=["id"],
+                    )
+                ],
+            ),
+        ]
+    )
+
+    builder = SqlTranslationBuilderFkExternal(dialect="mysql")
+    visitor = RelSchemaTranslationVisitor(builder)
+
+    visitor.visit(rel_schema)
+
+    assert builder.build() == (
+        "CREATE TABLE users (\n"
+        "  id INTEGER NOT NULL,\n"
+        "  created DATETIME NOT NULL,\n"
+        "  PRIMARY KEY (id)\n"
+        ");\n"
+        "CREATE TABLE `user orders` (\n"
+        "  id INTEGER NOT NULL,\n"
+        "  user_id INTEGER NOT NULL,\n"
+        "  PRIMARY KEY (id)\n"
+        ");\n"
+        "ALTER TABLE `user orders`\n"
+        "  ADD CONSTRAINT fk_orders_users FOREIGN KEY (user_id) REFERENCES users (id);"
+    )
+
+
+def test_sql_translation_builder_fk_external_rejects_dialects_without_alter_foreign_key() -> None:
+    rel_schema = RelSchema(
+        tables=[
+            Table(
+                tablename="orders",
+                columns=[Column(columnname="user_id", type="INTEGER")],
+                foreign_keys=[
+                    ForeignKey(
+                        sourcecolumns=["user_id"],
+                        targettable="users",
+                        targetcolumns=["id"],
+                    )
+                ],
+            )
+        ]
+    )
+
+    builder = SqlTranslationBuilderFkExternal(dialect="duckdb")
+    visitor = RelSchemaTranslationVisitor(builder)
+
+    with pytest.raises(ValueError, match="fk_external=False"):
+        visitor.visit(rel_schema)
+
+
+def test_sql_translation_builder_rejects_unknown_dialect() -> None:
+    with pytest.raises(ValueError, match="Unsupported SQL dialect 'oracle'"):
+        SqlTranslationBuilderFkInternal(dialect="oracle")
+
+
+def test_prompt_translation_builder_emits_one_line_per_table() -> None:
+    rel_schema = RelSchema(
+        tables=[
+            Table(
+                tablename="users",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="email", type="VARCHAR(100)", nullable=True),
+                    Column(columnname="status", type="INTEGER"),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(
+                        fkname="fk_users_status",
+                        sourcecolumns=["status"],
+                        targettable="status_codes",
+                        targetcolumns=["ID"],
+                    )
+                ],
+            ),
+            Table(
+                tablename="shipments",
+                columns=[
+                    Column(columnname="order_id", type="INTEGER"),
+                    Column(columnname="line_no", type="INTEGER"),
+                ],
+                primary_key=["order_id", "line_no"],
+                foreign_keys=[
+                    ForeignKey(
+                        fkname="fk_shipments_lines",
+                        sourcecolumns=["order_id", "line_no"],
+                        targettable="order_lines",
+                        targetcolumns=["order_id", "line_no"],
+                    )
+                ],
+            ),
+        ],
+        datalists=[DataList(tablename="status_codes", values=["Open", "Closed", "Void"])],
+    )
+
+    builder = PromptTranslationBuilder(max_datalist_values=2)
+    RelSchemaTranslationVisitor(builder).visit(rel_schema)
+
+    assert builder.build() == (
+        "# table(column TYPE); PK primary key, ? nullable, -> foreign key\n"
+        "users(id INTEGER PK, email VARCHAR(100)?, status INTEGER ->status_codes.ID)\n"
+        "shipments(order_id INTEGER PK, line_no INTEGER PK) "
+        "FK(order_id, line_no)->order_lines(order_id, line_no)\n"
+        "# datalists: Description values, ID = position\n"
+        "status_codes: Open | Closed | ... (3 values)"
+    )
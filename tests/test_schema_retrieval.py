@@ -0,0 +1,79 @@
+from edurel.llm.conversation_rel import SQLGenConversation
+from edurel.llm.schema_retrieval import SchemaRetrievalIndex, tokenize
+from edurel.syntax.rel_ast import Column, DataList, ForeignKey, RelSchema, Table
+
+
+def _table(tablename: str, columns: list[str], references: list[str] = ()) -> Table:
+    return Table(
+        tablename=tablename,
+        columns=[Column(columnname="id", type="INTEGER")]
+        + [Column(columnname=name, type="TEXT") for name in columns]
+        + [Column(columnname=f"{target}_id", type="INTEGER") for target in references],
+        primary_key=["id"],
+        foreign_keys=[
+            ForeignKey(
+                fkname=f"fk_{tablename}_{target}",
+                sourcecolumns=[f"{target}_id"],
+                targettable=target,
+                targetcolumns=["id"],
+            )
+            for target in references
+        ],
+    )
+
+
+def _schema() -> RelSchema:
+    return RelSchema(
+        tables=[
+            _table("customer", ["firstName", "city"]),
+            _table("orders", ["orderDate"], ["customer", "order_status"]),
+            _table("order_line", ["quantity"], ["orders", "product"]),
+            _table("product", ["productName", "price"]),
+            _table("order_status", ["Description"]),
+            _table("employee", ["salary"]),
+            _table("department", ["budget"]),
+        ],
+        datalists=[DataList(tablename="order_status", values=["Shipped", "Cancelled"])],
+    )
+
+
+def test_tokenize_splits_identifiers_and_normalizes_plurals() -> None:
+    assert tokenize("productName order_line CUSTOMERS") == ["product", "name", "order", "line", "customer"]
+    assert tokenize("How many of the orders") == ["order"]
+
+
+def test_search_ranks_tables_and_matches_datalist_values() -> None:
+    index = SchemaRetrievalIndex(_schema())
+
+    assert index.search("salary of employees")[0][0] == "employee"
+    assert index.search("cancelled")[0][0] == "order_status"
+    assert index.search("weather") == []
+
+
+def test_relevant_tables_include_join_paths() -> None:
+    index = SchemaRetrievalIndex(_schema())
+
+    tables = index.relevant_tables("Which customer bought a product with a high price?", k=2)
+    subschema = index.subschema("Which customer bought a product with a high price?", k=2)
+
+    assert tables.tables == ["customer", "orders", "order_line", "product"]
+    assert tables.matched
+    assert [fk.targettable for fk in subschema.tables[1].foreign_keys] == ["customer"]
+
+    fallback = index.relevant_tables("weather")
+
+    assert fallback.tables == ["customer", "orders", "order_line"]
+    assert not fallback.matched
+    assert index.relevant_tables("weather", k=0).tables == []
+
+
+def test_sqlgen_conversation_sends_only_relevant_subschema() -> None:
+    conversation = SQLGenConversation()
+    conversation.set_schema_index(_schema(), tables_per_question=1)
+
+    conversation.insert_question_message("Total budget of all departments?")
+
+    prompt = conversation.messages[-1].content
+    assert "department(id INTEGER PK, budget TEXT)" in prompt
+    assert "employee" not in prompt
+    assert "Total budget of all departments?" in prompt
@@ -0,0 +1,114 @@
+import re
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.llm.sql_eval import EvalCase, GoldResultCache, SqlEvalHarness
+
+
+class AnswerChatModel(BaseChatModel):
+    """Answers each question with the SQL stored for it; unknown questions fail."""
+
+    answers: dict[str, str] = {}
+
+    @property
+    def _llm_type(self) -> str:
+        return "answer"
+
+    def _generate(self, messages: list[BaseMessage], stop: Any = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        question = re.search(r"The user's question is:\n(.*)\n", messages[-1].content).group(1)
+        if question not in self.answers:
+            raise RuntimeError("no answer")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.answers[question]))])
+
+
+def _db() -> DuckDbMan:
+    db = DuckDbMan.fromMem("shop")
+    db.execute(
+        """
+        CREATE TABLE customer (id INTEGER PRIMARY KEY, name VARCHAR, city VARCHAR);
+        INSERT INTO customer VALUES (1, 'Ann', 'Graz'), (2, 'Bob', 'Wien'), (3, 'Cid', 'Graz');
+        """
+    )
+    return db
+
+
+def test_evaluate_compares_result_multisets_and_reports_errors() -> None:
+    cases = [
+        EvalCase("Names of customers in Graz", "SELECT name FROM customer WHERE city = 'Graz' ORDER BY name", "names"),
+        EvalCase("Average id", "SELECT avg(id) FROM customer", "avg"),
+        EvalCase("Customers per city", "SELECT city, count(*) FROM customer GROUP BY city", "per_city"),
+        EvalCase("All ids", "SELECT id FROM customer", "ids"),
+        EvalCase("Delete everything", "SELECT 1", "delete"),
+        EvalCase("Unanswerable", "SELECT 1", "unanswerable"),
+    ]
+    model = AnswerChatModel(
+        answers={
+            "Names of customers in Graz": "```sql\nSELECT name AS n FROM customer WHERE city = 'Graz' ORDER BY name DESC;\n```",
+            "Average id": "SELECT 2.00::DECIMAL(4, 2)",
+            "Customers per city": "SELECT city, count(DISTINCT name) FROM customer GROUP BY ALL",
+            "All ids": "SELECT id FROM customer UNION ALL SELECT 1",
+            "Delete everything": "DELETE FROM customer",
+        }
+    )
+    db = _db()
+    try:
+        report = SqlEvalHarness(db, model, "customer(id, name, city)", pool_size=2).evaluate(cases)
+
+        results = {result.case_id: result for result in report.results}
+        assert [result.case_id for result in report.results] == [case.case_id for case in cases]
+        assert results["names"].correct
+        assert results["avg"].correct
+        assert results["per_city"].correct
+        assert not results["ids"].correct and results["ids"].error is None
+        assert results["delete"].error == "Generated: ValueError: Only a single read-only query can be fingerprinted."
+        assert results["unanswerable"].error == "Generation: RuntimeError: no answer"
+        assert report.accuracy == 0.5
+        assert db.con.execute("SELECT count(*) FROM customer").fetchone() == (3,)
+        assert report.to_df().shape == (6, 8)
+        assert list(report.summary()["stage"]) == ["generation", "execution"]
+        assert report.to_text().startswith("Accuracy: 50.0% (3 of 6 correct, 2 errors)")
+    finally:
+        db.close()
+
+
+def test_gold_cache_keeps_in_memory_databases_with_the_same_name_apart() -> None:
+    gold_cache = GoldResultCache()
+    first, second = DuckDbMan.fromMem("shop"), DuckDbMan.fromMem("shop")
+    try:
+        first.execute("CREATE TABLE t AS SELECT 1 AS x")
+        second.execute("CREATE TABLE t AS SELECT 2 AS x")
+        gold_cache.put(first, "SELECT x FROM t", first.fingerprint("SELECT x FROM t"))
+
+        assert gold_cache.get(first, "SELECT  x\nFROM t") is not None
+        assert gold_cache.get(second, "SELECT x FROM t") is None
+        assert len(gold_cache) == 1
+    finally:
+        first.close()
+        second.close()
+
+
+def test_gold_results_are_cached_across_runs_and_timeouts_are_reported() -> None:
+    gold_cache = GoldResultCache()
+    slow = "SELECT count(*) FROM range(100000000000) a"
+    cases = [EvalCase("How many customers?", "SELECT count(*) FROM customer"), EvalCase("Slow", "SELECT 1")]
+    model = AnswerChatModel(answers={"How many customers?": "SELECT 3", "Slow": slow})
+    db = _db()
+    try:
+        harness = SqlEvalHarness(db, model, "customer(id, name, city)", timeout=0.5, gold_cache=gold_cache)
+
+        first = harness.evaluate(cases)
+        second = harness.evaluate(cases)
+
+        assert len(gold_cache) == 2
+        assert [result.gold_cached for result in first.results] == [False, False]
+        assert [result.gold_cached for result in second.results] == [True, True]
+        assert second.results[0].correct
+        assert second.results[1].error == (
+            "Generated: TimeoutError: Query exceeded the time limit of 0.5 seconds and was interrupted."
+        )
+    finally:
+        db.close()
@@ -0,0 +1,47 @@
+from edurel.syntax.rel_ast import Column
+from edurel.syntax.sql_type import SqlType, parse_duckdb_type, parse_sql_type
+
+
+def test_parse_sql_type_splits_base_precision_and_scale() -> None:
+    sql_type = parse_sql_type("decimal(9, 2)")
+
+    assert sql_type == SqlType(base="DECIMAL", precision=9, scale=2)
+    assert sql_type.name == "decimal"
+    assert sql_type.size == "(9, 2)"
+    assert sql_type.is_structured
+    assert str(sql_type) == "decimal(9, 2)"
+
+
+def test_parse_sql_type_interns_equal_type_strings() -> None:
+    assert parse_sql_type("VARCHAR(255)") is parse_sql_type("VARCHAR(255)")
+    assert Column(columnname="a", type="VARCHAR(255)").sql_type is parse_sql_type(
+        "VARCHAR(255)"
+    )
+
+
+def test_parse_sql_type_compares_types_independent_of_spelling() -> None:
+    assert parse_sql_type("DECIMAL(9,2)") == parse_sql_type("decimal( 9, 2 )")
+    assert parse_sql_type("DECIMAL(9,2)") != parse_sql_type("DECIMAL(10,2)")
+    assert parse_sql_type("VARCHAR (10)") == parse_sql_type("VARCHAR(10)")
+    assert parse_sql_type("VARCHAR (10)").render("duckdb") == "VARCHAR (10)"
+
+
+def test_parse_sql_type_keeps_unstructured_types_as_text() -> None:
+    sql_type = parse_sql_type("STRUCT(a INTEGER)")
+
+    assert not sql_type.is_structured
+    assert sql_type.name == "STRUCT"
+    assert sql_type.render("sqlite") == "STRUCT(a INTEGER)"
+
+
+def test_render_maps_type_names_per_dialect() -> None:
+    assert parse_sql_type("VARCHAR(255)").render("postgres") == "VARCHAR(255)"
+    assert parse_sql_type("VARCHAR(255)").render("sqlite") == "TEXT"
+    assert parse_sql_type("DECIMAL(9, 2)").render("sqlite") == "NUMERIC(9, 2)"
+    assert parse_sql_type("FLOAT").render("duckdb") == "DOUBLE"
+    assert parse_sql_type("TIMESTAMP").render("mysql") == "DATETIME"
+
+
+def test_parse_duckdb_type_maps_multi_word_names_to_aliases() -> None:
+    assert parse_duckdb_type("TIMESTAMP WITH TIME ZONE").text == "TIMESTAMPTZ"
+    assert parse_duckdb_type("DECIMAL(9,2)") == SqlType(base="DECIMAL", precision=9, scale=2)
@@ -197,6 +197,7 @@ def test_parse_yaml_allows_omitted_primary_key() -> None:
         "DECIMAL(9, 2)",
         "DECIMAL( 9,2)",
         "DECIMAL(9 , 2 )",
+        "VARCHAR (10)",
     ],
 )
 def test_parse_yaml_accepts_sql_type_values_with_spaces(sql_type: str) -> None:
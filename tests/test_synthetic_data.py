@@ -0,0 +1,115 @@
+import pytest
+
+from edurel.core.duckdb_man import DuckDbMan
+from edurel.core.rel_schema_man import RelSchemaMan
+from edurel.core.synthetic_data import SyntheticDataGenerator
+from edurel.syntax.rel_ast import Column, DataList, ForeignKey, RelSchema, Table
+
+
+def _shop_schema() -> RelSchema:
+    return RelSchema(
+        tables=[
+            Table(
+                tablename="orders",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="customer_id", type="INTEGER"),
+                    Column(columnname="status", type="INTEGER"),
+                    Column(columnname="created", type="TIMESTAMP"),
+                    Column(columnname="reference", type="UUID"),
+                    Column(columnname="note", type="VARCHAR(8)", nullable=True),
+                ],
+                primary_key=["id"],
+                foreign_keys=[
+                    ForeignKey(sourcecolumns=["customer_id"], targettable="customer", targetcolumns=["id"]),
+                    ForeignKey(sourcecolumns=["status"], targettable="status_codes", targetcolumns=["ID"]),
+                ],
+            ),
+            Table(
+                tablename="customer",
+                columns=[
+                    Column(columnname="id", type="INTEGER"),
+                    Column(columnname="name", type="VARCHAR(20)"),
+                    Column(columnname="born", type="DATE"),
+                    Column(columnname="balance", type="DECIMAL(10, 2)"),
+                    Column(columnname="email", type="TEXT", nullable=True),
+                ],
+                primary_key=["id"],
+            ),
+            Table(
+                tablename="status_codes",
+                columns=[
+                    Column(columnname="ID", type="INTEGER"),
+                    Column(columnname="Description", type="VARCHAR(255)"),
+                    Column(columnname="IsValid", type="BOOLEAN"),
+                    Column(columnname="SortOrder", type="INTEGER"),
+                ],
+                primary_key=["ID"],
+            ),
+        ],
+        datalists=[DataList(tablename="status_codes", values=["Open", "Closed", "Cancelled"])],
+    )
+
+
+def test_generate_is_deterministic_for_a_seed() -> None:
+    first = SyntheticDataGenerator(_shop_schema(), seed=7).generate(50)
+    second = SyntheticDataGenerator(_shop_schema(), seed=7).generate(50)
+    other = SyntheticDataGenerator(_shop_schema(), seed=8).generate(50)
+
+    for tablename, frame in first.items():
+        assert frame.equals(second[tablename])
+    assert not first["orders"].equals(other["orders"])
+
+
+def test_generate_respects_keys_nullability_and_datalists() -> None:
+    frames = SyntheticDataGenerator(_shop_schema(), seed=1, null_fraction=0.5).generate(200)
+
+    orders = frames["orders"]
+    assert orders["id"].is_unique
+    assert set(orders["customer_id"]) <= set(frames["customer"]["id"])
+    assert set(orders["status"]) <= {1, 2, 3}
+    assert orders["note"].isna().any()
+    assert orders["note"].dropna().str.len().max() <= 8
+    assert not orders["created"].isna().any()
+    assert list(frames["status_codes"]["Description"]) == ["Open", "Closed", "Cancelled"]
+
+
+def test_generate_raises_when_a_required_reference_has_no_rows() -> None:
+    with pytest.raises(ValueError, match="referenced table 'customer' has no rows"):
+        SyntheticDataGenerator(_shop_schema()).generate({"orders": 10})
+
+
+def test_load_synthetic_data_fills_tables_in_batches() -> None:
+    db = DuckDbMan.fromMem("synthetic")
+    try:
+        inserted = RelSchemaMan.fromAST(_shop_schema()).load_synthetic_data(
+            db, {"customer": 300, "orders": 1_000}, seed=3, batch_size=256
+        )
+
+        assert inserted == {"status_codes": 0, "customer": 300, "orders": 1_000}
+        assert db.con.execute("SELECT count(DISTINCT id) FROM orders").fetchone() == (1_000,)
+        assert db.con.execute(
+            "SELECT count(*) FROM orders o LEFT JOIN customer c ON o.customer_id = c.id WHERE c.id IS NULL"
+        ).fetchone() == (0,)
+    finally:
+        db.close()
+
+
+def test_generate_keeps_short_text_keys_unique() -> None:
+    def schema(width: int) -> RelSchema:
+        return RelSchema(
+            tables=[
+                Table(
+                    tablename="country",
+                    columns=[Column(columnname="code", type=f"CHAR({width})")],
+                    primary_key=["code"],
+                )
+            ]
+        )
+
+    codes = SyntheticDataGenerator(schema(2)).generate(500)["country"]["code"]
+
+    assert codes.is_unique
+    assert codes.str.len().eq(2).all()
+    with pytest.raises(ValueError, match="Cannot generate 1296 unique keys for column 'code'"):
+        SyntheticDataGenerator(schema(2)).generate(1296)
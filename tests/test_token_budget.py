@@ -0,0 +1,91 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from edurel.llm.conversation_rel import SQLGenConversation
+from edurel.llm.token_budget import approx_token_count, trim_messages
+
+
+def _word_count(text: str) -> int:
+    return len(text.split())
+
+
+def _sql_conversation() -> SQLGenConversation:
+    conversation = SQLGenConversation()
+    conversation.set_database_schema("users(id, email)")
+    for turn in range(3):
+        conversation.insert_message_at_end(f"question {turn} " + "word " * 20)
+        conversation.insert_message_at_end(f"answer {turn} " + "word " * 20, msg_type="ai")
+    conversation.insert_question_message("How many users are there?")
+    return conversation
+
+
+def test_approx_token_count() -> None:
+    assert approx_token_count("") == 0
+    assert approx_token_count("abcd") == 1
+    assert approx_token_count("abcde") == 2
+
+
+def test_drop_oldest_keeps_system_schema_and_current_question() -> None:
+    conversation = _sql_conversation()
+    conversation.set_token_budget(130, tokenizer=_word_count)
+
+    removed = conversation.enforce_token_budget()
+
+    assert removed == 4
+    assert conversation.total_tokens() <= 130
+    assert isinstance(conversation.messages[0], SystemMessage)
+    assert "users(id, email)" in conversation.messages[1].content
+    assert conversation.messages[2].content.startswith("question 2")
+    assert "How many users" in conversation.messages[-1].content
+
+
+def test_summarize_replaces_removed_messages_with_summary() -> None:
+    conversation = _sql_conversation()
+    conversation.set_token_budget(
+        130,
+        policy="summarize",
+        tokenizer=_word_count,
+        summarizer=lambda messages: f"{len(messages)} earlier messages",
+    )
+
+    conversation.enforce_token_budget()
+
+    assert conversation.messages[2].content.endswith("earlier messages")
+    assert conversation.total_tokens() <= 130
+
+
+def test_trim_raises_when_pinned_messages_exceed_budget() -> None:
+    messages = [SystemMessage(content="rules " * 50), HumanMessage(content="old"), HumanMessage(content="now")]
+
+    with pytest.raises(ValueError, match="cannot be trimmed"):
+        trim_messages(messages, 20, lambda message: isinstance(message, SystemMessage))
+    with pytest.raises(ValueError, match="exceeds the token budget"):
+        trim_messages(messages, 20, lambda message: False, policy="error")
+
+
+def test_call_llm_reports_an_exceeded_budget_as_error_string() -> None:
+    conversation = _sql_conversation()
+    conversation.set_token_budget(20, policy="error")
+
+    assert conversation.call_llm(FakeListChatModel(responses=["SELECT 1"])).startswith("err: ")
+
+
+def test_call_llm_records_estimated_and_reported_token_usage() -> None:
+    conversation = _sql_conversation()
+    conversation.call_llm(FakeListChatModel(responses=["SELECT count(*) FROM users"]))
+
+    class UsageModel(FakeListChatModel):
+        def invoke(self, messages, *args, **kwargs) -> AIMessage:
+            return AIMessage(
+                content="SELECT 1",
+                usage_metadata={"input_tokens": 321, "output_tokens": 7, "total_tokens": 328},
+            )
+
+    conversation.call_llm(UsageModel(responses=[""]))
+
+    estimated, reported = conversation.token_usage
+    assert estimated.estimated
+    assert estimated.sent == conversation.total_tokens()
+    assert estimated.received == approx_token_count("SELECT count(*) FROM users") + 4
+    assert (reported.sent, reported.received, reported.estimated) == (321, 7, False)
@@ -0,0 +1,27 @@
+from edurel.utils.md import sql_extract_stream, yaml_extract, yaml_extract_stream
+from edurel.utils.stream import FencedBlockExtractor, accept_sql_block
+
+
+def test_yaml_extract_stream_returns_first_yaml_block_and_falls_back_to_generic_blocks() -> None:
+    response = "Schema:\n```\nnot: yaml\n```\n```yml\ntables:\n  - users\n```\ntrailing text"
+
+    assert yaml_extract_stream(list(response)) == "tables:\n  - users"
+    assert yaml_extract_stream(["```\nkey: 1\n", "```\n"]) == yaml_extract("```\nkey: 1\n```\n")
+    assert yaml_extract_stream(["no blocks at all"]) == ""
+
+
+def test_md_sql_extract_stream_accepts_sql_and_generic_sql_blocks() -> None:
+    response = ["```python\nprint(1)\n```\n", "```\nWITH t AS (SELECT 1) ", "SELECT * FROM t\n```"]
+
+    assert sql_extract_stream(response) == "WITH t AS (SELECT 1) SELECT * FROM t"
+    assert sql_extract_stream(["```SQL\nselect 1\n```"]) == "select 1"
+
+
+def test_fenced_block_extractor_handles_fences_split_across_chunks() -> None:
+    extractor = FencedBlockExtractor(accept_sql_block)
+
+    for chunk in ["Query:\n``", "`s", "ql", "\nSELECT 1\n`", "`", "`\nmore"]:
+        extractor.feed(chunk)
+
+    assert extractor.result == "SELECT 1"
+    assert not accept_sql_block("", "print(1)")
@@ -1,6 +1,15 @@
 import pytest
 
-from edurel.utils.sql import transpile_postgres_sql, validate_postgres_sql
+from edurel.utils.sql import (
+    check_sql_batch,
+    clear_sql_parse_cache,
+    parse_sql,
+    sql_extract,
+    sql_extract_stream,
+    transpile_postgres_sql,
+    transpile_postgres_sql_multi,
+    validate_postgres_sql,
+)
 
 
 def test_validate_postgres_sql_accepts_valid_sql() -> None:
@@ -34,3 +43,100 @@ def test_transpile_postgres_sql_raises_value_error_for_invalid_sql() -> None:
     message = str(exc_info.value)
     assert "SQL validation failed." in message
     assert "Location: line 1, column 11." in message
+
+
+def test_parse_sql_reuses_cached_expression_trees() -> None:
+    clear_sql_parse_cache()
+
+    first = parse_sql("SELECT a FROM t;")
+    second = parse_sql("SELECT a FROM t;")
+
+    assert first[0] is second[0]
+    assert transpile_postgres_sql("SELECT a FROM t;", "duckdb") == "SELECT a FROM t"
+    assert first[0].sql() == "SELECT a FROM t"
+
+
+def test_validate_postgres_sql_reports_cached_parse_errors_every_time() -> None:
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Location: line 1, column 11."):
+            validate_postgres_sql("SELECT FROM")
+
+
+def test_transpile_postgres_sql_multi_reports_errors_per_dialect() -> None:
+    results = transpile_postgres_sql_multi(
+        "SELECT 'a' ILIKE 'A';", ["sqlite", "duckdb", "no_such_dialect"]
+    )
+
+    assert list(results) == ["sqlite", "duckdb", "no_such_dialect"]
+    assert results["sqlite"].sql == "SELECT LOWER('a') LIKE LOWER('A')"
+    assert results["duckdb"].sql == "SELECT 'a' ILIKE 'A'"
+    assert not results["no_such_dialect"].ok
+    assert "Unknown dialect" in results["no_such_dialect"].error
+
+
+def test_transpile_postgres_sql_multi_matches_single_dialect_output_in_process_pool() -> None:
+    sql = "SELECT 'a' ILIKE 'A'; SELECT 1"
+
+    results = transpile_postgres_sql_multi(sql, ["sqlite", "mysql"], processes=2)
+
+    assert {dialect: result.sql for dialect, result in results.items()} == {
+        "sqlite": transpile_postgres_sql(sql, "sqlite"),
+        "mysql": transpile_postgres_sql(sql, "mysql"),
+    }
+
+
+def test_check_sql_batch_streams_results_for_texts_and_files(tmp_path) -> None:
+    valid_file = tmp_path / "valid.sql"
+    valid_file.write_text("SELECT 'a' ILIKE 'A';", encoding="utf-8")
+    missing_file = tmp_path / "missing.sql"
+
+    results = list(
+        check_sql_batch(
+            ["SELECT 1;", "SELECT FROM", valid_file, missing_file],
+            target_dialects=["sqlite"],
+            processes=2,
+            chunksize=1,
+        )
+    )
+
+    assert [result.source for result in results] == [
+        "#0",
+        "#1",
+        str(valid_file),
+        str(missing_file),
+    ]
+    assert results[0].ok
+    assert results[0].transpiled["sqlite"].sql == "SELECT 1"
+    assert not results[1].ok
+    with pytest.raises(ValueError) as exc_info:
+        validate_postgres_sql("SELECT FROM")
+    assert results[1].error == str(exc_info.value)
+    assert results[2].transpiled["sqlite"].sql == "SELECT LOWER('a') LIKE LOWER('A')"
+    assert results[3].error.startswith(f"Could not read SQL file {missing_file}")
+
+
+def test_check_sql_batch_runs_in_process_when_single_worker_requested() -> None:
+    results = list(check_sql_batch(["SELECT 1", "SELECT 2"], processes=1))
+
+    assert [(result.source, result.ok) for result in results] == [("#0", True), ("#1", True)]
+
+
+def test_sql_extract_stream_returns_when_block_closes_without_reading_further() -> None:
+    response = "Here you go:\n```sql\nSELECT *\nFROM users;\n```\nThe query selects all users."
+    consumed: list[str] = []
+
+    def chunks():
+        for char in response:
+            consumed.append(char)
+            yield char
+
+    assert sql_extract_stream(chunks()) == "SELECT *\nFROM users;"
+    assert "".join(consumed) == response[: response.index("```\nThe") + 3]
+
+
+def test_sql_extract_stream_skips_non_sql_blocks_and_falls_back_to_plain_text() -> None:
+    response = ["```python\nprint(1)\n```\n", "```\nSELECT 1\n", "```"]
+    assert sql_extract_stream(response) == "SELECT 1"
+    assert sql_extract_stream(["Answer:\nSELECT 2", " FROM t"]) == sql_extract(
+        "Answer:\nSELECT 2 FROM t"
+    )